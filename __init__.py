@@ -1,43 +1,57 @@
-bl_info = {
-    "name": "Mathematical Equation Generator",
-    "author": "Katarina Strenkova",
-    "version": (1, 0, 1),
-    "blender": (3, 3, 0),
-    "location": "3D Viewport",
-    "description": "Addon generates 3D mathematical equations from Latex mathematical notation.",
-    "warning": "",
-    "doc_url": "",
-    "category": "Object",
-}
-
-
-if "bpy" in locals():
-    import importlib
-    importlib.reload(analyser)
-    importlib.reload(generator)
-    importlib.reload(unicode_db)
-    importlib.reload(ui)
-else:
-    from . import analyser
-    from . import generator
-    from . import ui
-    from . import unicode_db 
-    
-import bpy     
-
-
-# register
-def register():
-    ui.register()
-
-
-# unregister
-def unregister():
-    ui.unregister()
- 
-    
-if __name__ == "__main__":
-    register()    
-        
-          
-
+bl_info = {
+    "name": "Mathematical Equation Generator",
+    "author": "Katarina Strenkova",
+    "version": (1, 0, 1),
+    "blender": (3, 3, 0),
+    "location": "3D Viewport",
+    "description": "Addon generates 3D mathematical equations from Latex mathematical notation.",
+    "warning": "",
+    "doc_url": "",
+    "category": "Object",
+}
+
+import importlib
+import sys
+import time
+
+# pure python core without bpy, it can be imported, tested and benchmarked without Blender
+CORE_MODULES = ["tables", "unicode_db", "lexer", "nodes", "parser", "placements", "geometry",
+                "cache", "profiler", "metrics", "layout", "batch"]
+
+# modules using bpy, ui is imported on registration, generator and analyser
+# are imported by operators on the first generated equation
+BLENDER_MODULES = ["generator", "analyser", "ui"]
+
+# reload of addon reloads already imported modules, the core first
+if "register_times" in locals():
+    for module_name in CORE_MODULES + BLENDER_MODULES:
+        module = sys.modules.get(__name__ + "." + module_name)
+        if module is not None:
+            importlib.reload(module)
+
+# time of the last registration in seconds (import of modules, registration of classes)
+register_times = {"import": 0.0, "register": 0.0}
+
+
+# register
+def register():
+    start = time.perf_counter()
+    from . import ui
+    imported = time.perf_counter()
+    ui.register()
+    
+    register_times["import"] = imported - start
+    register_times["register"] = time.perf_counter() - imported
+    print("Mathematical Equations registered in %.1f ms (import %.1f ms, classes %.1f ms)"
+          % ((register_times["import"] + register_times["register"]) * 1000.0,
+             register_times["import"] * 1000.0, register_times["register"] * 1000.0))
+
+
+# unregister
+def unregister():
+    from . import ui
+    ui.unregister()
+ 
+    
+if __name__ == "__main__":
+    register()    
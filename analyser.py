@@ -1,1063 +1,928 @@
-# ---------------------------------------------------------------------------
-# File name   : analyser.py
-# Created By  : Katarina Strenkova
-# ---------------------------------------------------------------------------
-
-import bpy
-import addon_utils
-import os.path
-
-# functions from generator
-from .generator import *
-
-
-# class for tokens
-class Token:
-    def __init__(self, token_type, token_value):
-        self.type = token_type
-        self.value = token_value
-
-
-# class for parameters
-class Parameters:
-    def __init__(self, scale, height, width, line):
-        self.scale = scale
-        self.height = height
-        self.width = width
-        self.line = line
-        
-    def create_copy(self):
-        copy = Parameters(self.scale, self.height, self.width, self.line)
-        return copy     
-
-
-# class for levels
-class Levels:
-    def __init__(self, ei_array, exp_ix, frac, matrix):
-        self.ei_array = ei_array
-        self.exp_ix = exp_ix
-        self.frac = frac
-        self.matrix = matrix
-        
-        
-# class fot sum        
-class Sum:
-    def __init__(self, bool, name, up_collection, down_collection, array):
-        self.bool = bool
-        self.name = name
-        self.up_collection = up_collection 
-        self.down_collection = down_collection
-        self.array = array
-        
-        
-# class for matrix        
-class Matrix:
-    def __init__(self, obj_array, row_num):
-        self.obj_array = obj_array
-        self.row_num = row_num
-
-
-# class for lexical analyser
-class LexicalAnalyser:
-    def __init__(self, latex_text):
-        self.text = latex_text
-
-    # function gets the next token
-    def get_token(self):
-        state = "STATE_START"
-        tmp_string = ""
-
-        token = Token("UNKNOWN", "")
-
-        while True:
-            # end of input text
-            if state == "STATE_START" and self.text == '':
-                token.type = "END"
-                return token
-            elif self.text == '':
-                c = "END"
-            else:
-                c = self.get_char(self.text[0])  # get first character
-
-            # choose the next state
-            if state == "STATE_START":
-                if c == "BACKSLASH":
-                    state = "STATE_COMMAND"
-                    self.text = self.text[1:]  # erase read character
-                elif c == "OTHER" or c == "COMMAND_SPACES":
-                    state = "STATE_TEXT"
-                elif c == "WHITESPACE":
-                    self.text = self.text[1:]  # erase read character
-                    continue
-                elif c == "ANGLE_BRACKETS":
-                    token.type = "TEXT"
-                    token.value = self.text[0]
-                    self.text = self.text[1:]  # erase read character
-                    return token
-                else:
-                    token.type = c
-                    token.value = self.text[0]
-                    self.text = self.text[1:]  # erase read character
-                    return token
-
-            # COMMANDS
-            elif state == "STATE_COMMAND":
-                if self.is_special_char(c):
-                    token.type = "SPECIAL_CHAR"
-                    token.value = self.text[0]
-                    self.text = self.text[1:]  # erase read character
-                    return token
-                elif c == "BACKSLASH":
-                    token.type = "ENTER"
-                    token.value = "\\"
-                    self.text = self.text[1:]  # erase read character
-                    return token
-                elif c == "COMMAND_SPACES":
-                    token.type = "COMMAND"
-                    token.value = self.text[0]
-                    self.text = self.text[1:]  # erase read character
-                    return token
-                elif c == "OTHER":
-                    state = "STATE_COMMAND_NAME"
-                else:
-                    token.type = "COMMAND"
-                    token.value = " "
-                    self.text = self.text[1:]  # erase read character
-                    return token
-
-            # NAME OF THE COMMAND
-            elif state == "STATE_COMMAND_NAME":
-                if c == "OTHER" and self.text[0].isalpha():
-                    tmp_string = tmp_string + self.text[0]
-                    self.text = self.text[1:]  # erase read character
-                else:
-                    token.type = "COMMAND"
-                    token.value = tmp_string
-                    return token
-
-            # TEXT
-            elif state == "STATE_TEXT":
-                if c != "OTHER" and c != "COMMAND_SPACES":
-                    token.type = "TEXT"
-                    token.value = tmp_string
-                    return token
-                else:
-                    tmp_string = tmp_string + self.text[0]
-                    self.text = self.text[1:]
-                        
-    # end of get_token()
-
-    @staticmethod
-    # function gets the current character
-    def get_char(input_character):
-        
-        all_char = [
-            ('\\', "BACKSLASH"),
-            ('{', "OPEN_BRACKET"),
-            ('}', "CLOSE_BRACKET"),
-            ('^', "CARET"),
-            ('_', "UNDERSCORE"),
-            ('&', "AMPERSAND"),
-            ('!', "COMMAND_SPACES"),
-            (';', "COMMAND_SPACES"),
-            (':', "COMMAND_SPACES"),
-            (',', "COMMAND_SPACES"),
-            ('[', "ANGLE_BRACKETS"),
-            (']', "ANGLE_BRACKETS"),
-            (' ', "WHITESPACE"),
-            ('\n', "WHITESPACE")
-        ]
-        
-         # return input character
-        for item in all_char:
-            if input_character == item[0]:
-                return item[1]
- 
-        return "OTHER"
-
-    @staticmethod
-    # function returns if character is a special character or not
-    def is_special_char(char):
-        
-        special_char = [
-            "OPEN_BRACKET",
-            "CLOSE_BRACKET",
-            "AMPERSAND",
-            "UNDERSCORE"
-        ]
-        
-        # return if character is special character
-        if char in special_char:
-            return True
-        
-        return False
-
-    # function returns token to latex string
-    def return_token(self, token):
-        if token.type == "COMMAND" or token.type == "SPECIAL_CHAR" or token.type == "ENTER":
-            self.text = '\\' + token.value + self.text
-        else:
-            self.text = token.value + self.text
-
-
-class SyntaxAnalyser(LexicalAnalyser):
-    def __init__(self, latex_text, context, text_scale, font_path):
-        super().__init__(latex_text)
-
-        self.context = context
-        self.text_scale = text_scale
-        self.font_path = font_path
-        self.font = []  # default_font, unicode_font
-        self.sqrt = False
-        self.sum = Sum(False, "", "", "", [])
-        self.base_collection = ""
-        self.current_collection = ""
-        self.parameters = Parameters(text_scale, 0.0, 0.0, 0.0)
-        self.levels = Levels([], False, 0, False)
-        self.matrix = Matrix([[]], 0)
-
-    @staticmethod
-    # function returns if character is a type of space
-    def is_space(char):
-        # all types of spaces
-        all_spaces = [
-            '!', ',', ':', ';', ' ', "quad", "qquad"
-        ]
-        
-        if char in all_spaces:
-            return True
-        
-        return False
-    
-    @staticmethod
-    # function returns space size
-    def get_space_size(char, scale):
-        
-        space_sizes = [
-            ('!', -0.1),
-            (',', 0.15),
-            (':', 0.2),
-            (';', 0.25),
-            (' ', 0.3),
-            ("quad", 0.6),
-            ("qquad", 1.2)
-        ]
-        
-        # return space size
-        for item in space_sizes:
-            if char == item[0]:
-                return item[1] * scale
-            
-        return 0.0        
-    
-    @staticmethod
-    # function returns bracket type
-    def get_mx_brackets(value):
-        
-        brackets = [
-            ("bmatrix", ('[', ']')),
-            ("Bmatrix", ('{', '}')),
-            ("pmatrix", ('(', ')')),
-            ("vmatrix", ('|', '|')),
-            ("Vmatrix", ('||', '||'))
-        ]
-        
-        # return type of brackets
-        for item in brackets:
-            if value == item[0]:
-                return item[1]
-        
-        return ('', '')
-
-    @staticmethod
-    # function returns if token is <CONST>
-    def is_const(token):
-        all_types = [
-            "TEXT", "SPECIAL_CHAR", "UNDERSCORE", "CARET", "ENTER"
-        ]
-        # <CONST>
-        if token.type in all_types:
-            return True
-
-        return False
-
-    @staticmethod
-    # function returns if token is <COMMAND>
-    def is_command(token):
-        # <COMMAND>
-        if token.type == "OPEN_BRACKET":
-            return True
-
-        elif token.type == "COMMAND":
-            if token.value != "end":
-                return True
-
-        return False
-
-    @staticmethod
-    # function returns if token is <BLOCK>
-    def is_block(token):
-        # <BLOCK>
-        if token.type == "COMMAND" and token.value == "begin":
-            return True
-
-        return False
-    
-    # function returns if sequence of tokens is a matrix figure
-    # { text }
-    def is_matrix_figure(self, mode, parent_collection, xy_size):
-        # {
-        token = self.get_token()
-        if token.type == "OPEN_BRACKET":
-            # text
-            all_matrix = [
-                "bmatrix", "Bmatrix", "matrix", "pmatrix", "Pmatrix", "vmatrix", "Vmatrix"
-            ]
-            token = self.get_token()
-            if token.type == "TEXT" and token.value in all_matrix:
-                # gets the bracket symbol
-                bracket_type = self.get_mx_brackets(token.value)
-                # }
-                token = self.get_token()
-                if token.type == "CLOSE_BRACKET":
-                         
-                    # at the end of matrix
-                    if mode == "end":
-                        # position matrix
-                        gen_matrix_pos(self.context, self.matrix.obj_array, self.parameters)
-                        
-                        # get matrix parameters
-                        xy_size = gen_matrix_param(self.context, self.parameters, parent_collection, xy_size)
-                        
-                        if not bracket_type[0] == '':
-                            # generate left bracket of matrix
-                            gen_text(self.context, bracket_type[0], self.font[1])
-                            gen_brackets(self.context, self.parameters, parent_collection, self.base_collection, xy_size, True)
-                            xy_size = gen_matrix_param(self.context, self.parameters, parent_collection, xy_size)
-                            
-                            # generate right bracket of matrix
-                            gen_text(self.context, bracket_type[1], self.font[1])
-                            gen_brackets(self.context, self.parameters, parent_collection, self.base_collection, xy_size, False)
-                        
-                        # center matrix into row
-                        gen_matrix_center(self.parameters, parent_collection, xy_size, bracket_type[0])
-                        
-                        # clear matrix array
-                        self.parameters.line = 0.0
-                        self.matrix.obj_array = [[]]
-                        self.matrix.row_num = 0
-                    
-                    return True
-                else:
-                    print("Error, missing closing bracket to command!")
-
-        return False
-
-    # <MATRIX> -> <COMMAND> <MORE_MATRIX>
-    #          -> <CONST> <MORE_MATRIX>
-    #          -> & <MORE_MATRIX>
-    #          -> epsilon
-    def sa_matrix(self, tmp_param, parent_collection):
-        token = self.get_token()
-
-        if self.is_command(token) or self.is_const(token) or token.type == "AMPERSAND":
-            # <COMMAND>
-            if self.is_command(token):
-                self.return_token(token)
-                if self.sa_command():
-                    # <MORE_MATRIX>
-                    if self.sa_more_matrix(tmp_param, parent_collection):
-                        return True
-
-            # <CONST>
-            elif self.is_const(token):
-                # enter (\\)
-                if token.type == "ENTER":
-                    # matrix cell collection
-                    self.current_collection = gen_new_collection(self.context, "MatrixCellCollection", parent_collection)
-                    
-                    # add new array that represents row
-                    self.matrix.obj_array.append([])
-                    self.matrix.row_num += 1
-                    self.matrix.obj_array[self.matrix.row_num].append(self.current_collection)
-                    
-                    # set width to start and height lower
-                    self.parameters.width = tmp_param.width
-                    self.parameters.line -= 1.0 * self.text_scale
-                      
-                self.return_token(token)  # return token
-            
-                if self.sa_const():  
-                    # <MORE_MATRIX>
-                    if self.sa_more_matrix(tmp_param, parent_collection):
-                        return True
-
-            # &
-            elif token.type == "AMPERSAND":
-                # matrix cell collection
-                self.current_collection = gen_new_collection(self.context, "MatrixCellCollection", parent_collection)
-                
-                # add collection to row
-                self.matrix.obj_array[self.matrix.row_num].append(self.current_collection)
-                if self.sa_more_matrix(tmp_param, parent_collection):
-                    # <MORE_MATRIX>
-                    return True  
-
-        else:
-            # epsilon
-            self.return_token(token)
-            return True
-
-        return False
-    
-    # <MORE_MATRIX> -> <MATRIX> <MORE_MATRIX>
-    #               -> epsilon
-    def sa_more_matrix(self, tmp_param, parent_collection):
-        token = self.get_token()
-        if self.is_command(token) or self.is_const(token) or token.type == "AMPERSAND":
-            self.return_token(token)
-            if not self.sa_matrix(tmp_param, parent_collection):  # <MATRIX>
-                return False
-
-            return self.sa_more_matrix(tmp_param, parent_collection)  # <MORE_MATRIX>
-
-        else:
-            # epsilon
-            self.return_token(token)
-
-        return True
-
-    # <SQRT> -> [ <MORE_TERM> ] { <MORE_TERM> }
-    #        -> { <MORE_TERM> }
-    def sa_sqrt(self, mode):
-        
-        self.sqrt = True  # inside sqrt
-        token = self.get_token()
-
-        # [
-        if token.type == "TEXT" and token.value == "[":
-            # creating square root multipliers
-            self.levels.ei_array.append("exp")
-            self.parameters.width += 0.1  # space before multipliers
-            
-            # <MORE_TERM>
-            if self.sa_more_term():
-                # ]
-                token = self.get_token()
-                if token.type == "TEXT" and token.value == "]":
-                    self.sqrt = False
-                    self.levels.ei_array.pop()
-                    gen_calculate(self.parameters, self.text_scale, self.levels)
-                    
-                    # {
-                    token = self.get_token()
-                    if token.type == "OPEN_BRACKET":
-                        self.return_token(token)
-                        # { <MORE_TERM> }
-                        return self.sa_sqrt("multiple")
-
-        # {
-        elif token.type == "OPEN_BRACKET":
-            # saving parameters
-            gen_calculate(self.parameters, self.text_scale, self.levels)
-            tmp_param = self.parameters.create_copy()
-            
-            # saving parent collection to bind children collections to
-            parent_collection = self.current_collection
-            
-            sqrt_width = 0.855927586555481  # width of square root symbol
-            
-            # mode 'single' doesn't have multipliers
-            if mode == "single":
-                self.parameters.width += sqrt_width * self.parameters.scale
-            else:    
-                tmp_param.width -= (sqrt_width - 0.4) * self.parameters.scale
-                self.parameters.width += 0.4 * self.parameters.scale
-            
-            # square root collection
-            sqrt_coll = bpy.data.collections.new("SqrtCollection")
-            bpy.data.collections[parent_collection].children.link(sqrt_coll)
-            self.current_collection = sqrt_coll.name
-            
-            # <MORE_TERM>
-            if self.sa_more_term():
-                # }
-                token = self.get_token()
-                if token.type == "CLOSE_BRACKET":
-                    # bool to determine moving of sqrt symbol
-                    use_param = False
-                    sqrt_param = {
-                        "x_pos": 0,
-                        "y_min": 0,
-                        "y_max": 0
-                    }
-
-                    # gets parameters of text under square root
-                    if len(bpy.data.collections[self.current_collection].all_objects): 
-                        use_param = True
-                        sqrt_param['x_pos'] = gen_group_width(self.context, self.current_collection)
-                        sqrt_param['y_min'] = gen_min_y(self.context, self.current_collection)
-                        sqrt_param['y_max'] = gen_group_height(self.context, self.current_collection)   
-                    
-                    # generating sqrt symbol
-                    gen_sqrt_sym(self.context)
-                    gen_collection(self.context, parent_collection, self.base_collection)  # symbol into collection
-                    
-                    # move sqrt symbol
-                    gen_sqrt_move(self.context, tmp_param, sqrt_param, use_param)
-                    
-                    # join collection into parent collection
-                    gen_join_collections(self.context, sqrt_coll, parent_collection)
-                    self.current_collection = parent_collection  # set current collection
-                    
-                    return True
-                else:
-                    print("Error, missing closing bracket to command!")
-
-        return False
-    
-    # function returns if sequence of tokens is a fraction figure
-    # { <MORE_TERM >}
-    def is_frac_figure(self):
-        # {
-        token = self.get_token()
-        if token.type == "OPEN_BRACKET":
-            # <MORE_TERM>
-            if self.sa_more_term():
-                # }
-                token = self.get_token()
-                if token.type == "CLOSE_BRACKET":
-                    return True
-                else:
-                    print("Error, missing closing bracket to command!")
-                
-        return False               
-    
-    # <FRAC> -> { <MORE_TERM> } { <MORE_TERM> }
-    def sa_frac(self):
-        # increasing level of fraction
-        self.levels.frac += 1
-        self.parameters.width += 0.1 * self.parameters.scale  # space before fraction
-        
-        # saving parent collection to bind children collections to
-        parent_collection = self.current_collection
-        
-        # saving current parameters
-        gen_calculate(self.parameters, self.text_scale, self.levels)
-        tmp_param = self.parameters.create_copy()
-        
-        # numerator collection
-        num_coll = bpy.data.collections.new("NumeratorCollection")
-        bpy.data.collections[parent_collection].children.link(num_coll)
-        self.current_collection = num_coll.name
-        
-        # { <MORE_TERM> }
-        if self.is_frac_figure():
-            # initiate numerator width
-            num_width = 0
-                
-            # gets the furthest x position
-            if len(bpy.data.collections[self.current_collection].all_objects):    
-                num_width = gen_group_width(self.context, self.current_collection)    
-            
-            # move numerator objects
-            gen_calculate(self.parameters, self.text_scale, self.levels)
-            gen_frac_num(self.context, self.parameters, num_coll.name)
-            
-            # denominator collection
-            den_coll = bpy.data.collections.new("DenominatorCollection")
-            bpy.data.collections[parent_collection].children.link(den_coll)
-            self.current_collection = den_coll.name
-            
-            # reloading last width
-            self.parameters.width = tmp_param.width
-        
-            # { <MORE_TERM> }
-            if self.is_frac_figure():
-                # initiate denominator width
-                den_width = 0   
-                    
-                # gets the furthest x position
-                if len(bpy.data.collections[self.current_collection].all_objects):    
-                    den_width = gen_group_width(self.context, self.current_collection)
-                
-                # move denominator objects
-                gen_calculate(self.parameters, self.text_scale, self.levels)
-                gen_frac_den(self.context, self.parameters, den_coll.name) 
-                
-                # finding longer text width
-                if den_width > num_width:
-                    line_length = den_width
-                    center_coll = num_coll.name
-                else:
-                    line_length = num_width
-                    center_coll = den_coll.name 
-                
-                # generating fraction line    
-                gen_frac_line(self.context, tmp_param, line_length)    
-                
-                # center numerator and denominator
-                gen_center(self.context, num_width, den_width, center_coll)
-                gen_collection(self.context, den_coll.name, self.base_collection)
-                
-                # join numerator and denominator collections
-                gen_join_collections(self.context, den_coll, num_coll.name)
-                
-                # join denominator collection into parent collection
-                gen_join_collections(self.context, num_coll, parent_collection)
-                self.current_collection = parent_collection  # set current collection
-                
-                # set back line width
-                self.parameters.width = line_length + 0.2 * self.parameters.scale  # space
-                
-                # decreasing level of fraction
-                self.levels.frac -= 1                 
-                    
-                return True
-            else:         
-                return False
-                           
-        return False
-    
-    # <SUM> -> index_exponent
-    #       -> epsilon
-    def sa_sum(self, symbol):
-
-        # generate sum symbol
-        if not gen_math_sym(self.context, symbol, self.font[1]):
-            return False
-                    
-        gen_calculate(self.parameters, self.text_scale, self.levels)
-        self.parameters.height -= 0.4 * self.parameters.scale  # move lower
-        gen_position(self.parameters, True)        
-        gen_collection(self.context, self.current_collection, self.base_collection)
-        
-        self.sum.name = self.context.active_object.name  # save sum object
-        token = self.get_token()  # get next token
-        
-        # check index or exponent for sum
-        if token.type == "UNDERSCORE" or token.type == "CARET":
-            self.return_token(token)
-            self.sum.bool = True  # index and exponent for sum
-            
-            # saving parent collection to bind children collections to
-            parent_collection = self.current_collection
-            
-            # collection for upper indexes
-            up_coll = bpy.data.collections.new("SumUpCollection")
-            bpy.data.collections[parent_collection].children.link(up_coll)
-            self.sum.up_collection = up_coll.name
-
-            # collection for upper indexes
-            down_coll = bpy.data.collections.new("SumDownCollection")
-            bpy.data.collections[parent_collection].children.link(down_coll)
-            self.sum.down_collection = down_coll.name
-            
-            if token.type == "UNDERSCORE":
-                self.current_collection = down_coll.name
-            else:
-                self.current_collection = up_coll.name    
-            
-            # index_exponent
-            if self.sa_const():
-                
-                # move sum limits
-                gen_move_sum(self.context, self.parameters, up_coll.name, self.sum)
-                gen_move_sum(self.context, self.parameters, down_coll.name, self.sum)
-                
-                space = 0.1 * self.parameters.scale
-                self.parameters.width = gen_fin_sum(self.context, self.sum, up_coll.name, down_coll.name) + space
-                
-                # join denominator collection into parent collection
-                gen_join_collections(self.context, up_coll, parent_collection)
-                gen_join_collections(self.context, down_coll, parent_collection)
-                self.current_collection = parent_collection  # set current collection
-                
-                # clear variables for sum
-                self.sum.bool = False 
-                self.sum.array = []
-                return True
-        else:
-            # epsilon
-            self.return_token(token) 
-            return True
-    
-    # function finds the wrong use of exponents and indexes
-    #          generates index + exponent
-    def is_both_ei(self, mode, brackets, saved_width, parent_collection, exp_ix_coll):
-        
-        token = self.get_token()  # get next token
-
-        # multiple uses of exponent + index
-        if self.levels.exp_ix and (token.type == "UNDERSCORE" or token.type == "CARET"):
-            print("Error, use of both index and exponent is only permitted once!")
-            return False
-                    
-        # exponent + index
-        elif (mode == "CARET" and token.type == "UNDERSCORE") \
-            or (mode == "UNDERSCORE" and token.type == "CARET"):
-            
-            self.return_token(token)
-            self.levels.exp_ix = True  # is inside cyclus
-            
-            # special sum exponent or index
-            if self.sum.bool:
-                if token.type == "UNDERSCORE":
-                    self.current_collection = self.sum.down_collection
-                else:
-                    self.current_collection = self.sum.up_collection
-                    
-            # move when its not already moved
-            if not brackets:
-                gen_calculate(self.parameters, self.text_scale, self.levels)
-                gen_position(self.parameters, False)
-            self.levels.ei_array.pop()
-            
-            # save first text width    
-            first_width = gen_group_width(self.context, self.current_collection)
-  
-            if brackets:
-                self.parameters.width = saved_width
-            
-            # call const function
-            if not self.sa_const():
-                return False
-            
-            self.levels.exp_ix = False  # is out of cyclus
-            
-            # calculate final width
-            sec_width = gen_group_width(self.context, self.current_collection)
-            fin_width = max(first_width, sec_width)    
-            
-            self.parameters.width = fin_width + 0.1 * self.parameters.scale
-            
-        elif token.type == "UNDERSCORE" or token.type == "CARET":
-            print("Error, use brackets to correctly make multiple exponents or indexes!")
-            return False
-        
-        else:
-            self.return_token(token) 
-            # move when its not already moved
-            if not brackets:
-                gen_calculate(self.parameters, self.text_scale, self.levels)
-                gen_position(self.parameters, not self.levels.exp_ix)
-            self.levels.ei_array.pop()
-                
-        # join collection into parent collection
-        gen_join_collections(self.context, exp_ix_coll, parent_collection)
-        self.current_collection = parent_collection  # set current collection
-            
-        return True    
-        
-
-    # <AFTER_EI> -> { <MORE_TERM> }
-    #            -> text
-    #            -> special_symbols
-    #            -> command (special group of commands)
-    def sa_after_ei(self, mode):
-        # saving parent collection to bind children collections to
-        parent_collection = self.current_collection
-        
-        # exponent or index collection
-        exp_ix_coll = bpy.data.collections.new("ExponentIndexCollection")
-              
-        bpy.data.collections[parent_collection].children.link(exp_ix_coll)
-        self.current_collection = exp_ix_coll.name
-        
-        # {
-        token = self.get_token()
-        if token.type == "OPEN_BRACKET":
-            tmp_width = self.parameters.width
-            # <MORE_TERM>
-            if self.sa_more_term():
-                # }
-                token = self.get_token()
-                if token.type == "CLOSE_BRACKET":
-                    return self.is_both_ei(mode, True, tmp_width, parent_collection, exp_ix_coll)
-                else:
-                    print("Error, missing closing bracket to command!")
-
-        # text
-        # special_symbols
-        elif token.type == "TEXT" or token.type == "SPECIAL_CHAR":
-            # generate text
-            gen_text(self.context, token.value, self.font[0])
-            gen_collection(self.context, self.current_collection, self.base_collection)
-        
-            return self.is_both_ei(mode, False, self.parameters.width, parent_collection, exp_ix_coll)
-        
-        # command (special group of commands)
-        elif token.type == "COMMAND":
-            # generate mathematic symbol
-            gen_math_sym(self.context, token.value,  self.font[1])
-            gen_collection(self.context, self.current_collection, self.base_collection)   
-        
-            return self.is_both_ei(mode, False, self.parameters.width, parent_collection, exp_ix_coll)
-        
-        return False
-
-    # <CONST> -> text
-    #         -> special_symbols
-    #         -> enter
-    #         -> index_exponent <IN_BRACKETS>
-    def sa_const(self):
-        token = self.get_token()
-
-        # text + special_symbols
-        if token.type == "TEXT" or token.type == "SPECIAL_CHAR":
-            gen_text(self.context, token.value, self.font[0])
-            gen_calculate(self.parameters, self.text_scale, self.levels)
-            gen_position(self.parameters, True)
-            gen_collection(self.context, self.current_collection, self.base_collection)
-            
-            return True
-        
-        # enter
-        elif token.type == "ENTER":
-            # skip if not in matrix
-            return True
-
-        # index_exponent
-        elif token.type == "UNDERSCORE":
-            self.levels.ei_array.append("ix")
-            gen_calculate(self.parameters, self.text_scale, self.levels)
-            # <IN_BRACKETS>
-            if self.sa_after_ei("UNDERSCORE"):
-                return True
-
-        elif token.type == "CARET":
-            self.levels.ei_array.append("exp")
-            gen_calculate(self.parameters, self.text_scale, self.levels)
-            # <IN_BRACKETS>
-            if self.sa_after_ei("CARET"):
-                return True
-
-        return False
-
-    # <COMMAND> -> { <MORE_TERM> }
-    #           -> sqrt <SQRT>
-    #           -> frac <FRAC>
-    #           -> command <COMM_ARG>
-    def sa_command(self):
-        # {
-        token = self.get_token()
-        if token.type == "OPEN_BRACKET":
-            # <MORE_TERM>
-            if self.sa_more_term():
-                # }
-                token = self.get_token()
-                if token.type == "CLOSE_BRACKET":
-                    return True
-                else:
-                    print("Error, missing closing bracket to command")
-
-        # COMMAND type
-        elif token.type == "COMMAND":
-            # sqrt
-            if token.value == "sqrt":
-                # <SQRT>
-                if self.sa_sqrt("single"):
-                    return True
-            
-            # frac
-            elif token.value == "frac":
-                # <FRAC>
-                if self.sa_frac():
-                    return True 
-                
-            # sum
-            elif token.value == "sum" or token.value == "prod":
-                 # <SUM>
-                 if self.sa_sum(token.value):
-                     return True     
-        
-            # command spaces    
-            elif self.is_space(token.value):
-                # get space size and add it to text width
-                space = self.get_space_size(token.value, self.parameters.scale)
-                self.parameters.width += space
-                return True                        
-
-            # command
-            else:
-                # mathematic symbols
-                if not gen_math_sym(self.context, token.value, self.font[1]):
-                    return False
-                
-                gen_calculate(self.parameters, self.text_scale, self.levels)
-                gen_position(self.parameters, True)
-                
-                # move prod and integral symbol
-                if token.value == "int":
-                    self.context.active_object.location.y -= 0.3 * self.parameters.scale   
-                    self.parameters.width -= 0.2 * self.parameters.scale
-                
-                gen_collection(self.context, self.current_collection, self.base_collection)
-                return True
-
-        return False
-
-    # <BLOCK> -> begin { text } <MATRIX> end { text }
-    def sa_block(self):
-        
-        # begin
-        token = self.get_token()
-        if token.type == "COMMAND" and token.value == "begin":
-            
-            # saving parent collection to bind children collections to
-            parent_collection = self.current_collection
-            
-            # saving current parameters
-            gen_calculate(self.parameters, self.text_scale, self.levels)
-            tmp_param = self.parameters.create_copy()
-            
-            xy_size = [tmp_param.width]  # array for matrix parameters
-            
-            # matrix collection
-            mx_coll = bpy.data.collections.new("MatrixBodyCollection")
-            bpy.data.collections[parent_collection].children.link(mx_coll)
-            
-            # first matrix cell collection
-            self.current_collection = gen_new_collection(self.context, "MatrixCellCollection", mx_coll.name)
-            self.matrix.obj_array[self.matrix.row_num].append(self.current_collection)
-            
-            # { text }
-            if self.is_matrix_figure("begin", mx_coll.name, xy_size):
-                # <MATRIX>
-                if self.sa_matrix(tmp_param, mx_coll.name):
-                    # end
-                    token = self.get_token()
-                    if token.type == "COMMAND" and token.value == "end":
-                        # { text }
-                        if self.is_matrix_figure("end", mx_coll.name, xy_size):
-                            # set width of parameters
-                            self.parameters.width = gen_group_width(self.context, mx_coll.name) + 0.25
-                             
-                            # link objects to matrix collection
-                            for collection in bpy.data.collections:
-                                if "MatrixCellCollection" in collection.name:
-                                    # join all objects into one parent collection
-                                    for obj in collection.all_objects:
-                                        bpy.data.collections[mx_coll.name].objects.link(obj) 
-                                        collection.objects.unlink(obj)   
-                            
-                                    # remove matrix cell collection
-                                    bpy.data.collections.remove(collection)
-                               
-                            # join matrix collection into parent collection
-                            gen_join_collections(self.context, mx_coll, parent_collection)
-                            self.current_collection = parent_collection  # set current collection
-                            
-                            return True
-        # sa_block()                
-        return False
-
-    # <TERM> -> <CONST>
-    #        -> <COMMAND>
-    #        -> <BLOCK>
-    def sa_term(self):
-        token = self.get_token()
-
-        # <CONST>
-        if self.is_const(token):
-            self.return_token(token)
-            if not self.sa_const():
-                return False
-
-        # <BLOCK>
-        elif self.is_block(token):
-            self.return_token(token)
-            if not self.sa_block():
-                return False
-
-        # <COMMAND>
-        elif self.is_command(token):
-            self.return_token(token)
-            if not self.sa_command():
-                return False
-
-        # no corresponding terminals
-        else:
-            print("Error, no corresponding terminals - use of not supported symbol!")
-            return False
-
-        return True
-
-    # <MORE_TERM> -> <TERM> <MORE_TERM>
-    #             -> epsilon
-    def sa_more_term(self):
-        token = self.get_token()
-
-        # special sqrt ]
-        if self.sqrt and token.type == "TEXT" and token.value == "]":
-            self.return_token(token)
-            return True
-
-        elif self.is_const(token) or self.is_command(token) or self.is_block(token):
-            self.return_token(token)
-            if not self.sa_term():  # <TERM>
-                return False
-
-            return self.sa_more_term()  # <MORE_TERM>
-
-        else:
-            # epsilon
-            self.return_token(token)
-
-        return True
-
-    # taking tokens and checking their order
-    # <PROG> -> <TERM> <MORE_TERM>
-    def sa_prog(self):
-        # creating base collection
-        collection = bpy.data.collections.new("MathematicalEqCollection")
-        bpy.context.scene.collection.children.link(collection)
-        
-        # set active collection
-        layer_collection = bpy.context.view_layer.layer_collection
-        # iterate through layer collection
-        for layer in layer_collection.children:
-            if layer.name == collection.name:
-                bpy.context.view_layer.active_layer_collection = layer
-        
-        self.base_collection = collection.name  # set base collection
-        self.current_collection = collection.name  # set current collection
-        
-        # chosen default font
-        if self.font_path == "":
-            self.font.append("")
-        else:
-            default_font = bpy.data.fonts.load(self.font_path)
-            self.font.append(default_font)
-        
-        # find path to addon
-        addon_name = "Mathematical Equation Generator"
-        for mod in addon_utils.modules():
-            if mod.bl_info['name'] == addon_name:
-                dir_path = os.path.dirname(mod.__file__)
-                # create path to unicode font
-                file_path = dir_path + "\\fonts\\Kelvinch-Roman.otf"
-                
-        # unicode font for mathematical symbols
-        unicode_font = bpy.data.fonts.load(file_path)
-        self.font.append(unicode_font)
-        
-        if not self.sa_term():  # <TERM>
-            return False
-
-        if not self.sa_more_term():  # <MORE_TERM>
-            return False
-
-        token = self.get_token()
-        
-        if token.type != "END":
-            print("Error, not all tokens have been read!")
-            print("Value of last token: " + token.value)
-            return False
-        
-        # select all objects in base collection
-        for obj in bpy.data.collections[collection.name].all_objects:  
-            obj.select_set(True)
-
-        return True
-   
+# ---------------------------------------------------------------------------
+# File name   : analyser.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+import bpy
+import os.path
+from mathutils import Euler, Vector
+
+# functions from generator
+from .generator import *
+
+# parser creating tree of nodes
+from .parser import Parser
+
+# paths of nodes and comparing of trees
+from .nodes import node_paths, changed_range, match_trees, find_pair
+
+# tables of spaces and matrices
+from .tables import space_sizes, matrix_brackets, sqrt_width
+
+# cache of generated equations
+from .cache import CacheEntry, equation_cache
+
+# layout of equations from font metrics
+from .layout import BoxLayout
+from .metrics import get_font_metrics, save_font_metrics
+
+# unicode characters database
+from .unicode_db import load_all_sets, reverse_index
+
+# instrumentation of generating
+from .profiler import profiled, profiler
+
+
+# unicode font for mathematical symbols is in the addon directory
+UNICODE_FONT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts", "Kelvinch-Roman.otf")
+
+
+# class for parameters
+class Parameters:
+    def __init__(self, scale, height, width, line):
+        self.scale = scale
+        self.height = height
+        self.width = width
+        self.line = line
+        
+    def create_copy(self):
+        copy = Parameters(self.scale, self.height, self.width, self.line)
+        return copy     
+
+
+# class for levels
+class Levels:
+    def __init__(self, ei_array, exp_ix, frac, matrix):
+        self.ei_array = ei_array
+        self.exp_ix = exp_ix
+        self.frac = frac
+        self.matrix = matrix
+        
+        
+# class fot sum        
+class Sum:
+    def __init__(self, bool, name, up_group, down_group, array):
+        self.bool = bool
+        self.name = name
+        self.up_group = up_group 
+        self.down_group = down_group
+        self.array = array
+        
+        
+# class for matrix        
+class Matrix:
+    def __init__(self, obj_array, row_num):
+        self.obj_array = obj_array
+        self.row_num = row_num
+
+
+# class for generator of mathematical equation
+# the equation is parsed first and objects are generated only from valid tree
+# layout_engine - "BOX" lays out equation from font metrics before objects are created,
+#                 "SCENE" moves generated objects by their bounding boxes
+# glyph_type - "CURVE" generates text objects, "MESH" generates objects sharing meshes of glyphs
+#              with given thickness and curve resolution, "MERGED" generates one mesh object
+class SyntaxAnalyser:
+    def __init__(self, latex_text, context, text_scale, font_path, layout_engine="BOX",
+                 glyph_type="CURVE", thickness=0.0, resolution=12):
+        self.latex_text = latex_text
+        self.context = context
+        self.text_scale = text_scale
+        self.font_path = font_path
+        self.layout_engine = layout_engine
+        self.glyph_type = glyph_type
+        self.thickness = thickness
+        self.resolution = resolution
+        self.font = []  # default_font, unicode_font
+        self.font_files = []  # paths to default font and unicode font
+        self.tree = None  # terms of parsed equation
+        self.term_widths = []  # start width of every top-level term
+        self.error = ""  # error message of parser
+        self.sum = Sum(False, "", None, None, [])
+        self.base_collection = ""
+        self.current_group = None  # group of objects of the current construct
+        self.node_paths = {}  # id of node -> path of node in tree
+        self.parameters = Parameters(text_scale, 0.0, 0.0, 0.0)
+        self.levels = Levels([], False, 0, False)
+        self.matrix = Matrix([[]], 0)
+
+    @staticmethod
+    # function returns if character is a type of space
+    def is_space(char):
+        return char in space_sizes
+    
+    @staticmethod
+    # function returns space size
+    def get_space_size(char, scale):
+        return space_sizes.get(char, 0.0) * scale
+    
+    @staticmethod
+    # function returns bracket type
+    def get_mx_brackets(value):
+        return matrix_brackets.get(value, ('', ''))
+
+    @profiled
+    # function generates matrix
+    # begin { text } <MATRIX> end { text }
+    def gen_block(self, node):
+        
+        # saving parent group to bind children groups to
+        parent_group = self.current_group
+        
+        # saving current parameters
+        gen_calculate(self.parameters, self.text_scale, self.levels)
+        tmp_param = self.parameters.create_copy()
+        
+        xy_size = [tmp_param.width]  # array for matrix parameters
+        
+        # matrix group
+        mx_group = Group("MatrixBodyGroup", parent_group)
+        
+        # <MATRIX>
+        for row_num, row in enumerate(node.rows):
+            # enter (\\)
+            if row_num > 0:
+                # set width to start and height lower
+                self.parameters.width = tmp_param.width
+                self.parameters.line -= 1.0 * self.text_scale
+                
+                # add new array that represents row
+                self.matrix.obj_array.append([])
+                self.matrix.row_num += 1
+            
+            for cell in row:
+                # matrix cell group
+                self.current_group = Group("MatrixCellGroup", mx_group)
+                
+                # add group to row
+                self.matrix.obj_array[self.matrix.row_num].append(self.current_group)
+                
+                if not self.gen_terms(cell):
+                    return False
+        
+        # position matrix
+        gen_matrix_pos(self.context, self.matrix.obj_array, self.parameters)
+        
+        # get matrix parameters
+        xy_size = gen_matrix_param(self.context, self.parameters, mx_group, xy_size)
+        
+        # gets the bracket symbol
+        bracket_type = self.get_mx_brackets(node.name)
+        
+        if not bracket_type[0] == '':
+            # generate left bracket of matrix
+            gen_text(self.context, bracket_type[0], self.font[1])
+            gen_brackets(self.context, self.parameters, mx_group, xy_size, True)
+            xy_size = gen_matrix_param(self.context, self.parameters, mx_group, xy_size)
+            
+            # generate right bracket of matrix
+            gen_text(self.context, bracket_type[1], self.font[1])
+            gen_brackets(self.context, self.parameters, mx_group, xy_size, False)
+        
+        # center matrix into row
+        gen_matrix_center(self.parameters, mx_group, xy_size, bracket_type[0])
+        
+        # clear matrix array
+        self.parameters.line = 0.0
+        self.matrix.obj_array = [[]]
+        self.matrix.row_num = 0
+        
+        # set width of parameters
+        self.parameters.width = gen_group_width(self.context, mx_group) + 0.25
+         
+        # join matrix cell groups into matrix group
+        for cell_group in list(mx_group.children):
+            gen_join_group(cell_group, mx_group)
+           
+        # join matrix group into parent group
+        gen_join_group(mx_group, parent_group)
+        self.current_group = parent_group  # set current group
+        
+        return True
+
+    @profiled
+    # function generates square root
+    # [ <MORE_TERM> ] { <MORE_TERM> }
+    # { <MORE_TERM> }
+    def gen_sqrt(self, node):
+        
+        # mode 'single' doesn't have multipliers
+        mode = "single"
+        
+        # [
+        if node.index is not None:
+            mode = "multiple"
+            
+            # creating square root multipliers
+            self.levels.ei_array.append("exp")
+            self.parameters.width += 0.1  # space before multipliers
+            
+            # <MORE_TERM>
+            if not self.gen_terms(node.index):
+                return False
+            
+            self.levels.ei_array.pop()
+            gen_calculate(self.parameters, self.text_scale, self.levels)
+        
+        # {
+        # saving parameters
+        gen_calculate(self.parameters, self.text_scale, self.levels)
+        tmp_param = self.parameters.create_copy()
+        
+        # saving parent group to bind children groups to
+        parent_group = self.current_group
+        
+        if mode == "single":
+            self.parameters.width += sqrt_width * self.parameters.scale
+        else:    
+            tmp_param.width -= (sqrt_width - 0.4) * self.parameters.scale
+            self.parameters.width += 0.4 * self.parameters.scale
+        
+        # square root group
+        sqrt_group = Group("SqrtGroup", parent_group)
+        self.current_group = sqrt_group
+        
+        # <MORE_TERM>
+        if not self.gen_terms(node.body):
+            return False
+        
+        # }
+        # bool to determine moving of sqrt symbol
+        use_param = False
+        sqrt_param = {
+            "x_pos": 0,
+            "y_min": 0,
+            "y_max": 0
+        }
+
+        # gets parameters of text under square root
+        if len(self.current_group.all_objects()): 
+            use_param = True
+            min_x, max_x, min_y, max_y = gen_bounds(self.context, self.current_group)
+            sqrt_param['x_pos'] = max_x
+            sqrt_param['y_min'] = min_y
+            sqrt_param['y_max'] = max_y
+        
+        # generating sqrt symbol over text
+        gen_sqrt_sym(self.context, tmp_param, sqrt_param, use_param)
+        gen_add_to_group(self.context, parent_group)  # symbol into group
+        
+        # join group into parent group
+        gen_join_group(sqrt_group, parent_group)
+        self.current_group = parent_group  # set current group
+        
+        return True
+    
+    @profiled
+    # function generates fraction
+    # { <MORE_TERM> } { <MORE_TERM> }
+    def gen_frac(self, node):
+        # increasing level of fraction
+        self.levels.frac += 1
+        self.parameters.width += 0.1 * self.parameters.scale  # space before fraction
+        
+        # saving parent group to bind children groups to
+        parent_group = self.current_group
+        
+        # saving current parameters
+        gen_calculate(self.parameters, self.text_scale, self.levels)
+        tmp_param = self.parameters.create_copy()
+        
+        # numerator group
+        num_group = Group("NumeratorGroup", parent_group)
+        self.current_group = num_group
+        
+        # { <MORE_TERM> }
+        if not self.gen_terms(node.numerator):
+            return False
+        
+        # initiate numerator width
+        num_width = 0
+            
+        # gets the furthest x position
+        if len(self.current_group.all_objects()):    
+            num_width = gen_group_width(self.context, self.current_group)    
+        
+        # move numerator objects
+        gen_calculate(self.parameters, self.text_scale, self.levels)
+        gen_frac_num(self.context, self.parameters, num_group)
+        
+        # denominator group
+        den_group = Group("DenominatorGroup", parent_group)
+        self.current_group = den_group
+        
+        # reloading last width
+        self.parameters.width = tmp_param.width
+    
+        # { <MORE_TERM> }
+        if not self.gen_terms(node.denominator):
+            return False
+        
+        # initiate denominator width
+        den_width = 0   
+            
+        # gets the furthest x position
+        if len(self.current_group.all_objects()):    
+            den_width = gen_group_width(self.context, self.current_group)
+        
+        # move denominator objects
+        gen_calculate(self.parameters, self.text_scale, self.levels)
+        gen_frac_den(self.context, self.parameters, den_group) 
+        
+        # finding longer text width
+        if den_width > num_width:
+            line_length = den_width
+            center_group = num_group
+        else:
+            line_length = num_width
+            center_group = den_group 
+        
+        # generating fraction line    
+        gen_frac_line(self.context, tmp_param, line_length)    
+        
+        # center numerator and denominator
+        gen_center(self.context, num_width, den_width, center_group)
+        gen_add_to_group(self.context, den_group)
+        
+        # join numerator and denominator groups
+        gen_join_group(den_group, num_group)
+        
+        # join numerator group into parent group
+        gen_join_group(num_group, parent_group)
+        self.current_group = parent_group  # set current group
+        
+        # set back line width
+        self.parameters.width = line_length + 0.2 * self.parameters.scale  # space
+        
+        # decreasing level of fraction
+        self.levels.frac -= 1                 
+            
+        return True
+    
+    @profiled
+    # function generates sum or product symbol
+    # index_exponent
+    # epsilon
+    def gen_sum(self, node):
+
+        # generate sum symbol
+        if not gen_math_sym(self.context, node.name, self.font[1]):
+            return False
+                    
+        gen_calculate(self.parameters, self.text_scale, self.levels)
+        self.parameters.height -= 0.4 * self.parameters.scale  # move lower
+        gen_position(self.parameters, True)        
+        gen_add_to_group(self.context, self.current_group)
+        
+        self.sum.name = self.context.active_object.name  # save sum object
+        
+        # check index or exponent for sum
+        if node.script is None:
+            # epsilon
+            return True
+        
+        self.sum.bool = True  # index and exponent for sum
+        
+        # saving parent group to bind children groups to
+        parent_group = self.current_group
+        
+        # group for upper indexes
+        up_group = Group("SumUpGroup", parent_group)
+        self.sum.up_group = up_group
+
+        # group for upper indexes
+        down_group = Group("SumDownGroup", parent_group)
+        self.sum.down_group = down_group
+        
+        if node.script.mode == "UNDERSCORE":
+            self.current_group = down_group
+        else:
+            self.current_group = up_group    
+        
+        # index_exponent
+        if not self.gen_term(node.script):
+            return False
+            
+        # move sum limits
+        gen_move_sum(self.context, self.parameters, up_group, self.sum)
+        gen_move_sum(self.context, self.parameters, down_group, self.sum)
+        
+        space = 0.1 * self.parameters.scale
+        self.parameters.width = gen_fin_sum(self.context, self.sum, up_group, down_group) + space
+        
+        # join limit groups into parent group
+        gen_join_group(up_group, parent_group)
+        gen_join_group(down_group, parent_group)
+        self.current_group = parent_group  # set current group
+        
+        # clear variables for sum
+        self.sum.bool = False 
+        self.sum.array = []
+        return True
+    
+    @profiled
+    # function generates index + exponent
+    def gen_both_ei(self, node, brackets, saved_width, parent_group, exp_ix_group):
+        
+        # exponent + index
+        if node.second is not None:
+            
+            self.levels.exp_ix = True  # is inside cyclus
+            
+            # special sum exponent or index
+            if self.sum.bool:
+                if node.second.mode == "UNDERSCORE":
+                    self.current_group = self.sum.down_group
+                else:
+                    self.current_group = self.sum.up_group
+                    
+            # move when its not already moved
+            if not brackets:
+                gen_calculate(self.parameters, self.text_scale, self.levels)
+                gen_position(self.parameters, False)
+            self.levels.ei_array.pop()
+            
+            # save first text width    
+            first_width = gen_group_width(self.context, self.current_group)
+  
+            if brackets:
+                self.parameters.width = saved_width
+            
+            # generate the second exponent or index
+            if not self.gen_term(node.second):
+                return False
+            
+            self.levels.exp_ix = False  # is out of cyclus
+            
+            # calculate final width
+            sec_width = gen_group_width(self.context, self.current_group)
+            fin_width = max(first_width, sec_width)    
+            
+            self.parameters.width = fin_width + 0.1 * self.parameters.scale
+        
+        else:
+            # move when its not already moved
+            if not brackets:
+                gen_calculate(self.parameters, self.text_scale, self.levels)
+                gen_position(self.parameters, not self.levels.exp_ix)
+            self.levels.ei_array.pop()
+                
+        # join group into parent group
+        gen_join_group(exp_ix_group, parent_group)
+        self.current_group = parent_group  # set current group
+            
+        return True    
+        
+
+    @profiled
+    # function generates exponent or index
+    # { <MORE_TERM> }
+    # text
+    # special_symbols
+    # command (special group of commands)
+    def gen_after_ei(self, node):
+        # saving parent group to bind children groups to
+        parent_group = self.current_group
+        
+        # exponent or index group
+        exp_ix_group = Group("ExponentIndexGroup", parent_group)
+        self.current_group = exp_ix_group
+        
+        # { <MORE_TERM> }
+        if node.brackets:
+            tmp_width = self.parameters.width
+            if not self.gen_terms(node.body):
+                return False
+            
+            return self.gen_both_ei(node, True, tmp_width, parent_group, exp_ix_group)
+        
+        item = node.body[0]
+        
+        # text
+        # special_symbols
+        if item.kind == "text":
+            # generate text
+            gen_text(self.context, item.value, self.font[0])
+            gen_add_to_group(self.context, self.current_group)
+        
+        # command (special group of commands)
+        else:
+            # generate mathematic symbol
+            gen_math_sym(self.context, item.name, self.font[1])
+            gen_add_to_group(self.context, self.current_group)   
+        
+        # object belongs to the only term of exponent or index
+        self.tag_objects([self.context.active_object], item)
+        
+        return self.gen_both_ei(node, False, self.parameters.width, parent_group, exp_ix_group)
+
+    # function saves path of node into objects without path
+    # objects of nested nodes have their paths already
+    def tag_objects(self, objects, node):
+        path = self.node_paths.get(id(node))
+        if path is None:
+            return
+        
+        for obj in objects:
+            if "eq_path" not in obj:
+                obj["eq_path"] = path
+
+    # function generates one term of equation
+    # new objects belong to the term if they don't belong to its nested terms
+    def gen_term(self, node):
+        objects = bpy.data.collections[self.base_collection].objects
+        obj_count = len(objects)
+        if not self.gen_node(node):
+            return False
+        
+        self.tag_objects(objects[obj_count:], node)
+        return True
+
+    @profiled
+    # function generates objects of one term
+    def gen_node(self, node):
+
+        # text + special_symbols
+        if node.kind == "text":
+            gen_text(self.context, node.value, self.font[0])
+            gen_calculate(self.parameters, self.text_scale, self.levels)
+            gen_position(self.parameters, True)
+            gen_add_to_group(self.context, self.current_group)
+        
+        # enter
+        elif node.kind == "enter":
+            # skip if not in matrix
+            return True
+
+        # index_exponent
+        elif node.kind == "script":
+            if node.mode == "UNDERSCORE":
+                self.levels.ei_array.append("ix")
+            else:
+                self.levels.ei_array.append("exp")
+            gen_calculate(self.parameters, self.text_scale, self.levels)
+            
+            return self.gen_after_ei(node)
+
+        # { <MORE_TERM> }
+        elif node.kind == "group":
+            return self.gen_terms(node.children)
+        
+        # sqrt
+        elif node.kind == "sqrt":
+            return self.gen_sqrt(node)
+        
+        # frac
+        elif node.kind == "frac":
+            return self.gen_frac(node)
+        
+        # sum
+        elif node.kind == "sum":
+            return self.gen_sum(node)
+        
+        # command spaces    
+        elif node.kind == "space":
+            # get space size and add it to text width
+            space = self.get_space_size(node.name, self.parameters.scale)
+            self.parameters.width += space
+        
+        # matrix
+        elif node.kind == "matrix":
+            return self.gen_block(node)
+
+        # command
+        else:
+            # mathematic symbols
+            if not gen_math_sym(self.context, node.name, self.font[1]):
+                return False
+            
+            gen_calculate(self.parameters, self.text_scale, self.levels)
+            gen_position(self.parameters, True)
+            
+            # move prod and integral symbol
+            if node.name == "int":
+                self.context.active_object.location.y -= 0.3 * self.parameters.scale   
+                gen_invalidate_objects([self.context.active_object])
+                self.parameters.width -= 0.2 * self.parameters.scale
+            
+            gen_add_to_group(self.context, self.current_group)
+
+        return True
+
+    @profiled
+    # function generates list of terms
+    def gen_terms(self, nodes):
+        for node in nodes:
+            if not self.gen_term(node):
+                return False
+
+        return True
+
+    @profiled
+    # function generates top-level terms starting with number 'first'
+    # every object gets the number of its term and start widths of terms are saved
+    def gen_top_terms(self, terms, first):
+        objects = bpy.data.collections[self.base_collection].objects
+        gen_invalidate_bounds()  # objects could be changed outside of analyser
+        gen_forget_text_boxes()
+        self.set_text_metrics()
+        
+        for i, node in enumerate(terms):
+            self.term_widths.append(self.parameters.width)
+            
+            # objects of term are at the end of base collection
+            obj_count = len(objects)
+            if not self.gen_term(node):
+                return False
+            
+            for obj in objects[obj_count:]:
+                obj["eq_term"] = first + i
+        
+        # width of all terms
+        self.term_widths.append(self.parameters.width)
+        return True
+    
+    @profiled
+    # function loads default font and unicode font
+    # fonts are loaded only once and reused by next equations
+    def load_fonts(self):
+        # chosen default font
+        if self.font_path == "":
+            self.font.append("")
+            self.font_files.append("")
+        else:
+            self.font.append(gen_load_font(self.font_path))
+            self.font_files.append(bpy.path.abspath(self.font_path))
+                
+        # unicode font for mathematical symbols
+        self.font.append(gen_load_font(UNICODE_FONT))
+        self.font_files.append(UNICODE_FONT)
+
+    # function returns box layout with metrics of loaded fonts
+    def get_layout(self):
+        return BoxLayout(self.get_metrics(), self.text_scale)
+
+    # function returns metrics of loaded fonts
+    def get_metrics(self):
+        metrics = []
+        for font, font_file in zip(self.font, self.font_files):
+            # glyphs missing in metrics are measured in loaded font
+            font_metrics = get_font_metrics(font_file, None, bpy.app.version_string)
+            font_metrics.measure = lambda char, font=font, font_metrics=font_metrics: \
+                gen_measure_glyph(self.context, char, font, font_metrics)
+            metrics.append(font_metrics)
+        
+        return metrics
+
+    # function sets metrics of loaded fonts for text objects of scene layout
+    def set_text_metrics(self):
+        for font, metrics in zip(self.font, self.get_metrics()):
+            gen_set_text_metrics(font, metrics)
+
+    @profiled
+    # function generates objects from placements into collection
+    def gen_placements(self, placements, collection):
+        gen_from_placements(self.context, placements, self.font, collection,
+                            self.glyph_type, self.thickness, self.resolution)
+
+    # function saves source and layout of equation into collection
+    def save_equation(self, collection):
+        collection["latex_text"] = self.latex_text
+        collection["font_path"] = self.font_path
+        collection["text_scale"] = self.text_scale
+        collection["layout_engine"] = self.layout_engine
+        collection["glyph_type"] = self.glyph_type
+        collection["curve_resolution"] = self.resolution
+        collection["term_widths"] = self.term_widths
+
+    @profiled
+    # parsing equation and generating objects from parsed tree
+    # cached equations are generated from saved placements without parsing
+    # <PROG> -> <TERM> <MORE_TERM>
+    def sa_prog(self):
+        # key of equation in cache
+        font_file = bpy.path.abspath(self.font_path) if self.font_path != "" else ""
+        key = equation_cache.make_key(self.latex_text, font_file, self.text_scale, self.layout_engine)
+        entry = equation_cache.get(key)
+        
+        if entry is None:
+            # check the order of tokens before anything is generated
+            parser = Parser(self.latex_text)
+            self.tree = parser.parse()
+            if self.tree is None:
+                self.error = parser.error
+                return False
+        else:
+            self.tree = entry.tree
+        
+        # objects generated from placements are only selected, previously selected
+        # objects are deselected, so only the new equation is selected at the end
+        for obj in self.context.selected_objects:
+            obj.select_set(False)
+        
+        # creating base collection
+        collection = bpy.data.collections.new("MathematicalEqCollection")
+        profiler.count("collections")
+        bpy.context.scene.collection.children.link(collection)
+        
+        # set active collection
+        layer_collection = bpy.context.view_layer.layer_collection
+        # iterate through layer collection
+        for layer in layer_collection.children:
+            if layer.name == collection.name:
+                bpy.context.view_layer.active_layer_collection = layer
+        
+        self.base_collection = collection.name  # set base collection
+        self.current_group = Group(collection.name)  # set current group
+        
+        self.load_fonts()
+        
+        if entry is None and self.layout_engine == "BOX":
+            # lay out equation and generate objects
+            placements, self.term_widths = self.get_layout().layout(self.tree)
+            save_font_metrics()
+            self.gen_placements(placements, collection.name)
+            equation_cache.put(key, CacheEntry(self.tree, placements, self.term_widths))
+        
+        elif entry is None:
+            # generate all terms of equation
+            self.node_paths = node_paths(self.tree)
+            if not self.gen_top_terms(self.tree, 0):
+                return False
+            save_font_metrics()
+            
+            # save equation into cache
+            placements = gen_save_placements(collection.all_objects, self.font)
+            equation_cache.put(key, CacheEntry(self.tree, placements, self.term_widths))
+            
+            # generated text objects are replaced by meshes
+            if self.glyph_type != "CURVE":
+                gen_remove_objects(collection.all_objects)
+                self.gen_placements(placements, collection.name)
+            else:
+                for obj, item in zip(collection.all_objects, placements):
+                    gen_tag_object(obj, item)
+        else:
+            # generate objects from cache
+            self.gen_placements(entry.placements, collection.name)
+            self.term_widths = list(entry.widths)
+        
+        self.save_equation(collection)
+        
+        # select all objects in base collection
+        for obj in bpy.data.collections[collection.name].all_objects:  
+            obj.select_set(True)
+
+        return True
+
+    # function replaces objects of changed terms by objects of placements
+    # old objects of paired nodes with the same shape are moved to the position
+    # of placement, the other old objects are removed
+    # returns new objects
+    def update_objects(self, collection, placements, old_objects, pairs):
+        rotation = Euler(collection.get("text_rotation", (0.0, 0.0, 0.0))).to_matrix()
+        
+        # old objects by node and shape, objects of older versions are removed
+        free = {}
+        removed = []
+        for obj in old_objects:
+            if "eq_path" in obj and "eq_position" in obj and "eq_shape" in obj:
+                free.setdefault((obj["eq_path"], obj["eq_shape"]), []).append(obj)
+            else:
+                removed.append(obj)
+        
+        created = []
+        for item in placements:
+            objects = free.get((find_pair(pairs, item.path), placement_shape(item)))
+            if not objects:
+                created.append(item)
+                continue
+            
+            # object is moved by difference of positions in rotated equation
+            obj = objects.pop()
+            x, y = obj["eq_position"]
+            obj.location += rotation @ Vector((item.x - x, item.y - y, 0.0))
+            gen_tag_object(obj, item)
+            profiler.count("moved objects")
+        
+        for objects in free.values():
+            removed += objects
+        gen_remove_objects(removed)
+        
+        obj_count = len(collection.objects)
+        self.gen_placements(created, collection.name)
+        return list(collection.objects[obj_count:])
+
+    @profiled
+    # regenerating only changed nodes of equation in collection
+    # unchanged terms at the start are kept, unchanged terms at the end are moved,
+    # changed terms are compared node by node with the previous tree and only objects
+    # of changed nodes are generated, for example only a changed cell of matrix
+    def sa_update(self, coll_name):
+        collection = bpy.data.collections[coll_name]
+        
+        # tree of the previous equation
+        old_tree = Parser(collection["latex_text"]).parse()
+        
+        # check the order of tokens before anything is changed
+        parser = Parser(self.latex_text)
+        self.tree = parser.parse()
+        if self.tree is None:
+            self.error = parser.error
+            return False
+        
+        widths = list(collection["term_widths"])
+        first, old_end, new_end = changed_range(old_tree, self.tree)
+        
+        bpy.ops.object.select_all(action='DESELECT') # deselect all objects
+        profiler.count("operators")
+        
+        # nothing has changed
+        if first == old_end and first == new_end:
+            self.term_widths = widths
+            return True
+        
+        # set active collection
+        layer_collection = bpy.context.view_layer.layer_collection
+        for layer in layer_collection.children:
+            if layer.name == collection.name:
+                bpy.context.view_layer.active_layer_collection = layer
+        
+        self.base_collection = collection.name  # set base collection
+        self.current_group = Group(collection.name)  # set current group
+        self.load_fonts()
+        
+        # objects of changed terms and of unchanged terms at the end
+        old_objects = []
+        tail_objects = []
+        for obj in collection.all_objects:
+            term = obj.get("eq_term", 0)
+            if first <= term < old_end:
+                old_objects.append(obj)
+            elif term >= old_end:
+                tail_objects.append(obj)
+        
+        # lay out changed terms from the start width of the first one
+        self.parameters.width = widths[first]
+        if self.layout_engine == "BOX":
+            layout = self.get_layout()
+            placements, self.term_widths = layout.layout(self.tree[first:new_end], first, widths[first])
+            save_font_metrics()
+        else:
+            # scene layout needs generated objects, they are replaced like in sa_prog
+            self.node_paths = node_paths(self.tree)
+            obj_count = len(collection.objects)
+            if not self.gen_top_terms(self.tree[first:new_end], first):
+                gen_remove_objects(collection.objects[obj_count:])
+                return False
+            save_font_metrics()
+            
+            placements = gen_save_placements(collection.objects[obj_count:], self.font)
+            gen_remove_objects(collection.objects[obj_count:])
+        
+        new_objects = self.update_objects(collection, placements, old_objects, match_trees(old_tree, self.tree))
+        
+        # move objects of unchanged terms at the end
+        move_x = self.term_widths[-1] - widths[old_end]
+        move_by = Euler(collection.get("text_rotation", (0.0, 0.0, 0.0))).to_matrix() @ Vector((move_x, 0.0, 0.0))
+        for obj in tail_objects:
+            term = obj["eq_term"]
+            obj["eq_term"] = term + new_end - old_end
+            obj.location += move_by
+            
+            if "eq_path" in obj:
+                obj["eq_path"] = str(obj["eq_term"]) + obj["eq_path"][len(str(term)):]
+            if "eq_position" in obj:
+                obj["eq_position"] = (obj["eq_position"][0] + move_x, obj["eq_position"][1])
+        
+        self.term_widths = widths[:first] + self.term_widths + [w + move_x for w in widths[old_end + 1:]]
+        self.save_equation(collection)
+        
+        # select only new objects
+        for obj in new_objects:
+            obj.select_set(True)
+        
+        return True
+
+    @profiled
+    # measuring ascii characters in both fonts and all symbols of unicode database
+    # metrics are saved, so equations are laid out without measuring
+    # returns number of measured characters
+    def sa_warm_metrics(self):
+        self.load_fonts()
+        metrics = self.get_layout().metrics
+        
+        # text and brackets
+        chars = [chr(code) for code in range(32, 127)]
+        for char in chars:
+            metrics[0].glyph(char)
+            metrics[1].glyph(char)
+        
+        # mathematical symbols
+        load_all_sets()
+        for symbol in reverse_index:
+            for char in symbol:
+                metrics[1].glyph(char)
+        
+        save_font_metrics()
+        return len(metrics[0].glyphs) + len(metrics[1].glyphs)
@@ -0,0 +1,97 @@
+# ---------------------------------------------------------------------------
+# File name   : batch.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# batch file has one equation per line
+# optional location and scale of equation follow the equation, separated by tabs
+#   \frac{a}{b}<TAB>1.0 2.0 0.0<TAB>0.5
+# location is "x y z" or "x,y,z", empty field keeps the value from the panel
+# empty lines and lines starting with % (latex comment) are skipped
+# it doesn't use bpy, so batch files can be checked without Blender
+
+
+# class for one equation of batch file
+# location and scale are None if they are not given
+class BatchItem:
+    def __init__(self, line_num, latex_text, location, scale):
+        self.line_num = line_num
+        self.latex_text = latex_text
+        self.location = location
+        self.scale = scale
+
+
+# function reads location "x y z" or "x,y,z", missing coordinates are 0.0
+# returns None if location is not valid
+def read_location(text):
+    values = text.replace(",", " ").split()
+    if not 1 <= len(values) <= 3:
+        return None
+
+    try:
+        location = [float(value) for value in values]
+    except ValueError:
+        return None
+
+    return tuple(location + [0.0] * (3 - len(location)))
+
+
+# function reads one line of batch file
+# returns item or error message
+def read_line(line_num, line):
+    fields = line.split("\t")
+    if len(fields) > 3:
+        return "too many fields"
+
+    latex_text = fields[0].strip()
+    if latex_text == "":
+        return "missing equation"
+
+    location = None
+    if len(fields) > 1 and fields[1].strip() != "":
+        location = read_location(fields[1])
+        if location is None:
+            return "invalid location '" + fields[1].strip() + "'"
+
+    scale = None
+    if len(fields) > 2 and fields[2].strip() != "":
+        try:
+            scale = float(fields[2])
+        except ValueError:
+            scale = 0.0
+        if not scale > 0.0:
+            return "invalid scale '" + fields[2].strip() + "'"
+
+    return BatchItem(line_num, latex_text, location, scale)
+
+
+# function reads lines of batch file
+# returns list of items and list of errors (line number, message)
+def read_batch_lines(lines):
+    items = []
+    errors = []
+    for line_num, line in enumerate(lines, 1):
+        # skip empty lines and comments
+        if line.strip() == "" or line.lstrip().startswith("%"):
+            continue
+
+        item = read_line(line_num, line)
+        if isinstance(item, str):
+            errors.append((line_num, item))
+        else:
+            items.append(item)
+
+    return items, errors
+
+
+# function reads batch file
+# returns list of items and list of errors (line number, message) or None if file can't be read
+def read_batch(path):
+    try:
+        with open(path, encoding="utf-8") as batch_file:
+            lines = batch_file.read().splitlines()
+    except (OSError, UnicodeDecodeError) as error:
+        print("Error, batch file '" + path + "' can't be read: " + str(error))
+        return None
+
+    return read_batch_lines(lines)
@@ -0,0 +1,132 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_classify.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: python benchmarks/bench_classify.py
+#
+# Compares the cost of classifying one character (and one command) with the
+# tables of tables.py against the lists that were built on every call before.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module, best_time
+
+tables = load_module("tables")
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.txt")
+COMMANDS = ["quad", ",", "alpha", "sqrt", "qquad", "frac", "!", "bmatrix", "matrix", "int"]
+
+
+# previous classification of characters
+def old_get_char(input_character):
+    all_char = [
+        ('\\', "BACKSLASH"),
+        ('{', "OPEN_BRACKET"),
+        ('}', "CLOSE_BRACKET"),
+        ('^', "CARET"),
+        ('_', "UNDERSCORE"),
+        ('&', "AMPERSAND"),
+        ('!', "COMMAND_SPACES"),
+        (';', "COMMAND_SPACES"),
+        (':', "COMMAND_SPACES"),
+        (',', "COMMAND_SPACES"),
+        ('[', "ANGLE_BRACKETS"),
+        (']', "ANGLE_BRACKETS"),
+        (' ', "WHITESPACE"),
+        ('\n', "WHITESPACE")
+    ]
+    for item in all_char:
+        if input_character == item[0]:
+            return item[1]
+
+    return "OTHER"
+
+
+# previous classification of commands
+def old_get_space_size(char, scale):
+    space_sizes = [
+        ('!', -0.1),
+        (',', 0.15),
+        (':', 0.2),
+        (';', 0.25),
+        (' ', 0.3),
+        ("quad", 0.6),
+        ("qquad", 1.2)
+    ]
+    for item in space_sizes:
+        if char == item[0]:
+            return item[1] * scale
+
+    return 0.0
+
+
+def old_get_mx_brackets(value):
+    brackets = [
+        ("bmatrix", ('[', ']')),
+        ("Bmatrix", ('{', '}')),
+        ("pmatrix", ('(', ')')),
+        ("vmatrix", ('|', '|')),
+        ("Vmatrix", ('||', '||'))
+    ]
+    for item in brackets:
+        if value == item[0]:
+            return item[1]
+
+    return ('', '')
+
+
+def classify_chars_old(text):
+    for char in text:
+        old_get_char(char)
+
+
+# classification of characters by table, the same as in lexer
+def get_char(input_character):
+    return tables.char_types.get(input_character, "OTHER")
+
+
+def classify_chars_new(text):
+    for char in text:
+        get_char(char)
+
+
+def classify_commands_old(commands):
+    for command in commands:
+        old_get_space_size(command, 1.0)
+        old_get_mx_brackets(command)
+
+
+def classify_commands_new(commands):
+    for command in commands:
+        tables.space_sizes.get(command, 0.0)
+        tables.matrix_brackets.get(command, ('', ''))
+
+
+def main():
+    with open(CORPUS, encoding="utf-8") as corpus:
+        text = corpus.read() * 200
+    commands = COMMANDS * 20000
+
+    # same results
+    for char in set(text):
+        if old_get_char(char) != get_char(char):
+            print("Error, character '" + char + "' is classified differently!")
+            return 1
+
+    char_old = best_time(lambda: classify_chars_old(text)) / len(text) * 1e9
+    char_new = best_time(lambda: classify_chars_new(text)) / len(text) * 1e9
+    comm_old = best_time(lambda: classify_commands_old(commands)) / len(commands) * 1e9
+    comm_new = best_time(lambda: classify_commands_new(commands)) / len(commands) * 1e9
+
+    print("%-22s %10s %10s" % ("", "old [ns]", "new [ns]"))
+    print("%-22s %10.1f %10.1f" % ("per character", char_old, char_new))
+    print("%-22s %10.1f %10.1f" % ("per command", comm_old, comm_new))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_fonts.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: blender --background --factory-startup --python benchmarks/bench_fonts.py [-- font.ttf]
+#
+# Generates the same equation 1000 times (with the given default font if any)
+# and checks that every font file has exactly one font datablock afterwards.
+# Exits with 1 if fonts were loaded more than once.
+
+import os
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module
+
+analyser = load_module("analyser")
+
+EQUATION = "\\sum_{i=1}^{n} \\alpha_i \\cdot x^2"
+COUNT = 1000
+
+
+# function removes all objects of generated equations and their collections
+def clear_equations():
+    for collection in list(bpy.data.collections):
+        if "latex_text" in collection:
+            for obj in list(collection.all_objects):
+                bpy.data.objects.remove(obj)
+            bpy.data.collections.remove(collection)
+
+
+def main():
+    font_path = ""
+    if "--" in sys.argv and len(sys.argv) > sys.argv.index("--") + 1:
+        font_path = os.path.abspath(sys.argv[sys.argv.index("--") + 1])
+
+    start = time.perf_counter()
+    for i in range(COUNT):
+        syntax = analyser.SyntaxAnalyser(EQUATION, bpy.context, 1.0, font_path)
+        if not syntax.sa_prog():
+            print("Error, equation can't be generated!")
+            return 1
+        clear_equations()
+    elapsed = time.perf_counter() - start
+    print("%d equations in %.3f s, %.3f ms per equation" % (COUNT, elapsed, elapsed * 1000.0 / COUNT))
+
+    # number of datablocks of every font file
+    font_count = {}
+    for font in bpy.data.fonts:
+        if font.filepath != "<builtin>":
+            font_file = bpy.path.abspath(font.filepath)
+            font_count[font_file] = font_count.get(font_file, 0) + 1
+
+    result = 0
+    for font_file, count in sorted(font_count.items()):
+        print("%3d datablocks of %s" % (count, font_file))
+        if count != 1:
+            result = 1
+
+    print("Error, fonts were loaded more than once!" if result else "Every font was loaded once.")
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_glyphs.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: blender --background --factory-startup --python benchmarks/bench_glyphs.py
+#
+# Compares the cost of one glyph created by edit-mode operators (the old
+# gen_text) with the cost of one glyph created through the data API (gen_text).
+# Ink boxes of glyphs come from metrics of the default font, they are measured
+# before the time is taken, so the scene isn't updated for any glyph.
+
+import os
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module
+
+generator = load_module("generator")
+metrics = load_module("metrics")
+
+GLYPHS = ["x", "2", "+", "\u03b1", "\u2211"]
+COUNT = 500
+
+
+# the old gen_text with edit-mode operators
+def old_gen_text(context, text, font):
+    bpy.ops.object.text_add(enter_editmode=True, align='WORLD', location=(0, 0, 0), scale=(1, 1, 1))
+    bpy.ops.font.delete(type='PREVIOUS_WORD')
+    bpy.ops.font.text_insert(text=text)
+    bpy.ops.object.editmode_toggle()
+
+    active_obj = context.active_object
+    if text == '\u2211' or text == '\u222b' or text == '\u220f':
+        active_obj.scale.x = 3.5
+        active_obj.scale.y = 3.5
+        bpy.ops.object.transform_apply(scale=True, location=False, rotation=False)
+
+    bpy.ops.object.select_all(action='DESELECT')
+    bpy.data.objects[active_obj.name].select_set(True)
+
+
+# function removes all objects and their data
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for curve in list(bpy.data.curves):
+        bpy.data.curves.remove(curve)
+
+
+# function returns the best time of creating COUNT glyphs in empty scene
+def time_glyphs(gen_function, runs=3):
+    context = bpy.context
+    best = None
+    for run in range(runs):
+        clear_scene()
+        start = time.perf_counter()
+        for i in range(COUNT):
+            gen_function(context, GLYPHS[i % len(GLYPHS)], "")
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+# function sets metrics of the default font for gen_text and measures all glyphs
+def set_metrics():
+    context = bpy.context
+    font_metrics = metrics.get_font_metrics("", None, bpy.app.version_string)
+    font_metrics.measure = lambda char: generator.gen_measure_glyph(context, char, "", font_metrics)
+    for text in GLYPHS:
+        font_metrics.text_box(text)
+    generator.gen_set_text_metrics("", font_metrics)
+
+
+def main():
+    set_metrics()
+    results = []
+    for name, gen_function in (("operators", old_gen_text), ("data API", generator.gen_text)):
+        elapsed = time_glyphs(gen_function)
+        results.append(elapsed)
+        print("%-10s %d glyphs in %.3f s, %.3f ms per glyph" % (name, COUNT, elapsed, elapsed * 1000.0 / COUNT))
+
+    print("speedup %.1fx" % (results[0] / results[1]))
+    clear_scene()
+    return 0
+
+
+if __name__ == "__main__":
+    main()
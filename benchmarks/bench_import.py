@@ -0,0 +1,74 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_import.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: python benchmarks/bench_import.py
+#        blender --background --factory-startup --python benchmarks/bench_import.py
+#
+# Imports the addon package and its pure python core (lexer, parser, tables,
+# layout...) and prints the time of the imports. Checks that neither of them
+# imports bpy, mathutils or numpy. In Blender it also registers and
+# unregisters the addon and prints the time of registration.
+# Exits with 1 if the package or the core imports Blender modules.
+
+import importlib
+import importlib.util
+import os
+import sys
+import time
+
+# directory of the addon (parent of benchmarks directory)
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "mathematical_equations"
+
+# modules which must not be imported by the core
+BLENDER_MODULES = ["bpy", "mathutils", "numpy"]
+
+
+# function imports the addon package with its __init__.py
+def load_package():
+    spec = importlib.util.spec_from_file_location(PACKAGE_NAME, os.path.join(ADDON_DIR, "__init__.py"),
+                                                  submodule_search_locations=[ADDON_DIR])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_NAME] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+def main():
+    # Blender has its modules imported before the script runs
+    loaded = [name for name in BLENDER_MODULES if name in sys.modules]
+
+    start = time.perf_counter()
+    package = load_package()
+    package_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for module_name in package.CORE_MODULES:
+        importlib.import_module(PACKAGE_NAME + "." + module_name)
+    core_time = time.perf_counter() - start
+
+    print("package %.1f ms, core (%d modules) %.1f ms"
+          % (package_time * 1000.0, len(package.CORE_MODULES), core_time * 1000.0))
+
+    imported = [name for name in BLENDER_MODULES if name in sys.modules and name not in loaded]
+    if imported:
+        print("Error, package or core imports %s!" % ", ".join(imported))
+        return 1
+
+    if "bpy" in sys.modules:
+        package.register()
+        print("registration %.1f ms (import %.1f ms, classes %.1f ms)"
+              % ((package.register_times["import"] + package.register_times["register"]) * 1000.0,
+                 package.register_times["import"] * 1000.0, package.register_times["register"] * 1000.0))
+
+        # generator is imported only by the first equation
+        print("generator imported on registration: %s" % (PACKAGE_NAME + ".generator" in sys.modules))
+        package.unregister()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
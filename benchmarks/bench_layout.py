@@ -0,0 +1,56 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_layout.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: python benchmarks/bench_layout.py
+#
+# Parses and lays out the corpus without Blender (default glyph metrics are
+# used instead of measured ones) and prints how many equations are laid out
+# per second and how many objects would be created.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module, best_time
+
+parser = load_module("parser")
+layout = load_module("layout")
+metrics = load_module("metrics")
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.txt")
+REPEAT = 100
+
+
+# function lays out all parsed equations, returns number of placements
+def layout_all(box_layout, trees):
+    count = 0
+    for tree in trees:
+        placements, widths = box_layout.layout(tree)
+        count += len(placements)
+
+    return count
+
+
+def main():
+    with open(CORPUS, encoding="utf-8") as corpus:
+        equations = [line.strip() for line in corpus if line.strip()]
+
+    trees = [parser.Parser(equation).parse() for equation in equations]
+    if None in trees:
+        print("Error, corpus contains invalid equations!")
+        return 1
+
+    box_layout = layout.BoxLayout([metrics.FontMetrics(), metrics.FontMetrics()], 1.0)
+    print("%d objects in %d equations" % (layout_all(box_layout, trees), len(trees)))
+
+    trees = trees * REPEAT
+    elapsed = best_time(lambda: layout_all(box_layout, trees))
+    print("%d equations in %.3f s, %.0f equations per second" % (len(trees), elapsed, len(trees) / elapsed))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
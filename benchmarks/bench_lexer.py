@@ -0,0 +1,151 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_lexer.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: python benchmarks/bench_lexer.py
+#
+# Compares the cursor based lexer with the previous lexer, which erased every
+# read character from the input string, and checks that both produce the same
+# stream of tokens.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module, best_time
+
+lexer = load_module("lexer")
+tables = load_module("tables")
+
+# part of equation repeated up to the wanted size
+PATTERN = "\\frac{\\alpha_{i}^{2}}{x+y} \\sqrt[3]{a,b} \\sum_{k=0}^{n} k\\; " \
+          "\\begin{bmatrix} 1 & 0 \\\\ 0 & 1 \\end{bmatrix} \\{x\\} \\quad "
+
+SIZES = [1000, 10000, 100000]
+
+
+# previous lexer, kept for the comparison
+class OldLexicalAnalyser(lexer.LexicalAnalyser):
+    def __init__(self, latex_text):
+        super().__init__(latex_text)
+
+    @staticmethod
+    def get_char(input_character):
+        return tables.char_types.get(input_character, "OTHER")
+
+    @staticmethod
+    def is_special_char(char):
+        return char in tables.special_chars
+
+    def get_token(self):
+        state = "STATE_START"
+        tmp_string = ""
+
+        token = lexer.Token("UNKNOWN", "")
+
+        while True:
+            if state == "STATE_START" and self.text == '':
+                token.type = "END"
+                return token
+            elif self.text == '':
+                c = "END"
+            else:
+                c = self.get_char(self.text[0])
+
+            if state == "STATE_START":
+                if c == "BACKSLASH":
+                    state = "STATE_COMMAND"
+                    self.text = self.text[1:]
+                elif c == "OTHER" or c == "COMMAND_SPACES":
+                    state = "STATE_TEXT"
+                elif c == "WHITESPACE":
+                    self.text = self.text[1:]
+                    continue
+                elif c == "ANGLE_BRACKETS":
+                    token.type = "TEXT"
+                    token.value = self.text[0]
+                    self.text = self.text[1:]
+                    return token
+                else:
+                    token.type = c
+                    token.value = self.text[0]
+                    self.text = self.text[1:]
+                    return token
+
+            elif state == "STATE_COMMAND":
+                if self.is_special_char(c):
+                    token.type = "SPECIAL_CHAR"
+                    token.value = self.text[0]
+                    self.text = self.text[1:]
+                    return token
+                elif c == "BACKSLASH":
+                    token.type = "ENTER"
+                    token.value = "\\"
+                    self.text = self.text[1:]
+                    return token
+                elif c == "COMMAND_SPACES":
+                    token.type = "COMMAND"
+                    token.value = self.text[0]
+                    self.text = self.text[1:]
+                    return token
+                elif c == "OTHER":
+                    state = "STATE_COMMAND_NAME"
+                else:
+                    token.type = "COMMAND"
+                    token.value = " "
+                    self.text = self.text[1:]
+                    return token
+
+            elif state == "STATE_COMMAND_NAME":
+                if c == "OTHER" and self.text[0].isalpha():
+                    tmp_string = tmp_string + self.text[0]
+                    self.text = self.text[1:]
+                else:
+                    token.type = "COMMAND"
+                    token.value = tmp_string
+                    return token
+
+            elif state == "STATE_TEXT":
+                if c != "OTHER" and c != "COMMAND_SPACES":
+                    token.type = "TEXT"
+                    token.value = tmp_string
+                    return token
+                else:
+                    tmp_string = tmp_string + self.text[0]
+                    self.text = self.text[1:]
+
+
+# function reads all tokens of text
+def tokenize(analyser_class, text):
+    analyser = analyser_class(text)
+    tokens = []
+    while True:
+        # every token is looked at before it is read
+        analyser.peek()
+        token = analyser.next()
+        tokens.append((token.type, token.value))
+
+        if token.type == "END":
+            return tokens
+
+
+def main():
+    # same token stream
+    text = PATTERN * 20 + "\\, a \\^ b \\"
+    if tokenize(OldLexicalAnalyser, text) != tokenize(lexer.LexicalAnalyser, text):
+        print("Error, token streams of lexers are not the same!")
+        return 1
+
+    print("%10s %12s %12s %14s" % ("chars", "old [s]", "new [s]", "new [us/char]"))
+    for size in SIZES:
+        text = (PATTERN * (size // len(PATTERN) + 1))[:size]
+        old_time = best_time(lambda: tokenize(OldLexicalAnalyser, text), 1)
+        new_time = best_time(lambda: tokenize(lexer.LexicalAnalyser, text))
+        print("%10d %12.4f %12.4f %14.3f" % (size, old_time, new_time, new_time / size * 1e6))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
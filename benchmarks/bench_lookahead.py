@@ -0,0 +1,55 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_lookahead.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: python benchmarks/bench_lookahead.py
+#
+# Parses every equation of the corpus and compares the number of tokens
+# lexed by the parser with the number of tokens in the equation.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module
+
+lexer = load_module("lexer")
+parser = load_module("parser")
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.txt")
+
+
+# function returns number of tokens in text (END token included)
+def count_tokens(text):
+    lexical = lexer.LexicalAnalyser(text)
+    count = 1
+    while lexical.get_token().type != "END":
+        count += 1
+
+    return count
+
+
+def main():
+    with open(CORPUS, encoding="utf-8") as corpus:
+        equations = [line.strip() for line in corpus if line.strip()]
+
+    all_tokens = 0
+    all_lexed = 0
+    print("%8s %8s  %s" % ("tokens", "lexed", "equation"))
+    for equation in equations:
+        equation_parser = parser.Parser(equation)
+        equation_parser.parse()
+
+        tokens = count_tokens(equation)
+        all_tokens += tokens
+        all_lexed += equation_parser.lex_count
+        print("%8d %8d  %s" % (tokens, equation_parser.lex_count, equation))
+
+    print("%8d %8d  lexes per token: %.2f" % (all_tokens, all_lexed, all_lexed / all_tokens))
+
+    return 0 if all_lexed == all_tokens else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
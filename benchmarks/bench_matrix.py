@@ -0,0 +1,87 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_matrix.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: blender --background --factory-startup --python benchmarks/bench_matrix.py
+#
+# Generates matrices from 2x2 to 50x50 with the scene layout and prints the
+# time of the whole equation, the time of positioning cells (gen_matrix_pos)
+# and the number of bound queries made by the generator.
+
+import os
+import sys
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module
+
+generator = load_module("generator")
+analyser = load_module("analyser")
+cache = load_module("cache")
+
+SIZES = [2, 5, 10, 20, 30, 50]
+
+
+# function returns latex text of matrix with size x size cells
+def matrix_text(size):
+    row = " & ".join("x_{%d}" % i for i in range(size))
+    return "\\begin{pmatrix}" + " \\\\ ".join([row] * size) + "\\end{pmatrix}"
+
+
+# function removes all objects, their data and collections
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for curve in list(bpy.data.curves):
+        bpy.data.curves.remove(curve)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+    for collection in list(bpy.data.collections):
+        bpy.data.collections.remove(collection)
+
+
+def main():
+    stats = {"queries": 0, "position": 0.0}
+    gen_bounds = generator.gen_bounds
+    gen_matrix_pos = generator.gen_matrix_pos
+
+    # count bound queries and time of positioning
+    def counted_bounds(context, collection):
+        stats["queries"] += 1
+        return gen_bounds(context, collection)
+
+    def timed_matrix_pos(context, obj_array, param):
+        start = time.perf_counter()
+        gen_matrix_pos(context, obj_array, param)
+        stats["position"] += time.perf_counter() - start
+
+    generator.gen_bounds = counted_bounds
+    analyser.gen_matrix_pos = timed_matrix_pos
+
+    for size in SIZES:
+        clear_scene()
+        cache.equation_cache.invalidate()
+        stats["queries"] = 0
+        stats["position"] = 0.0
+
+        syntax = analyser.SyntaxAnalyser(matrix_text(size), bpy.context, 1.0, "", "SCENE")
+        start = time.perf_counter()
+        if not syntax.sa_prog():
+            print("Error, matrix %dx%d can't be generated!" % (size, size))
+            return 1
+        elapsed = time.perf_counter() - start
+
+        print("%2dx%-2d equation %8.3f s, positioning %7.3f s, %6d bound queries"
+              % (size, size, elapsed, stats["position"], stats["queries"]))
+
+    generator.gen_bounds = gen_bounds
+    analyser.gen_matrix_pos = gen_matrix_pos
+    clear_scene()
+    return 0
+
+
+if __name__ == "__main__":
+    main()
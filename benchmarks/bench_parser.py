@@ -0,0 +1,49 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_parser.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: python benchmarks/bench_parser.py
+#
+# Parses the corpus without Blender and prints how many equations are
+# parsed and checked per second.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module, best_time
+
+parser = load_module("parser")
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.txt")
+REPEAT = 100
+
+
+# function parses all equations, returns number of invalid equations
+def parse_all(equations):
+    invalid = 0
+    for equation in equations:
+        if parser.Parser(equation).parse() is None:
+            invalid += 1
+
+    return invalid
+
+
+def main():
+    with open(CORPUS, encoding="utf-8") as corpus:
+        equations = [line.strip() for line in corpus if line.strip()]
+
+    if parse_all(equations):
+        print("Error, corpus contains invalid equations!")
+        return 1
+
+    equations = equations * REPEAT
+    elapsed = best_time(lambda: parse_all(equations))
+    print("%d equations in %.3f s, %.0f equations per second" % (len(equations), elapsed, len(equations) / elapsed))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_stress.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: python benchmarks/bench_stress.py
+#
+# Parses very long equations with the default recursion limit of Python.
+# Depth of the parser depends only on nesting of brackets, not on the number
+# of terms.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module, best_time
+
+parser = load_module("parser")
+
+
+# function returns polynomial with given number of terms
+def polynomial(terms):
+    return " + ".join("a_{%d} x^{%d}" % (i, i) for i in range(terms))
+
+
+# function returns matrix with given number of rows and columns
+def matrix(size):
+    rows = [" & ".join("x_{%d}" % (row * size + col) for col in range(size)) for row in range(size)]
+    return "\\begin{pmatrix} " + " \\\\ ".join(rows) + " \\end{pmatrix}"
+
+
+# function returns text of given number of plain terms
+def plain_terms(terms):
+    return " ".join("\\alpha" if i % 2 else "x" for i in range(terms))
+
+
+STRESS = [
+    ("polynomial, 3000 terms", polynomial(3000)),
+    ("polynomial, 10000 terms", polynomial(10000)),
+    ("plain terms, 10000 terms", plain_terms(10000)),
+    ("matrix 40x40", matrix(40)),
+    ("matrix 100x100", matrix(100)),
+]
+
+
+def main():
+    print("recursion limit: %d" % sys.getrecursionlimit())
+    print("%-28s %10s %10s" % ("equation", "chars", "time [s]"))
+
+    failed = 0
+    for name, equation in STRESS:
+        if parser.Parser(equation).parse() is None:
+            print("%-28s %10d %10s" % (name, len(equation), "failed"))
+            failed += 1
+            continue
+
+        elapsed = best_time(lambda: parser.Parser(equation).parse())
+        print("%-28s %10d %10.3f" % (name, len(equation), elapsed))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_stretch.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: python benchmarks/bench_stretch.py
+#
+# Checks that the sqrt symbol stretched by stretch_verts (sqrt_geometry used
+# by both layouts) has the same vertices as the symbol stretched by the
+# previous rules written vertex by vertex, for many sizes of text under it,
+# including the case when the symbol is already high enough, and compares
+# the time of both.
+# Exits with 1 if any vertex is different.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module, best_time
+
+geometry = load_module("geometry")
+tables = load_module("tables")
+
+SCALES = [0.5, 1.0, 2.5]
+WIDTHS = [0.0, 0.3, 1.0, 5.0, 20.0]
+HEIGHTS = [-0.5, 0.0, 0.4, 0.8, 1.5, 4.0]
+DEPTHS = [-0.3, 0.0, 0.2, 0.6, 2.0]
+
+TOLERANCE = 1e-9
+
+
+# previous sqrt_geometry, every rule is a pass over vertices
+def old_sqrt_geometry(scale, x_pos, depth, height):
+    verts = [[(vert[0] - tables.sqrt_origin[0]) * scale, (vert[1] - tables.sqrt_origin[1]) * scale, 0.0]
+             for vert in tables.sqrt_verts]
+
+    max_x = max(vert[0] for vert in verts)
+    for vert in verts:
+        if vert[0] == max_x:
+            vert[0] = x_pos
+
+    max_y = max(vert[1] for vert in verts)
+    move_by = height + 0.4 * scale
+    if (max_y - 0.06) > move_by:
+        return [tuple(vert) for vert in verts]
+
+    for vert in verts:
+        if vert[1] == max_y:
+            vert[1] = move_by + 0.05929052829742433 * scale
+        elif vert[1] >= (max_y - (0.06 * scale)):
+            vert[1] = move_by
+
+    min_y = min(vert[1] for vert in verts)
+    move_by = 0.2 * scale - depth
+    if min_y >= move_by:
+        for vert in verts:
+            if vert[1] == min_y:
+                vert[1] = move_by
+            elif vert[1] <= (min_y + (0.15 * scale)):
+                vert[1] = move_by + 0.14427322149276733 * scale
+
+    return [tuple(vert) for vert in verts]
+
+
+# function returns all tested sizes as (scale, x_pos, depth, height)
+def get_cases():
+    cases = []
+    for scale in SCALES:
+        for width in WIDTHS:
+            for height in HEIGHTS:
+                for depth in DEPTHS:
+                    cases.append((scale, width * scale, depth * scale, height * scale))
+
+    return cases
+
+
+def main():
+    cases = get_cases()
+
+    for case in cases:
+        new = geometry.sqrt_geometry(*case)
+        old = old_sqrt_geometry(*case)
+        difference = max(abs(a - b) for new_vert, old_vert in zip(new, old) for a, b in zip(new_vert, old_vert))
+        if difference > TOLERANCE:
+            print("Error, vertices differ by %g for scale %g, x %g, depth %g, height %g!" % ((difference,) + case))
+            return 1
+
+    new_time = best_time(lambda: [geometry.sqrt_geometry(*case) for case in cases])
+    old_time = best_time(lambda: [old_sqrt_geometry(*case) for case in cases])
+    print("%d cases are the same" % len(cases))
+    print("stretch_verts %.1f us, vertex by vertex %.1f us per symbol"
+          % (new_time / len(cases) * 1e6, old_time / len(cases) * 1e6))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+# ---------------------------------------------------------------------------
+# File name   : bench_suite.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+#
+# Usage: blender --background --factory-startup --python benchmarks/bench_suite.py [-- options]
+#        python benchmarks/bench_suite.py [options]
+#
+# Times every stage of generating the equations of suite_corpus.txt, grouped
+# by category of the corpus (plain text, symbols, nested fractions and roots,
+# sums with limits, matrices of growing size):
+#   lex      - tokens of lexer
+#   parse    - parsed tree
+#   layout   - box layout with default glyph metrics
+#   glyphs   - objects created from placements (Blender)
+#   scene    - whole scene layout (Blender)
+#   matrix   - positioning of matrix cells in scene layout (Blender)
+#   finish   - customization of generated objects by operators of ui.py (Blender)
+#   batch    - customization of generated objects in batch (Blender)
+# Outside Blender only the stages without bpy are timed.
+#
+# Times are compared with the baseline saved by --save on the same machine,
+# a stage is a regression if it is slower than its threshold (--threshold).
+# Baseline has separate times for python and for Blender, --save replaces
+# only the times of the environment it runs in.
+# Baseline is bound to the version of the corpus, changed corpus needs a new one.
+# Exits with 1 if any stage is a regression, with 2 if baseline can't be used
+# (missing file, no times for this environment, other version of corpus).
+
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import load_module
+
+lexer = load_module("lexer")
+parser = load_module("parser")
+layout = load_module("layout")
+metrics = load_module("metrics")
+
+if bpy is not None:
+    generator = load_module("generator")
+    analyser = load_module("analyser")
+    cache = load_module("cache")
+    ui = load_module("ui")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS = os.path.join(BENCH_DIR, "suite_corpus.txt")
+BASELINE = os.path.join(BENCH_DIR, "suite_baseline.json")
+
+# stages without bpy are repeated, so their time is measurable
+REPEAT = 50
+
+# allowed slowdown of stages, stages in Blender are noisier
+THRESHOLDS = {"lex": 0.2, "parse": 0.2, "layout": 0.2,
+              "glyphs": 0.3, "scene": 0.3, "matrix": 0.3, "finish": 0.3, "batch": 0.3}
+
+# shorter times are not compared, they are mostly noise
+MIN_TIME = 0.002
+
+# environment the times are measured in, baseline keeps both
+ENVIRONMENT = "python" if bpy is None else "blender"
+
+
+# class for settings of panel used by operators
+class Settings:
+    def __init__(self):
+        self.text_thickness = 0.1
+        self.text_location = (1.0, 2.0, 0.0)
+        self.text_rotation = (0.5, 0.0, 0.0)
+
+
+# function reads corpus, returns its version and equations of every category
+def read_corpus(path):
+    version = None
+    categories = {}
+    with open(path, encoding="utf-8") as corpus:
+        for line in corpus:
+            line = line.rstrip("\n")
+            if line.startswith("% version:"):
+                version = int(line.split(":")[1])
+            elif line.strip() != "" and not line.startswith("%"):
+                category, equation = line.split("\t")
+                categories.setdefault(category, []).append(equation)
+
+    return version, categories
+
+
+# function removes all objects, their data and collections
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for curve in list(bpy.data.curves):
+        bpy.data.curves.remove(curve)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+    for collection in list(bpy.data.collections):
+        bpy.data.collections.remove(collection)
+    cache.equation_cache.invalidate()
+    generator.gen_invalidate_bounds()
+
+
+# function lexes all equations, returns time
+def time_lex(equations):
+    start = time.perf_counter()
+    for i in range(REPEAT):
+        for equation in equations:
+            lex = lexer.LexicalAnalyser(equation)
+            while lex.next().type != "END":
+                pass
+
+    return time.perf_counter() - start
+
+
+# function parses all equations, returns time
+def time_parse(equations):
+    start = time.perf_counter()
+    for i in range(REPEAT):
+        for equation in equations:
+            parser.Parser(equation).parse()
+
+    return time.perf_counter() - start
+
+
+# function returns box layout with default glyph metrics
+def get_box_layout():
+    return layout.BoxLayout([metrics.FontMetrics(), metrics.FontMetrics()], 1.0)
+
+
+# function lays out all equations, returns time
+def time_layout(equations):
+    trees = [parser.Parser(equation).parse() for equation in equations]
+    box_layout = get_box_layout()
+
+    start = time.perf_counter()
+    for i in range(REPEAT):
+        for tree in trees:
+            box_layout.layout(tree)
+
+    return time.perf_counter() - start
+
+
+# function returns loaded fonts of addon
+def get_fonts():
+    syntax = analyser.SyntaxAnalyser("", bpy.context, 1.0, "")
+    syntax.load_fonts()
+    return syntax.font
+
+
+# function creates objects of all equations from their placements, returns time
+def time_glyphs(equations):
+    clear_scene()
+    box_layout = get_box_layout()
+    placements = [box_layout.layout(parser.Parser(equation).parse())[0] for equation in equations]
+    font = get_fonts()
+
+    collection = bpy.data.collections.new("MathematicalEqCollection")
+    bpy.context.scene.collection.children.link(collection)
+
+    start = time.perf_counter()
+    for items in placements:
+        generator.gen_from_placements(bpy.context, items, font, collection.name)
+
+    return time.perf_counter() - start
+
+
+# function generates all equations with scene layout
+# returns time of equations and time of positioning of matrix cells
+def time_scene(equations):
+    clear_scene()
+    matrix_time = [0.0]
+    gen_matrix_pos = analyser.gen_matrix_pos
+
+    def timed_matrix_pos(context, obj_array, param):
+        start = time.perf_counter()
+        gen_matrix_pos(context, obj_array, param)
+        matrix_time[0] += time.perf_counter() - start
+
+    analyser.gen_matrix_pos = timed_matrix_pos
+    try:
+        start = time.perf_counter()
+        for equation in equations:
+            analyser.SyntaxAnalyser(equation, bpy.context, 1.0, "", "SCENE").sa_prog()
+        elapsed = time.perf_counter() - start
+    finally:
+        analyser.gen_matrix_pos = gen_matrix_pos
+
+    return elapsed, matrix_time[0]
+
+
+# function generates all equations, returns their objects
+def gen_equations(equations):
+    clear_scene()
+    all_objects = []
+    for equation in equations:
+        syntax = analyser.SyntaxAnalyser(equation, bpy.context, 1.0, "")
+        syntax.sa_prog()
+        all_objects.append(list(bpy.data.collections[syntax.base_collection].all_objects))
+
+    return all_objects
+
+
+# function customizes objects of all equations like the operator Add Text, returns time
+def time_finish(equations):
+    all_objects = gen_equations(equations)
+    settings = Settings()
+
+    start = time.perf_counter()
+    for objects in all_objects:
+        for obj in bpy.context.selected_objects:
+            obj.select_set(False)
+        for obj in objects:
+            obj.select_set(True)
+        ui.finish_equation(bpy.context, settings, objects)
+
+    return time.perf_counter() - start
+
+
+# function customizes objects of all equations like the operator Add Batch, returns time
+def time_batch(equations):
+    all_objects = gen_equations(equations)
+    settings = Settings()
+
+    start = time.perf_counter()
+    for objects in all_objects:
+        ui.finish_batch_equation(objects, settings.text_thickness, settings.text_location,
+                                 settings.text_rotation)
+    bpy.context.view_layer.update()
+
+    return time.perf_counter() - start
+
+
+# function returns the best times of all stages for equations of one category
+def time_category(equations, runs):
+    stages = {}
+
+    def add(stage, elapsed):
+        stages[stage] = min(stages.get(stage, elapsed), elapsed)
+
+    for i in range(runs):
+        add("lex", time_lex(equations))
+        add("parse", time_parse(equations))
+        add("layout", time_layout(equations))
+
+        if bpy is not None:
+            add("glyphs", time_glyphs(equations))
+            scene_time, matrix_time = time_scene(equations)
+            add("scene", scene_time)
+            add("matrix", matrix_time)
+            add("finish", time_finish(equations))
+            add("batch", time_batch(equations))
+
+    return stages
+
+
+# function compares times with baseline, returns list of regressions
+def compare(times, baseline, threshold):
+    regressions = []
+    for category, stages in times.items():
+        for stage, elapsed in stages.items():
+            base = baseline.get(category, {}).get(stage)
+            if base is None or base < MIN_TIME:
+                continue
+
+            limit = threshold if threshold is not None else THRESHOLDS[stage]
+            if elapsed > base * (1.0 + limit):
+                regressions.append((category, stage, base, elapsed))
+
+    return regressions
+
+
+# function reads baseline, returns it or None if it can't be used
+def read_baseline(path, version):
+    try:
+        with open(path, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    except FileNotFoundError:
+        print("Error, baseline '%s' doesn't exist, save one with --save!" % path)
+        return None
+    except (OSError, ValueError) as error:
+        print("Error, baseline can't be read: " + str(error))
+        return None
+
+    if baseline.get("version") != version:
+        print("Error, baseline is for corpus version %s, corpus has version %s!" % (baseline.get("version"), version))
+        return None
+
+    return baseline
+
+
+# function saves times of this environment into baseline, times of the other one are kept
+def save_baseline(path, version, times):
+    baseline = {"version": version, "times": {}}
+    if os.path.exists(path):
+        old = read_baseline(path, version)
+        if old is not None:
+            baseline["times"] = old.get("times", {})
+
+    baseline["times"][ENVIRONMENT] = times
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(baseline, baseline_file, indent=1, sort_keys=True)
+        baseline_file.write("\n")
+
+
+# function returns arguments after "--" in Blender, all arguments otherwise
+def get_argv():
+    if bpy is None:
+        return sys.argv[1:]
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+
+    return []
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(prog="bench_suite.py")
+    arg_parser.add_argument("--baseline", default=BASELINE, help="path to JSON baseline")
+    arg_parser.add_argument("--save", action="store_true", help="save times as the new baseline")
+    arg_parser.add_argument("--threshold", type=float, default=None,
+                            help="allowed slowdown of all stages, 0.2 is 20 %%")
+    arg_parser.add_argument("--runs", type=int, default=3, help="number of runs, the best one is used")
+    args = arg_parser.parse_args(get_argv())
+
+    version, categories = read_corpus(CORPUS)
+    for category, equations in categories.items():
+        for equation in equations:
+            if parser.Parser(equation).parse() is None:
+                print("Error, corpus contains invalid equation '%s'!" % equation)
+                return 2
+
+    times = {}
+    for category, equations in categories.items():
+        times[category] = time_category(equations, max(1, args.runs))
+        print("%-9s %s" % (category, "  ".join("%s %.4f s" % item for item in times[category].items())))
+
+    if bpy is not None:
+        clear_scene()
+
+    if args.save:
+        save_baseline(args.baseline, version, times)
+        print("Baseline of %s saved to %s" % (ENVIRONMENT, args.baseline))
+        return 0
+
+    baseline = read_baseline(args.baseline, version)
+    if baseline is None:
+        return 2
+
+    if ENVIRONMENT not in baseline.get("times", {}):
+        print("Error, baseline has no times for %s, save them with --save!" % ENVIRONMENT)
+        return 2
+
+    regressions = compare(times, baseline["times"][ENVIRONMENT], args.threshold)
+    for category, stage, base, elapsed in regressions:
+        print("Regression of %s in %s: %.4f s -> %.4f s (%+.0f %%)"
+              % (stage, category, base, elapsed, (elapsed / base - 1.0) * 100.0))
+
+    print("%d regressions." % len(regressions) if regressions else "No regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+# ---------------------------------------------------------------------------
+# File name   : common.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+import importlib
+import os
+import sys
+import time
+import types
+
+# directory of the addon (parent of benchmarks directory)
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "mathematical_equations"
+
+
+# function imports module of the addon without registering the addon
+# modules that don't use bpy can be imported outside of Blender
+def load_module(module_name):
+    if PACKAGE_NAME not in sys.modules:
+        package = types.ModuleType(PACKAGE_NAME)
+        package.__path__ = [ADDON_DIR]
+        sys.modules[PACKAGE_NAME] = package
+
+    return importlib.import_module(PACKAGE_NAME + "." + module_name)
+
+
+# function returns the best time of given number of runs in seconds
+def best_time(function, runs=3):
+    best = None
+    for i in range(runs):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
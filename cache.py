@@ -0,0 +1,71 @@
+# ---------------------------------------------------------------------------
+# File name   : cache.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+import os.path
+from collections import OrderedDict
+
+# maximum number of cached equations
+CACHE_SIZE = 64
+
+
+# class for cached equation
+# widths - start width of every top-level term and width of equation
+class CacheEntry:
+    def __init__(self, tree, placements, widths):
+        self.tree = tree
+        self.placements = placements
+        self.widths = widths
+
+
+# class for cache of parsed and generated equations
+# the least recently used equation is removed when the cache is full
+class EquationCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    # function returns key of equation
+    # font_path has to be absolute path or "" for default font
+    def make_key(latex_text, font_path, text_scale, layout_engine):
+        font_mtime = 0.0
+        if font_path != "" and os.path.exists(font_path):
+            font_mtime = os.path.getmtime(font_path)
+
+        return (latex_text, font_path, font_mtime, text_scale, layout_engine)
+
+    # function returns cached equation or None
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)  # the most recently used
+        self.hits += 1
+        return entry
+
+    # function adds equation into cache
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+
+        # remove the least recently used equations
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    # function removes all cached equations
+    def invalidate(self):
+        self.entries.clear()
+
+    # function returns text with statistics of cache
+    def stats(self):
+        return "Cache: %d hits, %d misses, %d/%d equations" % (self.hits, self.misses, len(self.entries), self.max_size)
+
+
+# cache shared by all generations
+equation_cache = EquationCache(CACHE_SIZE)
@@ -0,0 +1,329 @@
+# ---------------------------------------------------------------------------
+# File name   : cli.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# generating equations from command line without UI
+#   blender -b --factory-startup -P cli.py -- --input equations.txt --output-dir out --format glb
+#   blender -b --python-expr "import sys, mathematical_equations.cli as c; sys.exit(c.main())" -- ...
+# equations are read from file or standard input (--input -) in the format of batch files
+# every equation is saved into its own .blend, .glb or .obj file
+# or all equations are saved into one .blend file (--output)
+# equations can be generated in more background Blender processes at once (--jobs)
+# report is a JSON file with time, number of objects and error of every equation
+# profile (--profile) is a JSON file with time of generator calls and counters of one process
+# exit codes: 0 - all equations are generated, 1 - some equations failed,
+#             2 - wrong arguments, input can't be read or output can't be saved
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+# addon modules are imported only as a package, not when this file is run as script
+if __package__:
+    import bpy
+
+    # generator of equations
+    from .analyser import SyntaxAnalyser
+
+    # reading of batch files and customization of equations
+    from .batch import BatchItem, read_batch, read_batch_lines
+    from .ui import finish_batch_equation, remove_equation
+
+    # generating in more processes
+    from .parallel import MESSAGE_PREFIX, run_workers
+
+    # instrumentation of generating
+    from .profiler import profiler
+
+PACKAGE_NAME = "mathematical_equations"
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+
+# function returns arguments after "--", the rest belongs to Blender
+def get_argv():
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+
+    return []
+
+
+# function returns parser of command line arguments
+def get_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Generate mathematical equations without UI.")
+    parser.add_argument("--input", default="-", help="batch file with one equation per line, - for stdin")
+    parser.add_argument("--output-dir", default=".", help="directory of generated files")
+    parser.add_argument("--format", choices=["blend", "glb", "obj"], default="blend", help="format of generated files")
+    parser.add_argument("--prefix", default="equation_", help="prefix of names of generated files")
+    parser.add_argument("--output", default="", help="one .blend file with all equations")
+    parser.add_argument("--report", default="", help="path to JSON report")
+    parser.add_argument("--profile", default="", help="path to JSON profile of generating (only with --jobs 1)")
+    parser.add_argument("--python-profile", action="store_true", help="add cProfile capture to the profile")
+    parser.add_argument("--jobs", type=int, default=1, help="number of Blender processes, 0 for all cores")
+    parser.add_argument("--font", default="", help="path to default font")
+    parser.add_argument("--scale", type=float, default=1.0, help="scale of equations without their own scale")
+    parser.add_argument("--thickness", type=float, default=0.0)
+    parser.add_argument("--layout", choices=["BOX", "SCENE"], default="BOX")
+    parser.add_argument("--glyphs", choices=["CURVE", "MESH", "MERGED"], default="CURVE")
+    parser.add_argument("--resolution", type=int, default=12)
+
+    # arguments of worker processes
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--shard", default="", help=argparse.SUPPRESS)
+    return parser
+
+
+# function reads equations from file or standard input
+# returns list of items and list of errors (line number, message) or None
+def read_input(path):
+    if path == "-":
+        return read_batch_lines(sys.stdin.read().splitlines())
+
+    return read_batch(path)
+
+
+# function saves objects of equation into file
+def export_equation(context, collection, path, file_format):
+    if file_format == "blend":
+        bpy.data.libraries.write(path, {collection}, fake_user=True)
+        return
+
+    # exporters save selected objects
+    for obj in context.selected_objects:
+        obj.select_set(False)
+    for obj in collection.all_objects:
+        obj.select_set(True)
+
+    if file_format == "glb":
+        bpy.ops.export_scene.gltf(filepath=path, export_format='GLB', use_selection=True)
+    else:
+        bpy.ops.wm.obj_export(filepath=path, export_selected_objects=True)
+
+
+# function removes objects and collections of the startup file (cube, camera, light),
+# so only equations are saved into the output file
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for collection in list(bpy.data.collections):
+        bpy.data.collections.remove(collection)
+
+
+# function generates one equation
+# returns its entry of report and its collection or None if nothing is generated
+def gen_item(context, item, args):
+    entry = {"line": item.line_num, "latex": item.latex_text, "ok": False, "error": "",
+             "time": 0.0, "objects": 0, "output": None}
+    start = time.perf_counter()
+
+    scale = args.scale if item.scale is None else item.scale
+    location = (0.0, 0.0, 0.0) if item.location is None else item.location
+    syntax = SyntaxAnalyser(item.latex_text, context, scale, args.font, args.layout,
+                            args.glyphs, args.thickness, args.resolution)
+
+    if not syntax.sa_prog():
+        entry["error"] = syntax.error or "equation was not fully generated"
+
+    # nothing is generated for equation with syntax error
+    collection = None
+    if syntax.tree is not None:
+        collection = bpy.data.collections[syntax.base_collection]
+        collection["batch_line"] = item.line_num
+        finish_batch_equation(collection.all_objects, args.thickness, location, (0.0, 0.0, 0.0))
+        collection["text_thickness"] = args.thickness
+        collection["text_location"] = location
+        collection["text_rotation"] = (0.0, 0.0, 0.0)
+        entry["objects"] = len(collection.all_objects)
+
+    entry["ok"] = entry["error"] == ""
+    entry["time"] = time.perf_counter() - start
+    return entry, collection
+
+
+# function generates one equation and saves it into its own file
+# equation is kept in scene if all equations are saved into one file
+# returns its entry of report and its collection if it is kept
+def run_item(context, item, args):
+    start = time.perf_counter()
+    entry, collection = gen_item(context, item, args)
+
+    if collection is not None and args.output == "" and args.shard == "":
+        path = os.path.join(args.output_dir, "%s%04d.%s" % (args.prefix, item.line_num, args.format))
+        try:
+            export_equation(context, collection, path, args.format)
+            entry["output"] = path
+        except (OSError, RuntimeError) as error:
+            entry["error"] = "file can't be saved: " + str(error)
+            entry["ok"] = False
+
+        remove_equation(collection)
+        collection = None
+
+    entry["time"] = time.perf_counter() - start
+    return entry, collection
+
+
+# function runs worker, equations are read as JSON lines from standard input
+# generated equations are saved into their files or into library file of worker (--shard)
+def run_worker(context, args):
+    collections = set()
+    for line in sys.stdin:
+        task = json.loads(line)
+        location = None if task["location"] is None else tuple(task["location"])
+        item = BatchItem(task["line"], task["latex"], location, task["scale"])
+
+        entry, collection = run_item(context, item, args)
+        if collection is not None:
+            collections.add(collection)
+        print(MESSAGE_PREFIX + "DONE " + json.dumps(entry), flush=True)
+
+    if args.shard != "":
+        bpy.data.libraries.write(args.shard, collections, fake_user=True)
+        print(MESSAGE_PREFIX + "SHARD " + args.shard, flush=True)
+
+    return EXIT_OK
+
+
+# function returns function making command of worker process with given number
+def get_worker_command(args, shard_dir):
+    command = [bpy.app.binary_path, "-b", "--factory-startup", "--threads", "1",
+               "-P", os.path.abspath(__file__), "--", "--worker",
+               "--output-dir", args.output_dir, "--format", args.format, "--prefix", args.prefix,
+               "--font", args.font, "--scale", repr(args.scale), "--thickness", repr(args.thickness),
+               "--layout", args.layout, "--glyphs", args.glyphs, "--resolution", str(args.resolution)]
+
+    if args.output == "":
+        return lambda number: command
+
+    return lambda number: command + ["--shard", os.path.join(shard_dir, "shard_%d.blend" % number)]
+
+
+# function appends equations from library files of workers into scene
+def merge_shards(context, shards):
+    collections = []
+    for shard in shards:
+        with bpy.data.libraries.load(shard, link=False) as (data_from, data_to):
+            data_to.collections = list(data_from.collections)
+        collections.extend(collection for collection in data_to.collections if collection is not None)
+
+    # equations are in the order of batch file
+    collections.sort(key=lambda collection: collection.get("batch_line", 0))
+    for collection in collections:
+        collection.use_fake_user = False
+        context.scene.collection.children.link(collection)
+
+
+# function writes JSON report into file
+# report is not written to standard output, because Blender and generator print there
+def write_report(path, report):
+    with open(path, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, indent=1)
+
+
+# function generates all equations, returns exit code
+def main(argv=None):
+    try:
+        args = get_parser().parse_args(get_argv() if argv is None else argv)
+    except SystemExit as error:
+        return EXIT_OK if error.code == 0 else EXIT_USAGE
+
+    if args.worker:
+        return run_worker(bpy.context, args)
+
+    batch = read_input(args.input)
+    if batch is None:
+        return EXIT_USAGE
+    items, errors = batch
+
+    try:
+        os.makedirs(args.output_dir, exist_ok=True)
+    except OSError as error:
+        print("Error, output directory can't be created: " + str(error))
+        return EXIT_USAGE
+
+    # lines with wrong format are failed equations
+    entries = []
+    for line_num, message in errors:
+        entries.append({"line": line_num, "latex": "", "ok": False, "error": message,
+                        "time": 0.0, "objects": 0, "output": None})
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    start = time.perf_counter()
+
+    # all equations are saved with the scene
+    if args.output != "":
+        clear_scene()
+
+    if jobs > 1 and len(items) > 1:
+        # equations are generated by workers, shards are removed after merging
+        shard_dir = tempfile.mkdtemp(prefix="mathematical_equations_")
+        try:
+            worker_entries, shards = run_workers(get_worker_command(args, shard_dir), items, jobs, args.output != "")
+            entries.extend(worker_entries)
+            if args.output != "":
+                merge_shards(bpy.context, shards)
+        finally:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+    else:
+        if args.profile != "":
+            profiler.start(args.python_profile)
+
+        for i, item in enumerate(items):
+            entry, collection = run_item(bpy.context, item, args)
+            entries.append(entry)
+            print("Equation %d/%d (%.3f s)" % (i + 1, len(items), entry["time"]), file=sys.stderr)
+
+        profiler.stop()
+
+    entries.sort(key=lambda entry: entry["line"])
+    for entry in entries:
+        if not entry["ok"]:
+            print("Error, line %d: %s" % (entry["line"], entry["error"]))
+
+    # all equations are in scene
+    if args.output != "":
+        try:
+            bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(args.output), copy=True)
+        except RuntimeError as error:
+            print("Error, output file can't be saved: " + str(error))
+            return EXIT_USAGE
+
+    failed = sum(1 for entry in entries if not entry["ok"])
+    report = {"equations": entries, "total": len(entries), "failed": failed, "jobs": jobs,
+              "time": time.perf_counter() - start}
+
+    if args.report != "":
+        try:
+            write_report(args.report, report)
+        except OSError as error:
+            print("Error, report can't be saved: " + str(error))
+            return EXIT_USAGE
+
+    if profiler.has_results and args.profile != "":
+        try:
+            profiler.save(args.profile)
+        except OSError as error:
+            print("Error, profile can't be saved: " + str(error))
+            return EXIT_USAGE
+
+    print("%d equations generated, %d failed" % (len(entries) - failed, failed), file=sys.stderr)
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+# script run by blender -P imports the addon as a package, so relative imports work
+if __name__ == "__main__" and not __package__:
+    if PACKAGE_NAME not in sys.modules:
+        package = types.ModuleType(PACKAGE_NAME)
+        package.__path__ = [os.path.dirname(os.path.abspath(__file__))]
+        sys.modules[PACKAGE_NAME] = package
+
+    sys.exit(importlib.import_module(PACKAGE_NAME + ".cli").main())
@@ -1,749 +1,985 @@
-# ---------------------------------------------------------------------------
-# File name   : generator.py
-# Created By  : Katarina Strenkova
-# ---------------------------------------------------------------------------
-
-import bpy
-import math
-from bpy_extras.object_utils import object_data_add  # add sqrt symbol
-
-from bpy.props import (StringProperty,
-                       BoolProperty,
-                       IntProperty,
-                       FloatProperty,
-                       FloatVectorProperty,
-                       EnumProperty,
-                       PointerProperty,
-                       )
-                       
-from mathutils import Vector  # vertices
-
-# unicode characters database
-from .unicode_db import unicode_chars                             
-
-
-# function generates text in given font
-# special case for sum and integral symbol when the scaling is 3.5 bigger
-def gen_text(context, text, font):
-    # generate basic text
-    bpy.ops.object.text_add(enter_editmode=True, align='WORLD', location=(0, 0, 0), scale=(1, 1, 1))
-    bpy.ops.font.delete(type='PREVIOUS_WORD')
-    bpy.ops.font.text_insert(text=text)
-    bpy.ops.object.editmode_toggle()
-    
-    # generated text
-    active_obj = context.active_object
-    
-    # set text font if one is chosen
-    if not font == "":
-        active_obj.data.font = font
-        active_obj.data.size = 1.0
-    
-    # sum, prod and integral symbols
-    if text == '\u2211' or text == '\u222b' or text == '\u220f':
-        # scale and move symbol
-        active_obj.scale.x = 3.5
-        active_obj.scale.y = 3.5
-        # apply scale
-        bpy.ops.object.transform_apply(scale=True, location=False, rotation=False)
-    
-    # apply changes
-    bpy.ops.object.select_all(action='DESELECT') # deselect all objects
-    bpy.data.objects[active_obj.name].select_set(True)
-    
-
-# function positions text according to given parameters
-def gen_position(param, move):
-    
-    obj = bpy.context.active_object  # save active object
-    
-    # scale object
-    obj.scale.x = param.scale
-    obj.scale.y = param.scale
-    
-    obj.location.x = param.width  # move by width (x)
-    obj.location.y = param.height  # move by height (y)
-    obj.location.z = 0.0
-    
-    # add text width
-    if move:
-        # get corners of bounding box
-        bbox = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-        obj_dimension = bbox[4].x * param.scale
-        param.width += obj_dimension + (0.1 * param.scale)  # space
-
-
-# function gets object into collection
-def gen_collection(context, collection, base_collection):
-    # active object
-    active_obj = bpy.context.active_object
-    
-    for obj in bpy.data.collections[collection].objects:
-        # object is already in collection
-        if obj.name == active_obj.name:
-            return
-        
-    bpy.data.collections[collection].objects.link(active_obj)
-    bpy.data.collections[base_collection].objects.unlink(active_obj)
-    
-
-# function creates new collection    
-def gen_new_collection(context, coll_name, parent_collection):
-    # add new collection
-    collection = bpy.data.collections.new(coll_name)
-    bpy.data.collections[parent_collection].children.link(collection)
-    return collection.name      
-
-
-# function joins collections into parent collection and removes child collection
-def gen_join_collections(context, collection, parent_collection):
-    # join all objects into one parent collection
-    for obj in bpy.data.collections[collection.name].all_objects:
-        bpy.data.collections[parent_collection].objects.link(obj)
-        bpy.data.collections[collection.name].objects.unlink(obj)
-        
-    # remove child collection
-    bpy.data.collections.remove(collection)    
-    
-
-# function generates given mathematic symbol
-def gen_math_sym(context, command_name, font):
-
-    # find unicode representation of character
-    for char in unicode_chars:
-        if char[0] == command_name:
-            text = char[1]
-            # generate mathematical symbol    
-            gen_text(context, text, font)
-
-            return True
-        
-    # command is not in unicode database
-    print("Error, command '" + command_name + "' is not in unicode database!")
-    print("It's a possible misspelling or this command is not implemented in this version of addon.")
-    return False
-
-
-# function generates square root symbol
-def gen_sqrt_sym(context):
-
-    # symbol vertices
-    verts = [
-        Vector((-0.5266461968421936, -0.13621671915054321, 0.0)), 
-        Vector((-0.40451911091804504, -0.21025631248950958, 0.0)), 
-        Vector((-0.3643374443054199, -0.13621671915054321, 0.0)), 
-        Vector((-0.15997552871704102, -0.7838898515701294, 0.0)), 
-        Vector((-0.15997552871704102, -0.6396166300773621, 0.0)), 
-        Vector((0.36744120717048645, 0.35296740531921387, 0.0)), 
-        Vector((0.32928138971328735, 0.4122579336166382, 0.0)), 
-        Vector((0.4593656659126282, 0.35296740531921387, 0.0)), 
-        Vector((0.4593656659126282, 0.4122579336166382, 0.0))
-    ]
-
-    edges = []
-    faces = [[0, 1, 2], [1, 2, 4, 3], [4, 3, 5, 6], [5, 6, 8, 7]]
-
-    mesh = bpy.data.meshes.new(name="Sqrt")
-    mesh.from_pydata(verts, edges, faces)
-    object_data_add(context, mesh)
-    
-    # location of 3D cursor
-    cursor_3D = bpy.context.scene.cursor.location
-    
-    # set origin for sqrt
-    bpy.context.scene.cursor.location += Vector((-0.5266461968421936, -0.8238898515701294, 0.0))
-    bpy.ops.object.origin_set(type='ORIGIN_CURSOR')
-    
-    # set 3D cursor back
-    bpy.context.scene.cursor.location = cursor_3D 
-    
-    # add solidify modifier
-    bpy.ops.object.modifier_add(type='SOLIDIFY') 
-    
-    # recalculate normals in editmode
-    bpy.ops.object.editmode_toggle()
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    bpy.ops.object.editmode_toggle()
-
-
-# function moves sqrt symbol according to given parameters
-def gen_sqrt_move(context, param, sqrt_param, move):
-    
-    # position sqrt
-    param.height -= 0.25 * param.scale
-    gen_position(param, False)
-    param.height += 0.25 * param.scale
-    
-    # apply scale
-    bpy.ops.object.transform_apply(scale=True, location=False, rotation=False)
-    
-    # don't modify square root symbol
-    if not move:
-        return
-    
-    # data of created sqrt symbol
-    obj_data = context.active_object.data
-    
-    # finding most right vertices
-    max_x = obj_data.vertices[0].co.x
-    for i in obj_data.vertices:
-        max_x = max(i.co.x, max_x)                    
-    
-    # changing length of the upper line of sqrt
-    for i in obj_data.vertices:
-        new_location = i.co
-        if i.co.x == max_x:
-            new_location[0] = sqrt_param['x_pos'] - param.width  # x position     
-        i.co = new_location  
-        
-    # finding the heighest vertices
-    max_y = obj_data.vertices[0].co.y
-    for i in obj_data.vertices:
-        max_y = max(i.co.y, max_y)           
-        
-    line_size = 0.05929052829742433 * param.scale  # size of upper line
-    text_height =  param.height - (0.2 * param.scale)  # text height
-    move_by = sqrt_param['y_max'] - text_height + (0.2 * param.scale)  # y location and space 
-    
-    # leave function if height of sqrt is right
-    if (max_y - 0.06) > (sqrt_param['y_max'] - text_height + (0.2 * param.scale)):
-        return      
-        
-    # changing height of sqrt symbol
-    for i in obj_data.vertices:
-        new_location = i.co 
-        if i.co.y == max_y:
-            new_location[1] = move_by + line_size  # y position upper vertices
-        elif i.co.y >= (max_y - (0.06 * param.scale)):
-            new_location[1] = move_by  # y position lower vertices     
-        i.co = new_location  
-        
-    # finding the lowest vertices
-    min_y = obj_data.vertices[0].co.y
-    for i in obj_data.vertices:
-        min_y = min(i.co.y, min_y)
-        
-    line_size = 0.14427322149276733 * param.scale  #  space between lowest points
-    move_by = sqrt_param['y_min'] - text_height  
-    
-    # leave function if low point of sqrt is right
-    if min_y < (sqrt_param['y_min'] - text_height):
-        return 
-    
-    # changing lowest point of sqrt symbol
-    for i in obj_data.vertices:
-        new_location = i.co 
-        if i.co.y == min_y:
-            new_location[1] = move_by  # y position upper vertice
-        elif i.co.y <= (min_y + (0.15 * param.scale)):
-            new_location[1] = move_by + line_size # y position lower vertice   
-        i.co = new_location   
-
-
-# function generates line for fractions    
-def gen_frac_line(context, param, x_pos):  
-    
-    verts = [
-        Vector((0.0, -0.025 * param.scale, 0.0)), 
-        Vector((0.0, 0.025 * param.scale, 0.0)),
-        Vector((1.0, 0.025 * param.scale, 0.0)), 
-        Vector((1.0, -0.025 * param.scale, 0.0))
-    ]
-
-    edges = []
-    faces = [[0, 1, 2, 3]]
-
-    mesh = bpy.data.meshes.new(name="Line")
-    mesh.from_pydata(verts, edges, faces)
-    object_data_add(context, mesh)
-    
-    # location of 3D cursor
-    cursor_3D = bpy.context.scene.cursor.location
-    
-    # set origin for fraction line
-    bpy.context.scene.cursor.location += Vector((0.0, 0.0, 0.0))
-    bpy.ops.object.origin_set(type='ORIGIN_CURSOR')
-    
-    # set 3D cursor back
-    bpy.context.scene.cursor.location = cursor_3D
-    
-    # add solidify modifier
-    bpy.ops.object.modifier_add(type='SOLIDIFY')   
-    
-    # location of line
-    bpy.context.active_object.location.x = param.width
-    bpy.context.active_object.location.y = param.height + 0.3 * param.scale
-    bpy.context.active_object.location.z = 0.0
-    
-    # data of created fraction line
-    obj_data = bpy.context.object.data
-    
-    # moving fraction line
-    for i in obj_data.vertices:
-        new_location = i.co
-        if i.co.x == 1.0:
-            new_location[0] = x_pos - param.width + 0.1 * param.scale  # x position      
-        i.co = new_location   
-  
-
-# function calculates the scaling and height of text
-def gen_calculate(param, text_scale, levels):
-    
-    lvl_exp = 0  # exponent lvl
-    lvl_ix = 0  # index lvl
-
-    # starting height is line height and scale is user given scale
-    param.height = param.line
-    param.scale = text_scale
-    
-    # specific scaling in fraction
-    if levels.frac == 2:
-        param.scale = 0.65 * text_scale
-    elif levels.frac > 2:
-        param.scale = 0.45 * text_scale  
-
-    # iterating through array of exponents and indexes
-    for item in levels.ei_array:
-        
-        # deciding scaling
-        if (lvl_exp + lvl_ix) == 0:
-            # depending on fraction level
-            if levels.frac < 2:
-                param.scale = 0.65 * text_scale 
-            else:
-                param.scale = 0.45 * text_scale     
-        else:
-            param.scale = 0.45 * text_scale 
-
-        # adding number of exponent or index
-        if item == "exp":
-            lvl_exp += 1
-            if lvl_exp == 1:
-                param.height += (0.75 * param.scale)  # first lvl exponent
-            else:
-                param.height += (0.5 * param.scale)
-        else:
-            lvl_ix += 1
-            if lvl_ix == 1:
-                param.height -= (0.5 * param.scale)  # first lvl index
-            else:
-                param.height -= (0.25 * param.scale)             
-
-
-# function moves sum symbol according to given parameters
-def gen_move_sum(context, param, collection, sum):
-    
-    # save sum symbol
-    sum_symbol = bpy.data.objects[sum.name]
-    
-    # get corners of bounding box
-    bbox = [sum_symbol.matrix_world @ Vector(corner) for corner in sum_symbol.bound_box]
-        
-    # parameters of objects in collection
-    min_x = gen_min_x(context, collection)
-    min_y = gen_min_y(context, collection) 
-    max_y = gen_group_height(context, collection)  
-    
-    # iterate through objects
-    for obj in bpy.data.collections[collection].all_objects:
-        # add object to array
-        sum.array.append(obj.name)
-        # move object depending on index or exponent mode
-        obj.location.x += bbox[0].x - min_x
-        if "SumUpCollection" in collection:
-            obj.location.y += bbox[2].y - min_y + 0.25 * param.scale
-        else:
-            obj.location.y += bbox[0].y - max_y - 0.25 * param.scale
-    
-    # center text above sum symbol
-    exp_ix_width = gen_group_width(context, collection)        
-    gen_center_sum(context, sum, collection, exp_ix_width, bbox[4].x)  # sum width        
-            
-            
-# function centers exponent and index for sum symbol
-def gen_center_sum(context, sum, collection, exp_ix_width, sum_width):
-    
-    # find bigger width and calculate movement size
-    if exp_ix_width > sum_width:
-        diff = exp_ix_width - sum_width
-        move_by = (-1) * diff / 2.0 
-    else:
-        diff = sum_width - exp_ix_width  
-        move_by = diff / 2.0
-
-    # move all objects
-    for obj in bpy.data.collections[collection].all_objects:
-        obj.location.x += move_by   
-        
-
-# move sum symbol if index or exponent is longer then symbol
-def gen_fin_sum(context, sum, up_collection, down_collection):
-    # save sum symbol
-    sum_symbol = bpy.data.objects[sum.name]
-    
-    # get corners of bounding box
-    bbox = [sum_symbol.matrix_world @ Vector(corner) for corner in sum_symbol.bound_box]
-    
-    # find biggest width
-    up_width = gen_group_width(context, up_collection)
-    down_width = gen_group_width(context, down_collection)
-    fin_width = max(up_width, down_width, bbox[4].x)  # sum symbol width
-    diff = fin_width - bbox[4].x
-    
-    # index or exponent is longer than sum symbol
-    if diff > 0:
-        # select all objects
-        bpy.data.objects[sum.name].select_set(True)  # sum symbol
-        for item in sum.array:
-             bpy.data.objects[item].select_set(True)
-             
-        # move objects     
-        for obj in context.selected_objects: 
-            obj.location.x += diff    
-            
-        fin_width += diff
-    
-    return fin_width       
-                     
-
-# function moves objects in fraction numerator           
-def gen_frac_num(context, param, collection):
-    
-    # get lowest point in collection
-    min_y = gen_min_y(context, collection)
-    move_by = param.height - min_y + 0.6 * param.scale
-    
-    # select and move all objects in numerator
-    for obj in bpy.data.collections[collection].all_objects:
-        obj.select_set(True)  
-        obj.location.y += move_by                          
-
-
-# function moves objects in fraction denominator 
-def gen_frac_den(context, param, collection):
-    
-    # get highest point in collection
-    max_y = gen_group_height(context, collection)
-    move_by = param.height - max_y + 0.1 * param.scale
-    
-    # select and move all objects in denominator
-    for obj in bpy.data.collections[collection].all_objects:
-        obj.select_set(True) 
-        obj.location.y += move_by
-
-
-# function centers objects on x axis
-def gen_center(context, obj1, obj2, collection):
-    # find wider text
-    if obj1 > obj2:
-        diff = obj1 - obj2
-    else:
-        diff = obj2 - obj1
-    
-    move_by = diff / 2.0 # space between x positions div 2
-    
-    # move all objects
-    for obj in bpy.data.collections[collection].all_objects:
-        obj.location.x += move_by 
-    
-
-# function returns the furthest x position
-def gen_group_width(context, collection):
-    
-    bpy.ops.object.select_all(action='DESELECT') # deselect all objects
-    is_init = False  # set initialisation flag
-    
-    # select all objects in collection
-    for obj in bpy.data.collections[collection].all_objects:  
-        obj.select_set(True)
-        # get corners of bounding box
-        bbox = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-        if not is_init:
-            max_x = bbox[4].x
-            is_init = True
-        else:
-            max_x = max(max_x, bbox[4].x)  # finding max x position     
-         
-    # no objects selected
-    if not is_init:
-        return 0
-        
-    return max_x
-
-
-# function returns the closest x position
-def gen_min_x(context, collection):
-    
-    bpy.ops.object.select_all(action='DESELECT') # deselect all objects
-    is_init = False  # set initialisation flag
-    
-    # select all objects in collection
-    for obj in bpy.data.collections[collection].all_objects:  
-        obj.select_set(True)
-        # get corners of bounding box
-        bbox = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-        if not is_init:
-            min_x = bbox[0].x
-            is_init = True
-        else:
-            min_x = min(min_x, bbox[0].x)  # finding min x position     
-         
-    # no objects selected
-    if not is_init:
-        return 0
-        
-    return min_x 
-
-
-# function returns the highest y position      
-def gen_group_height(context, collection):
-    
-    bpy.ops.object.select_all(action='DESELECT') # deselect all objects
-    is_init = False  # set initialisation flag
-    
-    # select all objects in collection
-    for obj in bpy.data.collections[collection].all_objects:  
-        obj.select_set(True)
-        # get corners of bounding box
-        bbox = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-        if not is_init:
-            max_y = bbox[2].y
-            is_init = True
-        else:
-            max_y = max(max_y, bbox[2].y)  # finding max y position     
-         
-    # no objects selected
-    if not is_init:
-        return 0
-        
-    return max_y 
-  
-  
-# function returns the lowest y position
-def gen_min_y(context, collection):
-    
-    bpy.ops.object.select_all(action='DESELECT') # deselect all objects
-    is_init = False  # set initialisation flag
-    
-    # select all objects in collection
-    for obj in bpy.data.collections[collection].all_objects:  
-        obj.select_set(True)
-        # get corners of bounding box
-        bbox = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-        if not is_init:
-            min_y = bbox[0].y
-            is_init = True
-        else:
-            min_y = min(min_y, bbox[0].y)  # finding min y position     
-         
-    # no objects selected
-    if not is_init:
-        return 0
-        
-    return min_y
-            
-            
-# function positions matrix figure
-def gen_matrix_pos(context, obj_array, param):
-    
-    # return if matrix has no objects
-    if not len(obj_array):
-        return
-    
-    # get maximum number of cells in row
-    max_cell_x = 0
-    for row in obj_array:
-        max_cell_x = max(max_cell_x, len(row))
-    
-    gen_matrix_x(context, obj_array, param, max_cell_x)  # center by x axis 
-    gen_matrix_y(context, obj_array, param, max_cell_x)  # move by y axis     
-  
-  
-# function centers matrix horizontally
-def gen_matrix_x(context, obj_array, param, max_cell_x):
-     
-    i = 0  # collumn number
-    while i < max_cell_x:
-
-        max_width = 0
-        # iterate through rows
-        for row in obj_array:
-            # getting maximum width in collumn 'i'
-            if i >= len(row):
-                cell_width = 0
-            else:    
-                collection = row[i]
-                cell_width = gen_group_width(context, collection)
-                
-            max_width = max(max_width, cell_width)         
-        
-        # iterate through rows    
-        for row in obj_array: 
-            # deselect all objects
-            bpy.ops.object.select_all(action='DESELECT')
-            
-            # move objects in next collumn
-            if (i+1) < len(row):  
-                collection = row[i+1]  
-                
-                # select objects and find minimum x position
-                min_x = gen_min_x(context, collection)          
-                       
-            # set x position
-            for obj in context.selected_objects:
-                old_location = obj.location.x
-                obj.location.x = max_width + (old_location - min_x) + 0.5 * param.scale
-        
-        # iterate through rows
-        for row in obj_array:
-            # center objects in row
-            if len(row) > i:    
-                collection = row[i]
-                cell_width = gen_group_width(context, collection)
-                gen_center(context, cell_width, max_width, collection)
-                     
-        i += 1  # next collumn
-     
-  
-# function moves matrix vertically
-def gen_matrix_y(context, obj_array, param, max_cell_x): 
-    
-    is_init = False  # set initialisation flag
-     
-    # iterate through rows
-    for row in obj_array: 
-        # if the row is not empty
-        if len(row):
-            # getting maximum height in row    
-            i = 0  # collumn number
-            while i < max_cell_x:
-                # first collumn 
-                if i == 0:
-                    collection = row[i]
-                    cell_height = gen_group_height(context, collection) 
-                    max_height = cell_height
-                # less collumns than maximum    
-                elif i >= len(row):
-                    cell_height = max_height
-                else:    
-                    collection = row[i]
-                    cell_height = gen_group_height(context, collection)
-                    
-                max_height = max(max_height, cell_height)
-                i += 1  # next cell 
-            
-            # first iteration    
-            if not is_init:
-                min_height = max_height + 0.1 * param.scale
-                is_init = True        
-            
-            # move row if its highest point cuts into the upper row
-            if max_height > (min_height - 0.1 * param.scale):
-                i = 0  # collumn number
-                while i < max_cell_x: 
-                    # row is not empty
-                    if i < len(row):
-                        collection = row[i]
-                        move_by = max_height - min_height + 0.5 * param.scale  # space
-                        
-                        # move objects lower
-                        for obj in bpy.data.collections[collection].all_objects:
-                            obj.location.y -= move_by
-                        
-                    i += 1  # next cell
-            
-            # getting minimum height in row 
-            i = 0  # collumn number
-            while i < max_cell_x: 
-                # first collumn 
-                if i == 0:
-                    collection = row[i]
-                    cell_height = gen_min_y(context, collection) 
-                    min_height = cell_height
-                # less collumns than maximum 
-                elif i >= len(row):
-                    cell_height = min_height
-                else:    
-                    collection = row[i]
-                    cell_height = gen_min_y(context, collection)
-                    
-                min_height = min(min_height, cell_height)
-                i += 1  # next cell                
- 
- 
-# function calculates position of matrix brackets 
-def gen_matrix_param(context, param, collection, xy_size):
-    
-    # left bracket
-    if len(xy_size) == 1:
-        # get matrix height
-        min_y = gen_min_y(context, collection)
-        max_y = gen_group_height(context, collection)
-        xy_size.insert(0, max_y)
-        xy_size.insert(0, min_y)
-    # right bracket    
-    else: 
-        # get width of bracket
-        bracket_width = xy_size.pop()
-        # get x_min
-        x_min = xy_size.pop()
-        # get matrix width 
-        matrix_width = gen_group_width(context, collection) + bracket_width - x_min
-        xy_size.append(matrix_width)
-    
-    return xy_size
-     
-        
-# function generates matrix brackets
-def gen_brackets(context, param, collection, base_collection, xy_size, left):
-    
-    # xy_size -> y_min, y_max, x
-    
-    # move bracket to position
-    bpy.context.active_object.location.x = xy_size[2]  # x
-    bpy.context.active_object.location.y = xy_size[0]  # y_min
-    
-    # scale
-    matrix_height = xy_size[1] - xy_size[0]  # y_max - y_min
-    scale = (matrix_height + 0.5 * param.scale) / context.active_object.dimensions.y
-    context.active_object.scale.x = scale / 3.0
-    context.active_object.scale.y = scale
-    
-    # apply changes
-    obj_name = context.active_object.name
-    bpy.ops.object.select_all(action='DESELECT') # deselect all objects
-    bpy.data.objects[obj_name].select_set(True)
-    
-    # move bracket to align to text
-    context.active_object.location.y += context.active_object.dimensions.y / 12.0
-    
-    # the width of bracket
-    bracket_width = context.active_object.location.x + context.active_object.dimensions.x
-    
-    # left bracket
-    if left:
-        # move objects
-        for obj in bpy.data.collections[collection].all_objects:
-            obj.location.x += bracket_width - xy_size[2] + 0.25 * param.scale
-            
-        # save bracket_width
-        xy_size.append(bracket_width)    
-    
-    # add bracket to collection
-    bpy.data.objects[obj_name].select_set(True)  
-    gen_collection(context, collection, base_collection)
-    
-    
-# function centers matrix
-def gen_matrix_center(param, collection, xy_size, bracket):
-    
-    # calculate center location
-    matrix_height = xy_size[1] - xy_size[0]  # y_max - y_min
-    center_loc = xy_size[1] - matrix_height / 2.0 - 0.3 * param.scale
-     
-    # center matrix into row
-    for obj in bpy.data.collections[collection].all_objects:
-        obj.location.y -= center_loc            
-            
-    
-          
+# ---------------------------------------------------------------------------
+# File name   : generator.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+import bpy
+import math
+import os.path
+from array import array  # whole arrays of merged mesh
+
+from bpy.props import (StringProperty,
+                       BoolProperty,
+                       IntProperty,
+                       FloatProperty,
+                       FloatVectorProperty,
+                       EnumProperty,
+                       PointerProperty,
+                       )
+                       
+from mathutils import Vector  # vertices
+
+# unicode characters database
+from .unicode_db import get_symbol
+
+# faces of square root symbol
+from .tables import sqrt_faces
+
+# placements of generated objects
+from .placements import GlyphPlacement, MeshPlacement, placement_shape
+
+# geometry of meshes
+from .geometry import sqrt_geometry, frac_line_geometry, extrude_mesh
+
+# instrumentation of generating
+from .profiler import profiled, profiler
+
+
+# metrics of fonts for ink boxes of text objects, key of font -> metrics
+# bounding box of new text object is known only after scene update
+text_metrics = {}
+
+# ink boxes of text objects in local space (x_min, x_max, y_min, y_max), name of object -> box
+text_boxes = {}
+
+
+# function returns key of font in text_metrics
+def gen_font_key(font):
+    return "" if font == "" else font.name
+
+
+# function sets metrics of font for ink boxes of its text objects
+def gen_set_text_metrics(font, metrics):
+    text_metrics[gen_font_key(font)] = metrics
+
+
+# function forgets ink boxes of text objects of the previous equation
+def gen_forget_text_boxes():
+    text_boxes.clear()
+
+
+# function returns ink box of object in local space (x_min, x_max, y_min, y_max)
+def gen_local_box(obj):
+    box = text_boxes.get(obj.name)
+    if box is not None:
+        return box
+    
+    bbox = obj.bound_box
+    return (bbox[0][0], bbox[4][0], bbox[0][1], bbox[2][1])
+
+
+@profiled
+# function generates text in given font
+# special case for sum and integral symbol when the scaling is 3.5 bigger
+# text is created through data API and linked into the active collection
+# ink box of text is taken from metrics of font, so the scene isn't updated for every glyph
+def gen_text(context, text, font):
+    curve = bpy.data.curves.new(name="Text", type='FONT')
+    curve.body = text
+    
+    # set text font if one is chosen
+    if not font == "":
+        curve.font = font
+    
+    # sum, prod and integral symbols
+    if text == '\u2211' or text == '\u222b' or text == '\u220f':
+        curve.size = 3.5
+    
+    # generated text
+    active_obj = bpy.data.objects.new("Text", curve)
+    profiler.count("objects")
+    context.view_layer.active_layer_collection.collection.objects.link(active_obj)
+    
+    # apply changes
+    for obj in context.selected_objects:
+        obj.select_set(False)  # deselect all objects
+    active_obj.select_set(True)
+    context.view_layer.objects.active = active_obj
+    
+    # ink box of new text is needed for its position
+    metrics = text_metrics.get(gen_font_key(font))
+    if metrics is not None:
+        x_min, x_max, y_min, y_max = metrics.text_box(text)
+        size = curve.size
+        text_boxes[active_obj.name] = (x_min * size, x_max * size, y_min * size, y_max * size)
+    else:
+        # font without metrics, bounding box is calculated by scene update
+        context.view_layer.update()
+        profiler.count("scene updates")
+    
+
+@profiled
+# function positions text according to given parameters
+def gen_position(param, move):
+    
+    obj = bpy.context.active_object  # save active object
+    
+    # scale object
+    obj.scale.x = param.scale
+    obj.scale.y = param.scale
+    
+    obj.location.x = param.width  # move by width (x)
+    obj.location.y = param.height  # move by height (y)
+    obj.location.z = 0.0
+    
+    gen_invalidate_objects([obj])
+    
+    # add text width
+    if move:
+        profiler.count("bound queries")
+        obj_dimension = gen_local_box(obj)[1] * param.scale
+        param.width += obj_dimension + (0.1 * param.scale)  # space
+
+
+# class for group of objects of one construct (square root, fraction, matrix cell...)
+# groups are kept only in memory, objects stay in the collection of equation
+# children - groups of constructs inside this construct, until they are joined
+# parent - group this group is in, its bounds change with bounds of this group
+class Group:
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.objects = []
+        self.children = []
+        self.parent = parent
+        profiler.count("groups")
+        
+        if parent is not None:
+            parent.children.append(self)
+    
+    # function returns objects of group and all its children
+    def all_objects(self):
+        objects = list(self.objects)
+        for child in self.children:
+            objects.extend(child.all_objects())
+        
+        return objects
+
+
+# function gets active object into group
+def gen_add_to_group(context, group):
+    # active object
+    active_obj = bpy.context.active_object
+    
+    # object is already in group
+    if group.objects and group.objects[-1] == active_obj:
+        return
+        
+    group.objects.append(active_obj)
+    object_groups.setdefault(active_obj, set()).add(group)
+    gen_invalidate_group(group)
+    
+
+# function joins group into parent group
+# objects of parent group are the same, so its bounds don't change
+def gen_join_group(group, parent):
+    # join all objects into one parent group
+    objects = group.all_objects()
+    parent.objects.extend(objects)
+    parent.children.remove(group)
+    
+    for obj in objects:
+        groups = object_groups.setdefault(obj, set())
+        groups.discard(group)
+        groups.add(parent)
+    
+
+@profiled
+# function generates given mathematic symbol
+def gen_math_sym(context, command_name, font):
+
+    # find unicode representation of character
+    text = get_symbol(command_name)
+    if text is not None:
+        # generate mathematical symbol    
+        gen_text(context, text, font)
+
+        return True
+        
+    # command is not in unicode database
+    print("Error, command '" + command_name + "' is not in unicode database!")
+    print("It's a possible misspelling or this command is not implemented in this version of addon.")
+    return False
+
+
+@profiled
+# function generates mesh object with solidify modifier in the active collection
+# vertices are in local space, new object is the active and the only selected object
+def gen_mesh_object(context, name, coords, faces, location=(0.0, 0.0, 0.0)):
+    mesh = bpy.data.meshes.new(name=name)
+    mesh.from_pydata(coords, [], faces)
+    
+    obj = bpy.data.objects.new(name, mesh)
+    profiler.count("objects")
+    obj.modifiers.new(name="Solidify", type='SOLIDIFY')
+    obj.location = location
+    context.view_layer.active_layer_collection.collection.objects.link(obj)
+    
+    for selected in context.selected_objects:
+        selected.select_set(False)  # deselect all objects
+    obj.select_set(True)
+    context.view_layer.objects.active = obj
+    
+    # bounding box of new mesh is needed for bounds of collection
+    context.view_layer.update()
+    profiler.count("scene updates")
+    
+    return obj
+
+
+@profiled
+# function generates square root symbol covering text under it
+# vertices are stretched before the mesh is created, so no operators are needed
+def gen_sqrt_sym(context, param, sqrt_param, move):
+    
+    # the same geometry as in box layout, sizes of text are relative to sqrt
+    if move:
+        coords = sqrt_geometry(param.scale, sqrt_param['x_pos'] - param.width,
+                               param.height - sqrt_param['y_min'], sqrt_param['y_max'] - param.height)
+    else:
+        coords = sqrt_geometry(param.scale)
+    
+    # position sqrt
+    location = (param.width, param.height - 0.25 * param.scale, 0.0)
+    gen_mesh_object(context, "Sqrt", coords, sqrt_faces, location)
+
+
+@profiled
+# function generates line for fractions    
+def gen_frac_line(context, param, x_pos):  
+    
+    line_x = x_pos - param.width + 0.1 * param.scale  # length of line
+    coords, faces = frac_line_geometry(param.scale, line_x)
+    
+    # location of line
+    location = (param.width, param.height + 0.3 * param.scale, 0.0)
+    gen_mesh_object(context, "Line", coords, faces, location)
+  
+
+# function calculates the scaling and height of text
+def gen_calculate(param, text_scale, levels):
+    
+    lvl_exp = 0  # exponent lvl
+    lvl_ix = 0  # index lvl
+
+    # starting height is line height and scale is user given scale
+    param.height = param.line
+    param.scale = text_scale
+    
+    # specific scaling in fraction
+    if levels.frac == 2:
+        param.scale = 0.65 * text_scale
+    elif levels.frac > 2:
+        param.scale = 0.45 * text_scale  
+
+    # iterating through array of exponents and indexes
+    for item in levels.ei_array:
+        
+        # deciding scaling
+        if (lvl_exp + lvl_ix) == 0:
+            # depending on fraction level
+            if levels.frac < 2:
+                param.scale = 0.65 * text_scale 
+            else:
+                param.scale = 0.45 * text_scale     
+        else:
+            param.scale = 0.45 * text_scale 
+
+        # adding number of exponent or index
+        if item == "exp":
+            lvl_exp += 1
+            if lvl_exp == 1:
+                param.height += (0.75 * param.scale)  # first lvl exponent
+            else:
+                param.height += (0.5 * param.scale)
+        else:
+            lvl_ix += 1
+            if lvl_ix == 1:
+                param.height -= (0.5 * param.scale)  # first lvl index
+            else:
+                param.height -= (0.25 * param.scale)             
+
+
+@profiled
+# function moves sum symbol according to given parameters
+def gen_move_sum(context, param, group, sum):
+    
+    # bounds of sum symbol
+    sum_x_min, sum_x_max, sum_y_min, sum_y_max = gen_object_bounds(bpy.data.objects[sum.name])
+        
+    # parameters of objects in group
+    min_x, max_x, min_y, max_y = gen_bounds(context, group)
+    objects = group.all_objects()
+    
+    # add objects to array
+    for obj in objects:
+        sum.array.append(obj.name)
+    
+    # move objects depending on index or exponent mode
+    if group.name == "SumUpGroup":
+        gen_move_objects(objects, sum_x_min - min_x, sum_y_max - min_y + 0.25 * param.scale)
+    else:
+        gen_move_objects(objects, sum_x_min - min_x, sum_y_min - max_y - 0.25 * param.scale)
+    
+    # center text above sum symbol
+    exp_ix_width = gen_group_width(context, group)        
+    gen_center_sum(context, sum, group, exp_ix_width, sum_x_max)  # sum width        
+            
+            
+@profiled
+# function centers exponent and index for sum symbol
+def gen_center_sum(context, sum, group, exp_ix_width, sum_width):
+    
+    # find bigger width and calculate movement size
+    if exp_ix_width > sum_width:
+        diff = exp_ix_width - sum_width
+        move_by = (-1) * diff / 2.0 
+    else:
+        diff = sum_width - exp_ix_width  
+        move_by = diff / 2.0
+
+    # move all objects
+    gen_move_objects(group.all_objects(), move_by, 0.0)
+        
+
+@profiled
+# move sum symbol if index or exponent is longer then symbol
+def gen_fin_sum(context, sum, up_group, down_group):
+    # width of sum symbol
+    sum_width = gen_object_bounds(bpy.data.objects[sum.name])[1]
+    
+    # find biggest width
+    up_width = gen_group_width(context, up_group)
+    down_width = gen_group_width(context, down_group)
+    fin_width = max(up_width, down_width, sum_width)
+    diff = fin_width - sum_width
+    
+    # index or exponent is longer than sum symbol
+    if diff > 0:
+        # sum symbol and its limits
+        objects = [bpy.data.objects[sum.name]]
+        for item in sum.array:
+            objects.append(bpy.data.objects[item])
+             
+        # move objects     
+        gen_move_objects(objects, diff, 0.0)
+            
+        fin_width += diff
+    
+    return fin_width       
+                     
+
+@profiled
+# function moves objects in fraction numerator           
+def gen_frac_num(context, param, group):
+    
+    # get lowest point in group
+    min_y = gen_min_y(context, group)
+    move_by = param.height - min_y + 0.6 * param.scale
+    
+    # select and move all objects in numerator
+    objects = group.all_objects()
+    for obj in objects:
+        obj.select_set(True)  
+    gen_move_objects(objects, 0.0, move_by)
+
+
+@profiled
+# function moves objects in fraction denominator 
+def gen_frac_den(context, param, group):
+    
+    # get highest point in group
+    max_y = gen_group_height(context, group)
+    move_by = param.height - max_y + 0.1 * param.scale
+    
+    # select and move all objects in denominator
+    objects = group.all_objects()
+    for obj in objects:
+        obj.select_set(True) 
+    gen_move_objects(objects, 0.0, move_by)
+
+
+@profiled
+# function centers objects on x axis
+def gen_center(context, obj1, obj2, group):
+    # find wider text
+    if obj1 > obj2:
+        diff = obj1 - obj2
+    else:
+        diff = obj2 - obj1
+    
+    move_by = diff / 2.0 # space between x positions div 2
+    
+    # move all objects
+    gen_move_objects(group.all_objects(), move_by, 0.0)
+    
+
+# bounds of groups (min_x, max_x, min_y, max_y), key is group
+# bounds are valid until an object of group or of its children is added or moved
+group_bounds = {}
+
+# groups of every object added to group, key is object
+object_groups = {}
+
+
+# function forgets bounds of all groups, objects could be changed outside of generator
+def gen_invalidate_bounds():
+    group_bounds.clear()
+    object_groups.clear()
+
+
+# function forgets bounds of group and of all groups it is in
+def gen_invalidate_group(group):
+    while group is not None:
+        group_bounds.pop(group, None)
+        group = group.parent
+
+
+# function forgets bounds of groups with given objects
+# objects in no group don't change bounds of any group
+def gen_invalidate_objects(objects):
+    groups = set()
+    for obj in objects:
+        groups.update(object_groups.get(obj, ()))
+    
+    for group in groups:
+        gen_invalidate_group(group)
+
+
+# function returns bounds of object (min_x, max_x, min_y, max_y)
+# objects are not rotated or parented, so location and scale are used
+# and the bounds are right even before matrix_world is updated
+def gen_object_bounds(obj):
+    profiler.count("bound queries")
+    x_min, x_max, y_min, y_max = gen_local_box(obj)
+    x, y = obj.location.x, obj.location.y
+    scale_x, scale_y = obj.scale.x, obj.scale.y
+    
+    return (x + x_min * scale_x, x + x_max * scale_x, y + y_min * scale_y, y + y_max * scale_y)
+
+
+@profiled
+# function returns bounds of all objects in group (min_x, max_x, min_y, max_y)
+# bounds are found in one pass without changing selection
+def gen_bounds(context, group):
+    bounds = group_bounds.get(group)
+    if bounds is not None:
+        return bounds
+    
+    bounds = None
+    for obj in group.all_objects():
+        obj_bounds = gen_object_bounds(obj)
+        if bounds is None:
+            bounds = list(obj_bounds)
+        else:
+            bounds[0] = min(bounds[0], obj_bounds[0])
+            bounds[1] = max(bounds[1], obj_bounds[1])
+            bounds[2] = min(bounds[2], obj_bounds[2])
+            bounds[3] = max(bounds[3], obj_bounds[3])
+    
+    # no objects in group
+    if bounds is None:
+        bounds = (0, 0, 0, 0)
+    
+    bounds = tuple(bounds)
+    group_bounds[group] = bounds
+    return bounds
+
+
+@profiled
+# function moves objects and forgets bounds of their groups
+def gen_move_objects(objects, move_x, move_y):
+    for obj in objects:
+        obj.location.x += move_x
+        obj.location.y += move_y
+    
+    gen_invalidate_objects(objects)
+
+
+# function returns the furthest x position
+def gen_group_width(context, group):
+    return gen_bounds(context, group)[1]
+
+
+# function returns the closest x position
+def gen_min_x(context, group):
+    return gen_bounds(context, group)[0]
+
+
+# function returns the highest y position      
+def gen_group_height(context, group):
+    return gen_bounds(context, group)[3]
+  
+  
+# function returns the lowest y position
+def gen_min_y(context, group):
+    return gen_bounds(context, group)[2]
+            
+            
+@profiled
+# function positions matrix figure
+# every cell is measured once, positions are calculated from the bounds of cells
+# and all cells are moved at the end
+def gen_matrix_pos(context, obj_array, param):
+    
+    # return if matrix has no objects
+    if not len(obj_array):
+        return
+    
+    # bounds of every cell (min_x, max_x, min_y, max_y)
+    bounds = [[gen_bounds(context, group) for group in row] for row in obj_array]
+    
+    # get maximum number of cells in row
+    max_cell_x = 0
+    for row in obj_array:
+        max_cell_x = max(max_cell_x, len(row))
+    
+    move_x = gen_matrix_x(bounds, param, max_cell_x)  # center by x axis 
+    move_y = gen_matrix_y(bounds, param)  # move by y axis     
+    
+    # move all cells
+    for row_num, row in enumerate(obj_array):
+        for i, group in enumerate(row):
+            for obj in group.all_objects():
+                obj.location.x += move_x[row_num][i]
+                obj.location.y += move_y[row_num]
+            gen_invalidate_group(group)
+  
+  
+# function returns movement of every cell to center matrix horizontally
+def gen_matrix_x(bounds, param, max_cell_x):
+    
+    move_x = [[0.0] * len(row) for row in bounds]
+    
+    for i in range(max_cell_x):
+        # getting maximum width in collumn 'i'
+        max_width = 0
+        for row_num, row in enumerate(bounds):
+            if i < len(row):
+                max_width = max(max_width, row[i][1] + move_x[row_num][i])
+        
+        for row_num, row in enumerate(bounds):
+            # move cell in next collumn behind the widest cell
+            if (i+1) < len(row):
+                move_x[row_num][i+1] = max_width - row[i+1][0] + 0.5 * param.scale
+            
+            # center cell in collumn
+            if i < len(row):
+                cell_width = row[i][1] + move_x[row_num][i]
+                move_x[row_num][i] += (max_width - cell_width) / 2.0
+    
+    return move_x
+     
+  
+# function returns movement of every row to move matrix vertically
+def gen_matrix_y(bounds, param): 
+    
+    move_y = [0.0] * len(bounds)
+    min_height = None
+     
+    # iterate through rows
+    for row_num, row in enumerate(bounds): 
+        # if the row is not empty
+        if len(row):
+            # getting maximum height in row    
+            max_height = max(cell[3] for cell in row)
+            
+            # move row if its highest point cuts into the upper row
+            if min_height is not None and max_height > (min_height - 0.1 * param.scale):
+                move_y[row_num] = -(max_height - min_height + 0.5 * param.scale)  # space
+            
+            # getting minimum height in row 
+            min_height = min(cell[2] for cell in row) + move_y[row_num]
+    
+    return move_y
+ 
+ 
+@profiled
+# function calculates position of matrix brackets 
+def gen_matrix_param(context, param, group, xy_size):
+    
+    # left bracket
+    if len(xy_size) == 1:
+        # get matrix height
+        min_x, max_x, min_y, max_y = gen_bounds(context, group)
+        xy_size.insert(0, max_y)
+        xy_size.insert(0, min_y)
+    # right bracket    
+    else: 
+        # get width of bracket
+        bracket_width = xy_size.pop()
+        # get x_min
+        x_min = xy_size.pop()
+        # get matrix width 
+        matrix_width = gen_group_width(context, group) + bracket_width - x_min
+        xy_size.append(matrix_width)
+    
+    return xy_size
+     
+        
+@profiled
+# function generates matrix brackets
+def gen_brackets(context, param, group, xy_size, left):
+    
+    # xy_size -> y_min, y_max, x
+    
+    # move bracket to position
+    bpy.context.active_object.location.x = xy_size[2]  # x
+    bpy.context.active_object.location.y = xy_size[0]  # y_min
+    
+    # scale
+    x_min, x_max, y_min, y_max = gen_local_box(context.active_object)
+    matrix_height = xy_size[1] - xy_size[0]  # y_max - y_min
+    scale = (matrix_height + 0.5 * param.scale) / (y_max - y_min)
+    context.active_object.scale.x = scale / 3.0
+    context.active_object.scale.y = scale
+    
+    # apply changes
+    obj_name = context.active_object.name
+    bpy.ops.object.select_all(action='DESELECT') # deselect all objects
+    profiler.count("operators")
+    bpy.data.objects[obj_name].select_set(True)
+    
+    # move bracket to align to text
+    context.active_object.location.y += (y_max - y_min) * scale / 12.0
+    gen_invalidate_objects([context.active_object])
+    
+    # the width of bracket
+    bracket_width = context.active_object.location.x + (x_max - x_min) * scale / 3.0
+    
+    # left bracket
+    if left:
+        # move objects
+        move_by = bracket_width - xy_size[2] + 0.25 * param.scale
+        gen_move_objects(group.all_objects(), move_by, 0.0)
+            
+        # save bracket_width
+        xy_size.append(bracket_width)    
+    
+    # add bracket to group
+    bpy.data.objects[obj_name].select_set(True)  
+    gen_add_to_group(context, group)
+    
+    
+@profiled
+# function centers matrix
+def gen_matrix_center(param, group, xy_size, bracket):
+    
+    # calculate center location
+    matrix_height = xy_size[1] - xy_size[0]  # y_max - y_min
+    center_loc = xy_size[1] - matrix_height / 2.0 - 0.3 * param.scale
+     
+    # center matrix into row
+    gen_move_objects(group.all_objects(), 0.0, -center_loc)
+
+
+@profiled
+# function saves placements of objects of equation
+def gen_save_placements(objects, font):
+    placements = []
+    
+    for obj in objects:
+        term = obj.get("eq_term", 0)  # top-level term of object
+        path = obj.get("eq_path", str(term))  # node of object
+        
+        # text objects
+        if obj.type == 'FONT':
+            font_ix = 1 if obj.data.font == font[1] else 0
+            placements.append(GlyphPlacement(obj.data.body, font_ix, obj.data.size,
+                                             obj.location.x, obj.location.y,
+                                             obj.scale.x, obj.scale.y, term, path))
+        # sqrt symbols and fraction lines
+        elif obj.type == 'MESH':
+            verts = [tuple(v.co) for v in obj.data.vertices]
+            faces = [tuple(f.vertices) for f in obj.data.polygons]
+            name = "Sqrt" if "Sqrt" in obj.name else "Line"
+            placements.append(MeshPlacement(name, verts, faces, obj.location.x, obj.location.y, term, path))
+            
+    return placements
+
+
+# loaded fonts, key is path to the font file and its mtime -> name of font
+loaded_fonts = {}
+
+
+@profiled
+# function returns font datablock of font file, every font file is loaded once
+# font is loaded again only if the font file has changed
+def gen_load_font(font_path):
+    font_file = bpy.path.abspath(font_path)
+    font_mtime = 0.0
+    if os.path.exists(font_file):
+        font_mtime = os.path.getmtime(font_file)
+    
+    # font can be removed or replaced by loading other blend file
+    key = (font_file, font_mtime)
+    name = loaded_fonts.get(key)
+    if name is not None:
+        font = bpy.data.fonts.get(name)
+        if font is not None and bpy.path.abspath(font.filepath) == font_file:
+            return font
+    
+    # font of the same file is reused unless the file has changed
+    changed = False
+    for path, mtime in loaded_fonts:
+        if path == font_file and mtime != font_mtime:
+            changed = True
+    
+    font = bpy.data.fonts.load(font_file, check_existing=not changed)
+    loaded_fonts[key] = font.name
+    return font
+
+
+# meshes of glyphs, key of glyph -> name of mesh
+glyph_meshes = {}
+
+
+# function forgets meshes of glyphs when other blend file is loaded
+def gen_forget_glyph_meshes():
+    glyph_meshes.clear()
+
+
+# function returns key of glyph mesh
+def gen_glyph_key(text, font, thickness, resolution):
+    font_path = "" if font == "" else font.filepath
+    return "%s|%s|%.6f|%d" % (text, font_path, thickness, resolution)
+
+
+@profiled
+# function returns mesh of glyph
+# every glyph is converted to mesh only once, meshes are saved in blend file
+def gen_glyph_mesh(context, text, font, thickness, resolution):
+    key = gen_glyph_key(text, font, thickness, resolution)
+    
+    # find meshes saved in blend file
+    if not glyph_meshes:
+        for mesh in bpy.data.meshes:
+            if "glyph_key" in mesh:
+                glyph_meshes[mesh["glyph_key"]] = mesh.name
+    
+    mesh = bpy.data.meshes.get(glyph_meshes.get(key, ""))
+    if mesh is not None and mesh.get("glyph_key") == key:
+        return mesh
+    
+    # temporary text object with thickness
+    curve = bpy.data.curves.new(name="Glyph", type='FONT')
+    curve.body = text
+    if not font == "":
+        curve.font = font
+    curve.extrude = thickness / 2.0
+    curve.resolution_u = resolution
+    
+    obj = bpy.data.objects.new("Glyph", curve)
+    profiler.count("objects")
+    context.scene.collection.objects.link(obj)
+    
+    # convert evaluated text to mesh
+    depsgraph = context.evaluated_depsgraph_get()
+    mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+    mesh.name = "Glyph"
+    mesh["glyph_key"] = key
+    mesh.use_fake_user = True  # keep mesh when no object uses it
+    
+    bpy.data.objects.remove(obj)
+    bpy.data.curves.remove(curve)
+    
+    glyph_meshes[key] = mesh.name
+    return mesh
+
+
+# function removes meshes of glyphs which are not used by any object
+def gen_clear_glyph_meshes():
+    for mesh in list(bpy.data.meshes):
+        if "glyph_key" in mesh and mesh.users <= 1:
+            bpy.data.meshes.remove(mesh)
+    
+    glyph_meshes.clear()
+
+
+@profiled
+# function generates objects from saved placements
+# glyph_type - "CURVE" creates text objects, "MESH" creates objects sharing meshes of glyphs,
+#              "MERGED" creates one mesh object for all placements
+def gen_from_placements(context, placements, font, collection, glyph_type="CURVE", thickness=0.0, resolution=12):
+    if glyph_type == 'MERGED':
+        gen_merged_mesh(context, placements, font, collection, thickness, resolution)
+        return
+    
+    objects = bpy.data.collections[collection].objects
+    
+    for item in placements:
+        # glyphs as meshes
+        if item.kind == "glyph" and glyph_type == 'MESH':
+            mesh = gen_glyph_mesh(context, item.text, font[item.font], thickness, resolution)
+            
+            obj = bpy.data.objects.new("Glyph", mesh)
+            profiler.count("objects")
+            obj.scale.x = item.scale_x * item.size
+            obj.scale.y = item.scale_y * item.size
+        
+        # text objects
+        elif item.kind == "glyph":
+            curve = bpy.data.curves.new(name="Text", type='FONT')
+            curve.body = item.text
+            if not font[item.font] == "":
+                curve.font = font[item.font]
+            curve.size = item.size
+            
+            obj = bpy.data.objects.new("Text", curve)
+            profiler.count("objects")
+            obj.scale.x = item.scale_x
+            obj.scale.y = item.scale_y
+        
+        # sqrt symbols and fraction lines
+        else:
+            mesh = bpy.data.meshes.new(name=item.name)
+            mesh.from_pydata(item.verts, [], item.faces)
+            
+            obj = bpy.data.objects.new(item.name, mesh)
+            profiler.count("objects")
+            obj.modifiers.new(name="Solidify", type='SOLIDIFY')
+        
+        obj.location = (item.x, item.y, 0.0)
+        gen_tag_object(obj, item)
+        objects.link(obj)
+        obj.select_set(True)
+
+
+# function saves top-level term, node path, position and shape of placement into object
+# objects of unchanged nodes are found by them when equation is updated
+def gen_tag_object(obj, item):
+    obj["eq_term"] = item.term
+    obj["eq_path"] = item.path
+    obj["eq_position"] = (item.x, item.y)
+    obj["eq_shape"] = placement_shape(item)
+
+
+# function removes objects and their curves and meshes without other users
+def gen_remove_objects(objects):
+    for obj in list(objects):
+        data = obj.data
+        bpy.data.objects.remove(obj)
+        if data is not None and data.users == 0:
+            if isinstance(data, bpy.types.Mesh):
+                bpy.data.meshes.remove(data)
+            else:
+                bpy.data.curves.remove(data)
+
+
+@profiled
+# function generates one mesh object from all placements
+# every face has attributes "token" (number of placement) and "eq_term" (top-level term)
+def gen_merged_mesh(context, placements, font, collection, thickness=0.0, resolution=12):
+    coords = array('f')  # x, y, z of all vertices
+    loop_verts = array('i')  # vertex of every loop
+    loop_starts = array('i')  # first loop of every face
+    loop_totals = array('i')  # number of loops of every face
+    tokens = []  # number of placement of every face
+    terms = []  # top-level term of every face
+    
+    for token, item in enumerate(placements):
+        first_vert = len(coords) // 3
+        
+        if item.kind == "glyph":
+            mesh = gen_glyph_mesh(context, item.text, font[item.font], thickness, resolution)
+            
+            # read arrays of glyph mesh at once
+            verts = array('f', bytes(len(mesh.vertices) * 3 * 4))
+            mesh.vertices.foreach_get("co", verts)
+            starts = array('i', bytes(len(mesh.polygons) * 4))
+            mesh.polygons.foreach_get("loop_start", starts)
+            totals = array('i', bytes(len(mesh.polygons) * 4))
+            mesh.polygons.foreach_get("loop_total", totals)
+            indices = array('i', bytes(len(mesh.loops) * 4))
+            mesh.loops.foreach_get("vertex_index", indices)
+            
+            # move and scale x and y of all vertices, z stays
+            scale_x = item.scale_x * item.size
+            scale_y = item.scale_y * item.size
+            verts[0::3] = array('f', [x * scale_x + item.x for x in verts[0::3]])
+            verts[1::3] = array('f', [y * scale_y + item.y for y in verts[1::3]])
+            
+            # loops of glyph are copied in their order, so faces only move by loops before them
+            first_loop = len(loop_verts)
+            coords += verts
+            loop_starts += array('i', [first_loop + start for start in starts])
+            loop_totals += totals
+            loop_verts += array('i', [first_vert + index for index in indices])
+        
+        # sqrt symbols and fraction lines
+        else:
+            verts, faces = extrude_mesh(item.verts, item.faces, thickness)
+            coords += array('f', [value for x, y, z in verts for value in (x + item.x, y + item.y, z)])
+            
+            totals = array('i', [len(face) for face in faces])
+            starts = array('i', [len(loop_verts)] * len(faces))
+            for i in range(1, len(faces)):
+                starts[i] = starts[i - 1] + totals[i - 1]
+            loop_starts += starts
+            loop_totals += totals
+            loop_verts += array('i', [first_vert + index for face in faces for index in face])
+        
+        face_count = len(loop_starts) - len(tokens)
+        tokens += [token] * face_count
+        terms += [item.term] * face_count
+    
+    # create mesh from arrays
+    mesh = bpy.data.meshes.new(name="Equation")
+    mesh.vertices.add(len(coords) // 3)
+    mesh.vertices.foreach_set("co", coords)
+    mesh.loops.add(len(loop_verts))
+    mesh.loops.foreach_set("vertex_index", loop_verts)
+    mesh.polygons.add(len(loop_starts))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    if not mesh.polygons.bl_rna.properties["loop_total"].is_readonly:
+        mesh.polygons.foreach_set("loop_total", loop_totals)
+    mesh.update(calc_edges=True)
+    
+    # attributes of parts of equation
+    mesh.attributes.new(name="token", type='INT', domain='FACE').data.foreach_set("value", tokens)
+    mesh.attributes.new(name="eq_term", type='INT', domain='FACE').data.foreach_set("value", terms)
+    
+    obj = bpy.data.objects.new("Equation", mesh)
+    profiler.count("objects")
+    bpy.data.collections[collection].objects.link(obj)
+    obj.select_set(True)
+
+
+# function measures ink box of text in given font (x_min, x_max, y_min, y_max)
+def gen_measure_text(context, text, font):
+    curve = bpy.data.curves.new(name="Measure", type='FONT')
+    curve.body = text
+    if not font == "":
+        curve.font = font
+    
+    # bounding box is calculated only for objects in scene
+    obj = bpy.data.objects.new("Measure", curve)
+    profiler.count("objects")
+    context.scene.collection.objects.link(obj)
+    context.view_layer.update()
+    profiler.count("scene updates")
+    
+    profiler.count("bound queries")
+    xs = [corner[0] for corner in obj.bound_box]
+    ys = [corner[1] for corner in obj.bound_box]
+    
+    bpy.data.objects.remove(obj)
+    bpy.data.curves.remove(curve)
+    return (min(xs), max(xs), min(ys), max(ys))
+
+
+@profiled
+# function measures metrics of glyph (advance, x_min, y_min, x_max, y_max)
+# metrics - metrics of font, dot is taken from them, so it is measured once per font
+def gen_measure_glyph(context, char, font, metrics=None):
+    x_min, x_max, y_min, y_max = gen_measure_text(context, char, font)
+    
+    # advance is the difference between glyph followed by dot and dot alone
+    if char == ".":
+        dot_max = x_max
+    elif metrics is not None:
+        dot_max = metrics.glyph(".")[3]
+    else:
+        dot_max = gen_measure_text(context, ".", font)[1]
+    advance = gen_measure_text(context, char + ".", font)[1] - dot_max
+    
+    return (advance, x_min, y_min, x_max, y_max)
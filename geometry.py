@@ -0,0 +1,101 @@
+# ---------------------------------------------------------------------------
+# File name   : geometry.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# geometry of meshes (sqrt symbols, fraction lines) without bpy
+
+# geometry of square root symbol
+from .tables import sqrt_verts, sqrt_origin
+
+
+# function stretches symbol along axis (0 - x, 1 - y), it can be used for any stretchy symbol
+# vertices at the edge (the highest for side "MAX", the lowest for "MIN") are moved to 'move_to'
+# other vertices closer than 'band' to the edge are moved to 'band_to'
+def stretch_verts(verts, axis, side, move_to, band=0.0, band_to=None):
+    if side == "MAX":
+        edge_value = max(vert[axis] for vert in verts)
+        near_value = edge_value - band
+    else:
+        edge_value = min(vert[axis] for vert in verts)
+        near_value = edge_value + band
+
+    for vert in verts:
+        value = vert[axis]
+        if value == edge_value:
+            vert[axis] = move_to
+        elif band_to is not None and (value >= near_value if side == "MAX" else value <= near_value):
+            vert[axis] = band_to
+
+
+# function returns vertices of sqrt symbol in local space
+# x_pos - end of upper line, depth and height - size of text under symbol
+# symbol is only scaled if there is no text under it (x_pos is None)
+# both layouts use it, the scene layout with sizes from bounds of objects
+def sqrt_geometry(scale, x_pos=None, depth=0.0, height=0.0):
+    verts = [[(vert[0] - sqrt_origin[0]) * scale, (vert[1] - sqrt_origin[1]) * scale, 0.0] for vert in sqrt_verts]
+    if x_pos is None:
+        return [tuple(vert) for vert in verts]
+
+    # changing length of the upper line of sqrt
+    stretch_verts(verts, 0, "MAX", x_pos)
+
+    # leave symbol if its height is right
+    max_y = max(vert[1] for vert in verts)
+    move_by = height + 0.4 * scale
+    if (max_y - 0.06) > move_by:
+        return [tuple(vert) for vert in verts]
+
+    # changing height of sqrt symbol, upper line keeps its size
+    stretch_verts(verts, 1, "MAX", move_by + 0.05929052829742433 * scale, 0.06 * scale, move_by)
+
+    # changing lowest point of sqrt symbol if it is not right
+    min_y = min(vert[1] for vert in verts)
+    move_by = 0.2 * scale - depth
+    if min_y >= move_by:
+        stretch_verts(verts, 1, "MIN", move_by, 0.15 * scale, move_by + 0.14427322149276733 * scale)
+
+    return [tuple(vert) for vert in verts]
+
+
+# function returns vertices and faces of fraction line of given length
+def frac_line_geometry(scale, length):
+    verts = [
+        (0.0, -0.025 * scale, 0.0),
+        (0.0, 0.025 * scale, 0.0),
+        (length, 0.025 * scale, 0.0),
+        (length, -0.025 * scale, 0.0)
+    ]
+
+    return verts, [[0, 1, 2, 3]]
+
+
+# function extrudes flat mesh to given thickness around z = 0 (like solidify modifier)
+# returns new vertices and faces, flat mesh is returned for zero thickness
+def extrude_mesh(verts, faces, thickness):
+    if thickness <= 0.0:
+        return list(verts), [list(face) for face in faces]
+
+    count = len(verts)
+    half = thickness / 2.0
+    new_verts = [(x, y, z + half) for x, y, z in verts] + [(x, y, z - half) for x, y, z in verts]
+
+    # front faces and back faces with reversed order
+    new_faces = [list(face) for face in faces]
+    new_faces += [[i + count for i in reversed(face)] for face in faces]
+
+    # edges used only by one face are on the border
+    edges = {}
+    for face in faces:
+        for i in range(len(face)):
+            edge = (face[i], face[(i + 1) % len(face)])
+            key = (min(edge), max(edge))
+            edges[key] = None if key in edges else edge
+
+    # side faces of border
+    for edge in edges.values():
+        if edge is not None:
+            a, b = edge
+            new_faces.append([a + count, b + count, b, a])
+
+    return new_verts, new_faces
@@ -0,0 +1,389 @@
+# ---------------------------------------------------------------------------
+# File name   : layout.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# box layout computes positions of all objects before any object exists
+# every term is a box with width, height (above baseline) and depth (below baseline)
+# boxes are placed into bigger boxes and the final box is flattened into placements
+# it doesn't use bpy, so equations can be laid out without Blender
+
+# placements of generated objects
+from .placements import GlyphPlacement, MeshPlacement
+
+# tables of spaces, matrices and symbols
+from .tables import space_sizes, matrix_brackets, big_symbols, sqrt_faces, sqrt_width
+
+# paths of nodes in tree
+from .nodes import join_path
+
+# geometry of sqrt symbol and fraction line
+from .geometry import sqrt_geometry, frac_line_geometry
+
+# unicode characters database
+from .unicode_db import get_symbol
+
+# instrumentation of generating
+from .profiler import profiled
+
+
+# class for box of layout
+# width - position of the next box, right - the furthest x position of ink
+# leaf - placement of object for boxes of glyphs and meshes
+# step - step of path of the node in parent box or None (see nodes.py)
+class Box:
+    def __init__(self, leaf=None, width=0.0, right=0.0, height=0.0, depth=0.0):
+        self.leaf = leaf
+        self.width = width
+        self.right = right
+        self.height = height
+        self.depth = depth
+        self.empty = leaf is None  # box has no ink
+        self.step = None
+        self.children = []  # (x, y, box)
+
+    # function places box into this box
+    def add(self, box, x, y):
+        self.children.append((x, y, box))
+        if box.empty:
+            return
+
+        if self.empty:
+            self.right = x + box.right
+            self.height = y + box.height
+            self.depth = box.depth - y
+            self.empty = False
+        else:
+            self.right = max(self.right, x + box.right)
+            self.height = max(self.height, y + box.height)
+            self.depth = max(self.depth, box.depth - y)
+
+
+# function returns copy of placement moved to position x, y
+def move_placement(leaf, x, y, term, path):
+    if leaf.kind == "glyph":
+        return GlyphPlacement(leaf.text, leaf.font, leaf.size, x, y, leaf.scale_x, leaf.scale_y, term, path)
+
+    return MeshPlacement(leaf.name, leaf.verts, leaf.faces, x, y, term, path)
+
+
+# function adds placements of all leaves in box
+# leaves belong to the nearest node above them
+def flatten(box, x, y, term, placements):
+    stack = [(box, x, y, str(term))]
+    while stack:
+        box, x, y, path = stack.pop()
+        if box.leaf is not None:
+            placements.append(move_placement(box.leaf, x, y, term, path))
+
+        for child_x, child_y, child in reversed(box.children):
+            child_path = path if child.step is None else join_path(path, child.step)
+            stack.append((child, x + child_x, y + child_y, child_path))
+
+
+# class for layout of equation
+# metrics - metrics of default font and unicode font
+# ei - tuple of exponents ("exp") and indexes ("ix") the term is in
+class BoxLayout:
+    def __init__(self, metrics, text_scale):
+        self.metrics = metrics
+        self.text_scale = text_scale
+
+    # function returns scale of text (same rules as gen_calculate)
+    def get_scale(self, frac, ei):
+        if len(ei) == 0:
+            if frac == 2:
+                return 0.65 * self.text_scale
+            elif frac > 2:
+                return 0.45 * self.text_scale
+            return self.text_scale
+
+        elif len(ei) == 1 and frac < 2:
+            return 0.65 * self.text_scale
+
+        return 0.45 * self.text_scale
+
+    # function returns height of the last exponent or index in ei
+    def get_shift(self, frac, ei):
+        scale = self.get_scale(frac, ei)
+        level = ei.count(ei[-1])
+
+        if ei[-1] == "exp":
+            return 0.75 * scale if level == 1 else 0.5 * scale
+
+        return -0.5 * scale if level == 1 else -0.25 * scale
+
+    # function returns box of text
+    def l_text(self, text, font, scale):
+        size = 3.5 if text in big_symbols else 1.0
+        x_min, x_max, y_min, y_max = self.metrics[font].text_box(text)
+
+        leaf = GlyphPlacement(text, font, size, 0.0, 0.0, scale, scale, 0, "")
+        box = Box(leaf, 0.0, x_max * size * scale, y_max * size * scale, -y_min * size * scale)
+        box.width = box.right + 0.1 * scale  # space
+        return box
+
+    # function returns box of list of terms
+    def l_terms(self, nodes, frac, ei):
+        box = Box()
+        for i, node in enumerate(nodes):
+            term = self.l_term(node, frac, ei)
+            term.step = i
+            box.add(term, box.width, 0.0)
+            box.width += term.width
+
+        return box
+
+    # function returns box of square root with mesh of symbol
+    def l_sqrt(self, node, frac, ei):
+        box = Box()
+        scale = self.get_scale(frac, ei)
+
+        # [ <MORE_TERM> ]
+        if node.index is not None:
+            index_ei = ei + ("exp",)
+            index = self.l_terms(node.index, frac, index_ei)
+            index.step = "index"
+            box.add(index, 0.1, self.get_shift(frac, index_ei))  # space before multipliers
+
+            sym_x = 0.1 + index.width - (sqrt_width - 0.4) * scale
+            body_x = 0.1 + index.width + 0.4 * scale
+        else:
+            sym_x = 0.0
+            body_x = sqrt_width * scale
+
+        # { <MORE_TERM> }
+        body = self.l_terms(node.body, frac, ei)
+        body.step = "body"
+        box.add(body, body_x, 0.0)
+
+        # vertices of symbol in local space
+        if body.empty:
+            verts = sqrt_geometry(scale)
+        else:
+            verts = sqrt_geometry(scale, body_x + body.right - sym_x, body.depth, body.height)
+
+        leaf = MeshPlacement("Sqrt", verts, sqrt_faces, 0.0, 0.0, 0, "")
+        symbol = Box(leaf, 0.0, max(vert[0] for vert in verts), max(vert[1] for vert in verts),
+                     -min(vert[1] for vert in verts))
+        box.add(symbol, sym_x, -0.25 * scale)
+
+        box.width = body_x + body.width
+        return box
+
+    # function returns box of fraction with mesh of fraction line
+    def l_frac(self, node, frac, ei):
+        box = Box()
+        start = 0.1 * self.get_scale(frac, ei)  # space before fraction
+        scale = self.get_scale(frac + 1, ei)
+
+        numerator = self.l_terms(node.numerator, frac + 1, ei)
+        denominator = self.l_terms(node.denominator, frac + 1, ei)
+        numerator.step = "numerator"
+        denominator.step = "denominator"
+        length = max(numerator.right, denominator.right)
+
+        # center numerator and denominator
+        box.add(numerator, start + (length - numerator.right) / 2.0, 0.6 * scale + numerator.depth)
+        box.add(denominator, start + (length - denominator.right) / 2.0, 0.1 * scale - denominator.height)
+
+        # fraction line
+        verts, faces = frac_line_geometry(scale, length + 0.1 * scale)
+        leaf = MeshPlacement("Line", verts, faces, 0.0, 0.0, 0, "")
+        box.add(Box(leaf, 0.0, length + 0.1 * scale, 0.025 * scale, 0.025 * scale), start, 0.3 * scale)
+
+        box.width = start + length + 0.2 * scale  # space
+        return box
+
+    # function returns box of sum or product with limits
+    def l_sum(self, node, frac, ei):
+        box = Box()
+        scale = self.get_scale(frac, ei)
+
+        symbol = self.l_text(get_symbol(node.name), 1, scale)
+        limits = {"UNDERSCORE": Box(), "CARET": Box()}
+
+        # index_exponent
+        script = node.script
+        step = "script"
+        while script is not None:
+            limit_ei = ei + ("ix" if script.mode == "UNDERSCORE" else "exp",)
+            limits[script.mode] = self.l_terms(script.body, frac, limit_ei)
+            limits[script.mode].step = step + ".body"
+            limit_scale = self.get_scale(frac, limit_ei)
+            script = script.second
+            step += ".second"
+
+        if node.script is None:
+            box.add(symbol, 0.0, -0.4 * scale)
+            box.width = symbol.width
+            return box
+
+        up = limits["CARET"]
+        down = limits["UNDERSCORE"]
+        width = max(up.right, down.right, symbol.right)
+
+        # center symbol and limits
+        box.add(symbol, (width - symbol.right) / 2.0, -0.4 * scale)
+        box.add(up, (width - up.right) / 2.0, symbol.height - 0.4 * scale + 0.25 * limit_scale + up.depth)
+        box.add(down, (width - down.right) / 2.0, -symbol.depth - 0.4 * scale - 0.25 * limit_scale - down.height)
+
+        box.width = width + 0.1 * scale  # space
+        return box
+
+    # function returns box of exponent or index
+    def l_script(self, node, frac, ei):
+        box = Box()
+        script_ei = ei + ("exp" if node.mode == "CARET" else "ix",)
+
+        body = self.l_terms(node.body, frac, script_ei)
+        body.step = "body"
+        box.add(body, 0.0, self.get_shift(frac, script_ei))
+
+        # exponent + index
+        if node.second is not None:
+            second = self.l_script(node.second, frac, ei)
+            second.step = "second"
+            box.add(second, 0.0, 0.0)
+            box.width = max(body.right, second.right) + 0.1 * self.get_scale(frac, script_ei)
+        else:
+            box.width = body.width
+
+        return box
+
+    # function returns box of matrix with brackets
+    def l_matrix(self, node, frac, ei):
+        scale = self.get_scale(frac, ei)
+        cells = [[self.l_terms(cell, frac, ei) for cell in row] for row in node.rows]
+        for row_num, row in enumerate(cells):
+            for cell_num, cell in enumerate(row):
+                cell.step = "rows.%d.%d" % (row_num, cell_num)
+
+        # width of every collumn
+        widths = []
+        for row in cells:
+            for i, cell in enumerate(row):
+                if i == len(widths):
+                    widths.append(cell.right)
+                else:
+                    widths[i] = max(widths[i], cell.right)
+
+        # x position of every collumn
+        columns = [0.0]
+        for width in widths:
+            columns.append(columns[-1] + width + 0.5 * scale)
+
+        # rows are moved lower if they cut into the upper row
+        body = Box()
+        bottom = None
+        for row_num, row in enumerate(cells):
+            line = -1.0 * self.text_scale * row_num
+            top = max(cell.height for cell in row) + line
+
+            if bottom is not None and top > (bottom - 0.1 * scale):
+                line -= top - bottom + 0.5 * scale
+
+            for i, cell in enumerate(row):
+                body.add(cell, columns[i] + (widths[i] - cell.right) / 2.0, line)
+            bottom = line - max(cell.depth for cell in row)
+
+        box = Box()
+        y_min = -body.depth
+        y_max = body.height
+        bracket_type = matrix_brackets.get(node.name, ('', ''))
+
+        if bracket_type[0] == '':
+            box.add(body, 0.0, 0.0)
+        else:
+            # scale brackets to height of matrix
+            x_min, x_max, b_min, b_max = self.metrics[1].text_box(bracket_type[0])
+            bracket_height = b_max - b_min
+            if bracket_height == 0.0:
+                bracket_height = 1.0
+            scale_y = (y_max - y_min + 0.5 * scale) / bracket_height
+            scale_x = scale_y / 3.0
+            bracket_width = (x_max - x_min) * scale_x
+            bracket_y = y_min + bracket_height * scale_y / 12.0
+
+            body_x = bracket_width + 0.25 * scale
+            box.add(body, body_x, 0.0)
+
+            for text, x in ((bracket_type[0], 0.0), (bracket_type[1], body_x + body.right + 0.25 * scale)):
+                leaf = GlyphPlacement(text, 1, 1.0, 0.0, 0.0, scale_x, scale_y, 0, "")
+                bracket = Box(leaf, 0.0, x_max * scale_x, b_max * scale_y, -b_min * scale_y)
+                box.add(bracket, x, bracket_y)
+
+        # center matrix into row
+        center = Box()
+        center.add(box, 0.0, 0.3 * scale - (y_max + y_min) / 2.0)
+        center.width = center.right + 0.25
+        return center
+
+    # function returns box of one term
+    def l_term(self, node, frac, ei):
+        scale = self.get_scale(frac, ei)
+
+        # text + special_symbols
+        if node.kind == "text":
+            return self.l_text(node.value, 0, scale)
+
+        # enter
+        elif node.kind == "enter":
+            return Box()
+
+        # index_exponent
+        elif node.kind == "script":
+            return self.l_script(node, frac, ei)
+
+        # { <MORE_TERM> }
+        elif node.kind == "group":
+            return self.l_terms(node.children, frac, ei)
+
+        # sqrt
+        elif node.kind == "sqrt":
+            return self.l_sqrt(node, frac, ei)
+
+        # frac
+        elif node.kind == "frac":
+            return self.l_frac(node, frac, ei)
+
+        # sum
+        elif node.kind == "sum":
+            return self.l_sum(node, frac, ei)
+
+        # command spaces
+        elif node.kind == "space":
+            return Box(None, space_sizes.get(node.name, 0.0) * scale)
+
+        # matrix
+        elif node.kind == "matrix":
+            return self.l_matrix(node, frac, ei)
+
+        # mathematic symbols
+        symbol = self.l_text(get_symbol(node.name), 1, scale)
+
+        # move integral symbol
+        if node.name == "int":
+            box = Box()
+            box.add(symbol, 0.0, -0.3 * scale)
+            box.width = symbol.width - 0.2 * scale
+            return box
+
+        return symbol
+
+    @profiled
+    # function lays out top-level terms starting with number 'first' at position x
+    # returns placements of objects and start width of every term
+    def layout(self, terms, first=0, x=0.0):
+        placements = []
+        widths = []
+
+        for i, node in enumerate(terms):
+            widths.append(x)
+            box = self.l_term(node, 0, ())
+            flatten(box, x, 0.0, first + i, placements)
+            x += box.width
+
+        # width of all terms
+        widths.append(x)
+        return placements, widths
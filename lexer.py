@@ -0,0 +1,135 @@
+# ---------------------------------------------------------------------------
+# File name   : lexer.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# tables of characters
+from .tables import char_types, special_chars
+
+
+# class for tokens
+class Token:
+    def __init__(self, token_type, token_value):
+        self.type = token_type
+        self.value = token_value
+
+
+# class for lexical analyser
+# the source text is never modified, lexer only moves the cursor 'position'
+# tokens that were looked at by peek() wait in the buffer until next() reads them
+class LexicalAnalyser:
+    def __init__(self, latex_text):
+        self.text = latex_text
+        self.position = 0  # index of the next unread character
+        self.token_buffer = []  # lexed tokens which were not read yet
+        self.lex_count = 0  # number of lexed tokens
+
+    # function returns the next token without reading it
+    def peek(self):
+        if not self.token_buffer:
+            self.token_buffer.append(self.get_token())
+
+        return self.token_buffer[0]
+
+    # function reads the next token
+    def next(self):
+        if self.token_buffer:
+            return self.token_buffer.pop(0)
+
+        return self.get_token()
+
+    # function lexes the next token from the source text
+    def get_token(self):
+        self.lex_count += 1
+
+        text = self.text
+        length = len(text)
+        pos = self.position
+        types = char_types  # local name for faster lookup
+
+        state = "STATE_START"
+        start = pos  # first character of text or command name
+
+        token = Token("UNKNOWN", "")
+
+        while True:
+            # end of input text
+            if state == "STATE_START" and pos == length:
+                token.type = "END"
+                break
+            elif pos == length:
+                c = "END"
+            else:
+                c = types.get(text[pos], "OTHER")  # get type of current character
+
+            # choose the next state
+            if state == "STATE_START":
+                if c == "BACKSLASH":
+                    state = "STATE_COMMAND"
+                    pos += 1  # skip read character
+                elif c == "OTHER" or c == "COMMAND_SPACES":
+                    state = "STATE_TEXT"
+                    start = pos
+                elif c == "WHITESPACE":
+                    pos += 1  # skip read character
+                elif c == "ANGLE_BRACKETS":
+                    token.type = "TEXT"
+                    token.value = text[pos]
+                    pos += 1
+                    break
+                else:
+                    token.type = c
+                    token.value = text[pos]
+                    pos += 1
+                    break
+
+            # COMMANDS
+            elif state == "STATE_COMMAND":
+                if c in special_chars:
+                    token.type = "SPECIAL_CHAR"
+                    token.value = text[pos]
+                    pos += 1
+                    break
+                elif c == "BACKSLASH":
+                    token.type = "ENTER"
+                    token.value = "\\"
+                    pos += 1
+                    break
+                elif c == "COMMAND_SPACES":
+                    token.type = "COMMAND"
+                    token.value = text[pos]
+                    pos += 1
+                    break
+                elif c == "OTHER":
+                    state = "STATE_COMMAND_NAME"
+                    start = pos
+                else:
+                    token.type = "COMMAND"
+                    token.value = " "
+                    # skip read character (if any)
+                    if pos < length:
+                        pos += 1
+                    break
+
+            # NAME OF THE COMMAND
+            elif state == "STATE_COMMAND_NAME":
+                if c == "OTHER" and text[pos].isalpha():
+                    pos += 1
+                else:
+                    token.type = "COMMAND"
+                    token.value = text[start:pos]
+                    break
+
+            # TEXT
+            elif state == "STATE_TEXT":
+                if c != "OTHER" and c != "COMMAND_SPACES":
+                    token.type = "TEXT"
+                    token.value = text[start:pos]
+                    break
+                else:
+                    pos += 1
+
+        self.position = pos  # save cursor
+        return token
+
+    # end of get_token()
@@ -0,0 +1,212 @@
+# ---------------------------------------------------------------------------
+# File name   : metrics.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# metrics of glyphs for layout of equations
+# every glyph has advance and ink box for text of size 1.0
+# glyph metrics are (advance, x_min, y_min, x_max, y_max)
+
+# measured metrics are saved into a binary file for every font file and its mtime
+# the file is memory-mapped, so processes share it without measuring glyphs again
+# file: header (magic, version, count) + records sorted by code point
+#       record - code point (uint32) + 5 metrics (float32)
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+# metrics used when glyph can't be measured (layout outside of Blender)
+DEFAULT_GLYPH = (0.55, 0.05, 0.0, 0.5, 0.7)
+
+# format of metrics file
+HEADER = struct.Struct("<4sHI")
+RECORD = struct.Struct("<I5f")
+MAGIC = b"MEQM"
+VERSION = 1
+
+# directory of metrics files
+METRICS_DIR = os.environ.get("MATH_EQ_METRICS_DIR",
+                             os.path.join(tempfile.gettempdir(), "mathematical_equations_metrics"))
+
+
+# class for metrics of one font
+# measure - function returning metrics of given character or None
+# path - path to metrics file or None if metrics are only in memory
+class FontMetrics:
+    def __init__(self, measure=None, path=None):
+        self.measure = measure
+        self.path = path
+        self.glyphs = {}  # character -> glyph metrics
+        self.mapped = None  # memory-mapped metrics file
+        self.count = 0  # number of records in metrics file
+        self.changed = False  # some glyphs were measured and are not saved
+
+        if path is not None:
+            self.load()
+
+    # function maps metrics file into memory, missing or broken file is ignored
+    def load(self):
+        self.close()
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "rb") as metrics_file:
+            try:
+                mapped = mmap.mmap(metrics_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return  # empty file
+
+        magic, version, count = HEADER.unpack_from(mapped, 0) if len(mapped) >= HEADER.size else (b"", 0, 0)
+        if magic != MAGIC or version != VERSION or len(mapped) != HEADER.size + count * RECORD.size:
+            print("Error, metrics file '" + self.path + "' is broken, glyphs will be measured again!")
+            mapped.close()
+            return
+
+        self.mapped = mapped
+        self.count = count
+
+    # function unmaps metrics file
+    def close(self):
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+            self.count = 0
+
+    # function finds metrics of character in metrics file (binary search)
+    def lookup(self, char):
+        code = ord(char)
+        low = 0
+        high = self.count - 1
+
+        while low <= high:
+            middle = (low + high) // 2
+            record = RECORD.unpack_from(self.mapped, HEADER.size + middle * RECORD.size)
+            if record[0] == code:
+                return record[1:]
+            elif record[0] < code:
+                low = middle + 1
+            else:
+                high = middle - 1
+
+        return None
+
+    # function returns metrics of character, missing glyphs are measured once
+    def glyph(self, char):
+        metrics = self.glyphs.get(char)
+        if metrics is not None:
+            return metrics
+
+        if self.mapped is not None:
+            metrics = self.lookup(char)
+
+        if metrics is None:
+            if self.measure is None:
+                metrics = DEFAULT_GLYPH
+            else:
+                metrics = self.measure(char)
+                self.changed = True
+
+        self.glyphs[char] = metrics
+        return metrics
+
+    # function returns ink box of text (x_min, x_max, y_min, y_max)
+    def text_box(self, text):
+        x = 0.0
+        box = None
+
+        for char in text:
+            advance, x_min, y_min, x_max, y_max = self.glyph(char)
+
+            # glyphs without ink (spaces) only move next glyph
+            if x_min != x_max:
+                if box is None:
+                    box = [x + x_min, x + x_max, y_min, y_max]
+                else:
+                    box[0] = min(box[0], x + x_min)
+                    box[1] = max(box[1], x + x_max)
+                    box[2] = min(box[2], y_min)
+                    box[3] = max(box[3], y_max)
+
+            x += advance
+
+        if box is None:
+            return (0.0, 0.0, 0.0, 0.0)
+
+        return tuple(box)
+
+    # function saves measured glyphs together with glyphs from metrics file
+    def save(self):
+        if self.path is None or not self.changed:
+            return
+
+        # glyphs saved by other processes are kept
+        self.load()
+        records = {}
+        for i in range(self.count):
+            record = RECORD.unpack_from(self.mapped, HEADER.size + i * RECORD.size)
+            records[record[0]] = record[1:]
+        for char, metrics in self.glyphs.items():
+            if len(char) == 1 and metrics is not DEFAULT_GLYPH:
+                records[ord(char)] = metrics
+        self.close()
+
+        # file is replaced at once, so readers never see half of it
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".%d.tmp" % os.getpid()
+        with open(tmp_path, "wb") as metrics_file:
+            metrics_file.write(HEADER.pack(MAGIC, VERSION, len(records)))
+            for code in sorted(records):
+                metrics_file.write(RECORD.pack(code, *records[code]))
+        try:
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # file is used by another process, glyphs are saved next time
+            print("Error, metrics file '" + self.path + "' can't be replaced!")
+            os.remove(tmp_path)
+            self.load()
+            return
+
+        self.changed = False
+        self.load()
+
+
+# metrics of fonts, key is path to the font file and its mtime
+# default font is keyed by version of Blender, which bundles it
+font_metrics = {}
+
+
+# function returns path to metrics file of font
+def get_metrics_path(font_path, font_mtime):
+    name = hashlib.sha1((font_path + "|" + repr(font_mtime)).encode("utf-8")).hexdigest()
+    return os.path.join(METRICS_DIR, name + ".bin")
+
+
+# function returns metrics of font
+# measure function is replaced, because the old one can use removed font
+# blender_version - version of Blender for default font (font_path "")
+def get_font_metrics(font_path, measure=None, blender_version=""):
+    font_mtime = 0.0
+    if font_path == "":
+        # default font can change with a new version of Blender
+        font_path = "<builtin " + blender_version + ">"
+    elif os.path.exists(font_path):
+        font_mtime = os.path.getmtime(font_path)
+
+    key = (font_path, font_mtime)
+    metrics = font_metrics.get(key)
+    if metrics is None:
+        metrics = FontMetrics(measure, get_metrics_path(font_path, font_mtime))
+        font_metrics[key] = metrics
+    elif measure is not None:
+        metrics.measure = measure
+
+    return metrics
+
+
+# function saves metrics of all fonts with newly measured glyphs
+def save_font_metrics():
+    for metrics in font_metrics.values():
+        metrics.save()
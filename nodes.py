@@ -0,0 +1,243 @@
+# ---------------------------------------------------------------------------
+# File name   : nodes.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# nodes of the tree created by parser
+# every node has 'kind' so the generator can decide what to create
+
+
+# class for all nodes
+# nodes are equal if they have the same kind and the same values
+class Node:
+    kind = ""
+
+    def __eq__(self, other):
+        return isinstance(other, Node) and self.kind == other.kind and vars(self) == vars(other)
+
+
+# class for text and special characters
+class TextNode(Node):
+    kind = "text"
+
+    def __init__(self, value):
+        self.value = value
+
+
+# class for mathematical symbols (\alpha, \in...)
+class SymbolNode(Node):
+    kind = "symbol"
+
+    def __init__(self, name):
+        self.name = name
+
+
+# class for command spaces (\, \quad...)
+class SpaceNode(Node):
+    kind = "space"
+
+    def __init__(self, name):
+        self.name = name
+
+
+# class for enter (\\), it makes new row only in matrix
+class EnterNode(Node):
+    kind = "enter"
+
+
+# class for terms in brackets { ... }
+class GroupNode(Node):
+    kind = "group"
+
+    def __init__(self, children):
+        self.children = children
+
+
+# class for square root, index is None if root has no multipliers
+class SqrtNode(Node):
+    kind = "sqrt"
+
+    def __init__(self, index, body):
+        self.index = index
+        self.body = body
+
+
+# class for fraction
+class FracNode(Node):
+    kind = "frac"
+
+    def __init__(self, numerator, denominator):
+        self.numerator = numerator
+        self.denominator = denominator
+
+
+# class for sum and product, script is None if there are no limits
+class SumNode(Node):
+    kind = "sum"
+
+    def __init__(self, name, script):
+        self.name = name
+        self.script = script
+
+
+# class for exponent (mode "CARET") and index (mode "UNDERSCORE")
+# brackets - body was written in brackets
+# second - exponent after index or index after exponent (x_1^2)
+class ScriptNode(Node):
+    kind = "script"
+
+    def __init__(self, mode, body, brackets, second):
+        self.mode = mode
+        self.body = body
+        self.brackets = brackets
+        self.second = second
+
+
+# class for matrix
+# rows - list of rows, every row is a list of cells with list of terms
+class MatrixNode(Node):
+    kind = "matrix"
+
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+
+
+# every node has a path in tree, a string of steps separated by dots
+# the first step is the number of top-level term, the next steps are names of
+# fields of nodes and numbers of terms in lists (3.numerator.0, 2.rows.1.0.4)
+# terms in brackets have only their number after the path of the group
+
+
+# function returns path of child with given step
+def join_path(path, step):
+    if path == "":
+        return str(step)
+    if step == "":
+        return path
+
+    return path + "." + str(step)
+
+
+# function returns children of node as (step, child)
+# child is a list of terms or a node (exponent or index of sum, second script)
+def node_children(node):
+    children = []
+    if node.kind == "group":
+        children.append(("", node.children))
+    elif node.kind == "sqrt":
+        if node.index is not None:
+            children.append(("index", node.index))
+        children.append(("body", node.body))
+    elif node.kind == "frac":
+        children.append(("numerator", node.numerator))
+        children.append(("denominator", node.denominator))
+    elif node.kind == "sum":
+        if node.script is not None:
+            children.append(("script", node.script))
+    elif node.kind == "script":
+        children.append(("body", node.body))
+        if node.second is not None:
+            children.append(("second", node.second))
+    elif node.kind == "matrix":
+        for row_num, row in enumerate(node.rows):
+            for cell_num, cell in enumerate(row):
+                children.append(("rows.%d.%d" % (row_num, cell_num), cell))
+
+    return children
+
+
+# function returns paths of all nodes of tree, id of node -> path
+def node_paths(terms):
+    paths = {}
+    stack = [(str(i), node) for i, node in enumerate(terms)]
+    while stack:
+        path, node = stack.pop()
+        paths[id(node)] = path
+
+        for step, child in node_children(node):
+            child_path = join_path(path, step)
+            if isinstance(child, list):
+                stack += [(join_path(child_path, i), term) for i, term in enumerate(child)]
+            else:
+                stack.append((child_path, child))
+
+    return paths
+
+
+# function returns range of changed terms of two lists of terms
+# returns the first changed term and the end of changed terms in old and new list
+def changed_range(old_terms, new_terms):
+    first = 0
+    while first < len(old_terms) and first < len(new_terms) and old_terms[first] == new_terms[first]:
+        first += 1
+
+    old_end = len(old_terms)
+    new_end = len(new_terms)
+    while old_end > first and new_end > first and old_terms[old_end - 1] == new_terms[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+
+    return first, old_end, new_end
+
+
+# function pairs terms of old and new list
+# unchanged terms at the start and at the end are paired by their position,
+# changed terms between them are paired one by one and compared inside
+def match_terms(old_terms, new_terms, old_path, new_path, pairs):
+    first, old_end, new_end = changed_range(old_terms, new_terms)
+
+    for i in range(first):
+        pairs[join_path(new_path, i)] = (join_path(old_path, i), True)
+    for i in range(new_end, len(new_terms)):
+        pairs[join_path(new_path, i)] = (join_path(old_path, i - new_end + old_end), True)
+
+    for i in range(first, min(old_end, new_end)):
+        match_node(old_terms[i], new_terms[i], join_path(old_path, i), join_path(new_path, i), pairs)
+
+
+# function pairs nodes of the same kind and compares their children
+def match_node(old, new, old_path, new_path, pairs):
+    if old.kind != new.kind:
+        return
+
+    pairs[new_path] = (old_path, old == new)
+    if old == new:
+        return
+
+    old_children = dict(node_children(old))
+    for step, child in node_children(new):
+        old_child = old_children.get(step)
+        if old_child is None:
+            continue
+
+        if isinstance(child, list):
+            match_terms(old_child, child, join_path(old_path, step), join_path(new_path, step), pairs)
+        else:
+            match_node(old_child, child, join_path(old_path, step), join_path(new_path, step), pairs)
+
+
+# function compares old and new tree
+# returns pairs of nodes, path in new tree -> (path in old tree, nodes are equal)
+def match_trees(old_terms, new_terms):
+    pairs = {}
+    match_terms(old_terms, new_terms, "", "", pairs)
+    return pairs
+
+
+# function returns path in old tree of node with path in new tree or None
+# nodes inside equal nodes have the same steps from them
+def find_pair(pairs, path):
+    pair = pairs.get(path)
+    if pair is not None:
+        return pair[0]
+
+    end = len(path)
+    while True:
+        end = path.rfind(".", 0, end)
+        if end < 0:
+            return None
+
+        pair = pairs.get(path[:end])
+        if pair is not None:
+            return pair[0] + path[end:] if pair[1] else None
@@ -0,0 +1,134 @@
+# ---------------------------------------------------------------------------
+# File name   : parallel.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# generating of equations in more background Blender processes (workers)
+# workers take equations one by one from the shared list, so a worker with big
+# equations doesn't stop the others and idle workers take the rest of the work
+# every worker saves its equations into its own library file (shard)
+#
+# protocol - parent sends one equation as JSON line to standard input of worker,
+# worker answers by line "MEQ DONE <json entry of report>" on standard output
+# and after the end of input by line "MEQ SHARD <path to library file>"
+# other lines of output are printed by Blender and generator and are ignored
+# it doesn't use bpy, so workers can be driven by any python
+
+import json
+import queue
+import subprocess
+import threading
+from collections import deque
+
+# prefix of messages of workers
+MESSAGE_PREFIX = "MEQ "
+
+
+# function returns equation of batch file as JSON line for worker
+def encode_item(item):
+    return json.dumps({"line": item.line_num, "latex": item.latex_text,
+                       "location": item.location, "scale": item.scale}) + "\n"
+
+
+# function returns entry of report for equation which wasn't generated
+def failed_entry(item, message):
+    return {"line": item.line_num, "latex": item.latex_text, "ok": False, "error": message,
+            "time": 0.0, "objects": 0, "output": None}
+
+
+# class for worker process
+# task - equation generated by worker or None
+# entries - entries of report of equations generated by worker
+# shard - path to library file of worker or None until it is saved
+class Worker:
+    def __init__(self, command, events):
+        self.task = None
+        self.entries = []
+        self.shard = None
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        encoding="utf-8", errors="replace", bufsize=1)
+
+        # output is read in thread, so parent waits for all workers at once
+        self.thread = threading.Thread(target=self.read, args=(events,), daemon=True)
+        self.thread.start()
+
+    # function reads messages of worker and puts them into queue of events
+    # output of Blender isn't always valid UTF-8, wrong bytes are replaced
+    # exit is reported even if reading fails, parent would wait for it forever
+    def read(self, events):
+        try:
+            for line in self.process.stdout:
+                if line.startswith(MESSAGE_PREFIX):
+                    kind, _, data = line[len(MESSAGE_PREFIX):].rstrip("\n").partition(" ")
+                    events.put((self, kind, data))
+        except (OSError, ValueError):
+            # worker would be blocked by its unread output
+            self.process.kill()
+        finally:
+            events.put((self, "EXIT", self.process.wait()))
+
+    # function gives the next equation to worker or ends its input if there are no equations
+    def take(self, tasks):
+        try:
+            if tasks:
+                self.task = tasks.popleft()
+                self.process.stdin.write(encode_item(self.task))
+                self.process.stdin.flush()
+            else:
+                self.task = None
+                self.process.stdin.close()
+        except (BrokenPipeError, OSError):
+            # worker has ended, its task is reported with its exit
+            pass
+
+
+# function generates equations in workers
+# command - returns command of worker process for number of worker
+# with_shards - workers save equations into library files, equations of worker
+#               which ended without saving its file are failed
+# returns entries of report and paths to library files of workers
+def run_workers(command, items, jobs, with_shards=False):
+    events = queue.Queue()
+    tasks = deque(items)
+    workers = [Worker(command(i), events) for i in range(max(1, min(jobs, len(items))))]
+
+    for worker in workers:
+        worker.take(tasks)
+
+    entries = []
+    shards = []
+    running = len(workers)
+    while running:
+        worker, kind, data = events.get()
+
+        # equation is generated, worker takes the next one
+        if kind == "DONE":
+            entry = json.loads(data)
+            entries.append(entry)
+            worker.entries.append(entry)
+            worker.task = None
+            worker.take(tasks)
+
+        elif kind == "SHARD":
+            worker.shard = data
+            shards.append(data)
+
+        # worker has ended, unfinished equation is failed
+        elif kind == "EXIT":
+            running -= 1
+            if worker.task is not None:
+                entries.append(failed_entry(worker.task, "worker ended with code %d" % data))
+                worker.task = None
+
+            # generated equations are lost with library file that wasn't saved
+            if with_shards and worker.shard is None:
+                for entry in worker.entries:
+                    if entry["ok"]:
+                        entry["ok"] = False
+                        entry["error"] = "worker ended with code %d before its equations were saved" % data
+
+    # equations left after all workers have failed
+    for item in tasks:
+        entries.append(failed_entry(item, "no worker is running"))
+
+    return entries, shards
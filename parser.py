@@ -0,0 +1,438 @@
+# ---------------------------------------------------------------------------
+# File name   : parser.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# parser checks the order of tokens and creates tree of nodes
+# it doesn't use bpy, so equations can be checked without Blender
+
+# lexical analyser
+from .lexer import *
+
+# nodes of tree
+from .nodes import *
+
+# tables of spaces, matrices and tokens
+from .tables import space_sizes, matrix_names, const_types
+
+# unicode characters database
+from .unicode_db import get_symbol
+
+# instrumentation of generating
+from .profiler import profiled, profiler
+
+
+# class for parser
+class Parser(LexicalAnalyser):
+    def __init__(self, latex_text):
+        super().__init__(latex_text)
+
+        self.sqrt = False  # inside multipliers of sqrt
+        self.exp_ix = False  # inside the second exponent or index
+        self.error = ""  # the first error message
+
+    # function prints error message and saves the first one
+    def report_error(self, message):
+        print(message)
+        if not self.error:
+            self.error = message
+
+    @staticmethod
+    # function returns if token is <CONST>
+    def is_const(token):
+        return token.type in const_types
+
+    @staticmethod
+    # function returns if token is <COMMAND>
+    def is_command(token):
+        # <COMMAND>
+        if token.type == "OPEN_BRACKET":
+            return True
+
+        elif token.type == "COMMAND":
+            if token.value != "end":
+                return True
+
+        return False
+
+    @staticmethod
+    # function returns if token is <BLOCK>
+    def is_block(token):
+        # <BLOCK>
+        if token.type == "COMMAND" and token.value == "begin":
+            return True
+
+        return False
+
+    # function returns name of the matrix figure or None
+    # { text }
+    def is_matrix_figure(self):
+        # {
+        token = self.next()
+        if token.type == "OPEN_BRACKET":
+            # text
+            token = self.next()
+            if token.type == "TEXT" and token.value in matrix_names:
+                name = token.value
+                # }
+                token = self.next()
+                if token.type == "CLOSE_BRACKET":
+                    return name
+                else:
+                    self.report_error("Error, missing closing bracket to command!")
+                    return None
+
+        self.report_error("Error, unknown type of matrix!")
+        return None
+
+    # <MATRIX> -> <COMMAND> <MORE_MATRIX>
+    #          -> <CONST> <MORE_MATRIX>
+    #          -> & <MORE_MATRIX>
+    #          -> epsilon
+    # <MORE_MATRIX> -> <MATRIX> <MORE_MATRIX>
+    #               -> epsilon
+    # every <MORE_MATRIX> is one iteration of the loop
+    def p_matrix(self, rows):
+        while True:
+            token = self.peek()
+
+            # <COMMAND>
+            if self.is_command(token):
+                node = self.p_command()
+                if node is None:
+                    return False
+                rows[-1][-1].append(node)
+
+            # <CONST>
+            elif self.is_const(token):
+                # enter (\\) makes new row
+                if token.type == "ENTER":
+                    self.next()
+                    rows.append([[]])
+                else:
+                    node = self.p_const()
+                    if node is None:
+                        return False
+                    rows[-1][-1].append(node)
+
+            # & makes new cell
+            elif token.type == "AMPERSAND":
+                self.next()
+                rows[-1].append([])
+
+            else:
+                # epsilon
+                return True
+
+    # function reads terms in brackets
+    # { <MORE_TERM> }
+    def p_figure(self):
+        # {
+        token = self.next()
+        if token.type != "OPEN_BRACKET":
+            self.report_error("Error, missing opening bracket to command!")
+            return None
+
+        # <MORE_TERM>
+        terms = []
+        if not self.p_more_term(terms):
+            return None
+
+        # }
+        token = self.next()
+        if token.type != "CLOSE_BRACKET":
+            self.report_error("Error, missing closing bracket to command!")
+            return None
+
+        return terms
+
+    # <SQRT> -> [ <MORE_TERM> ] { <MORE_TERM> }
+    #        -> { <MORE_TERM> }
+    def p_sqrt(self):
+        index = None
+        token = self.peek()
+
+        # [
+        if token.type == "TEXT" and token.value == "[":
+            self.next()
+
+            # multipliers end with ]
+            in_sqrt = self.sqrt
+            self.sqrt = True
+
+            # <MORE_TERM>
+            index = []
+            if not self.p_more_term(index):
+                return None
+            self.sqrt = in_sqrt
+
+            # ]
+            token = self.next()
+            if not (token.type == "TEXT" and token.value == "]"):
+                self.report_error("Error, missing closing bracket to square root!")
+                return None
+
+        # { <MORE_TERM> }
+        body = self.p_figure()
+        if body is None:
+            return None
+
+        return SqrtNode(index, body)
+
+    # <FRAC> -> { <MORE_TERM> } { <MORE_TERM> }
+    def p_frac(self):
+        numerator = self.p_figure()
+        if numerator is None:
+            return None
+
+        denominator = self.p_figure()
+        if denominator is None:
+            return None
+
+        return FracNode(numerator, denominator)
+
+    # <SUM> -> index_exponent
+    #       -> epsilon
+    def p_sum(self, name):
+        token = self.peek()
+
+        # check index or exponent for sum
+        if token.type == "UNDERSCORE" or token.type == "CARET":
+            # index_exponent
+            script = self.p_const()
+            if script is None:
+                return None
+
+            return SumNode(name, script)
+
+        # epsilon
+        return SumNode(name, None)
+
+    # function returns node of mathematical symbol
+    def p_symbol(self, name):
+        if get_symbol(name) is None:
+            # command is not in unicode database
+            self.report_error("Error, command '" + name + "' is not in unicode database!")
+            print("It's a possible misspelling or this command is not implemented in this version of addon.")
+            return None
+
+        return SymbolNode(name)
+
+    # function finds the wrong use of exponents and indexes
+    #          reads index + exponent
+    def is_both_ei(self, mode, body, brackets):
+        token = self.peek()  # look at next token
+
+        # multiple uses of exponent + index
+        if self.exp_ix and (token.type == "UNDERSCORE" or token.type == "CARET"):
+            self.report_error("Error, use of both index and exponent is only permitted once!")
+            return None
+
+        # exponent + index
+        elif (mode == "CARET" and token.type == "UNDERSCORE") \
+            or (mode == "UNDERSCORE" and token.type == "CARET"):
+
+            self.exp_ix = True  # is inside cyclus
+            second = self.p_const()
+            if second is None:
+                return None
+            self.exp_ix = False  # is out of cyclus
+
+            return ScriptNode(mode, body, brackets, second)
+
+        elif token.type == "UNDERSCORE" or token.type == "CARET":
+            self.report_error("Error, use brackets to correctly make multiple exponents or indexes!")
+            return None
+
+        return ScriptNode(mode, body, brackets, None)
+
+    # <AFTER_EI> -> { <MORE_TERM> }
+    #            -> text
+    #            -> special_symbols
+    #            -> command (special group of commands)
+    def p_after_ei(self, mode):
+        token = self.peek()
+
+        # { <MORE_TERM> }
+        if token.type == "OPEN_BRACKET":
+            body = self.p_figure()
+            if body is None:
+                return None
+
+            return self.is_both_ei(mode, body, True)
+
+        # text
+        # special_symbols
+        elif token.type == "TEXT" or token.type == "SPECIAL_CHAR":
+            self.next()
+            return self.is_both_ei(mode, [TextNode(token.value)], False)
+
+        # command (special group of commands)
+        elif token.type == "COMMAND":
+            self.next()
+            node = self.p_symbol(token.value)
+            if node is None:
+                return None
+
+            return self.is_both_ei(mode, [node], False)
+
+        self.report_error("Error, missing exponent or index!")
+        return None
+
+    # <CONST> -> text
+    #         -> special_symbols
+    #         -> enter
+    #         -> index_exponent <IN_BRACKETS>
+    def p_const(self):
+        token = self.next()
+
+        # text + special_symbols
+        if token.type == "TEXT" or token.type == "SPECIAL_CHAR":
+            return TextNode(token.value)
+
+        # enter
+        elif token.type == "ENTER":
+            return EnterNode()
+
+        # index_exponent
+        elif token.type == "UNDERSCORE" or token.type == "CARET":
+            # <IN_BRACKETS>
+            return self.p_after_ei(token.type)
+
+        return None
+
+    # <COMMAND> -> { <MORE_TERM> }
+    #           -> sqrt <SQRT>
+    #           -> frac <FRAC>
+    #           -> command <COMM_ARG>
+    def p_command(self):
+        token = self.peek()
+
+        # { <MORE_TERM> }
+        if token.type == "OPEN_BRACKET":
+            children = self.p_figure()
+            if children is None:
+                return None
+
+            return GroupNode(children)
+
+        # COMMAND type
+        self.next()
+
+        # sqrt
+        if token.value == "sqrt":
+            return self.p_sqrt()  # <SQRT>
+
+        # frac
+        elif token.value == "frac":
+            return self.p_frac()  # <FRAC>
+
+        # sum
+        elif token.value == "sum" or token.value == "prod":
+            return self.p_sum(token.value)  # <SUM>
+
+        # command spaces
+        elif token.value in space_sizes:
+            return SpaceNode(token.value)
+
+        # mathematic symbols
+        return self.p_symbol(token.value)
+
+    # <BLOCK> -> begin { text } <MATRIX> end { text }
+    def p_block(self):
+        # begin
+        self.next()
+
+        # { text }
+        if self.is_matrix_figure() is None:
+            return None
+
+        # <MATRIX>
+        rows = [[[]]]
+        if not self.p_matrix(rows):
+            return None
+
+        # end
+        token = self.next()
+        if not (token.type == "COMMAND" and token.value == "end"):
+            self.report_error("Error, missing end of matrix!")
+            return None
+
+        # { text } decides brackets of matrix
+        name = self.is_matrix_figure()
+        if name is None:
+            return None
+
+        return MatrixNode(name, rows)
+
+    # <TERM> -> <CONST>
+    #        -> <COMMAND>
+    #        -> <BLOCK>
+    def p_term(self):
+        token = self.peek()
+
+        # <CONST>
+        if self.is_const(token):
+            return self.p_const()
+
+        # <BLOCK>
+        elif self.is_block(token):
+            return self.p_block()
+
+        # <COMMAND>
+        elif self.is_command(token):
+            return self.p_command()
+
+        # no corresponding terminals
+        self.report_error("Error, no corresponding terminals - use of not supported symbol!")
+        return None
+
+    # <MORE_TERM> -> <TERM> <MORE_TERM>
+    #             -> epsilon
+    # every <MORE_TERM> is one iteration of the loop
+    def p_more_term(self, terms):
+        while True:
+            token = self.peek()
+
+            # special sqrt ]
+            if self.sqrt and token.type == "TEXT" and token.value == "]":
+                return True
+
+            elif self.is_const(token) or self.is_command(token) or self.is_block(token):
+                node = self.p_term()  # <TERM>
+                if node is None:
+                    return False
+                terms.append(node)
+
+            else:
+                # epsilon
+                return True
+
+    @profiled
+    # taking tokens and checking their order
+    # returns list of terms or None if there is an error
+    # <PROG> -> <TERM> <MORE_TERM>
+    def parse(self):
+        # <TERM>
+        node = self.p_term()
+        if node is None:
+            return None
+        terms = [node]
+
+        # <MORE_TERM>
+        if not self.p_more_term(terms):
+            return None
+
+        token = self.next()
+        if token.type != "END":
+            self.report_error("Error, not all tokens have been read!")
+            print("Value of last token: " + token.value)
+            return None
+
+        return terms
+
+
+# grammar rules are timed only while profiler runs,
+# they are called for every term and the decorator would slow down parsing
+profiler.add_rules(Parser, ["p_term", "p_more_term", "p_command", "p_sqrt", "p_frac",
+                            "p_sum", "p_matrix", "p_after_ei"])
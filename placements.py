@@ -0,0 +1,51 @@
+# ---------------------------------------------------------------------------
+# File name   : placements.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# placements describe generated objects of equation
+# objects can be created again from placements without any layout
+
+
+# class for placement of text object
+# font - 0 for default font, 1 for unicode font
+# size - size of text, scale_x and scale_y - scale of object
+# term - number of top-level term the object belongs to
+# path - path of node the object belongs to (see nodes.py)
+class GlyphPlacement:
+    kind = "glyph"
+
+    def __init__(self, text, font, size, x, y, scale_x, scale_y, term, path):
+        self.text = text
+        self.font = font
+        self.size = size
+        self.x = x
+        self.y = y
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+        self.term = term
+        self.path = path
+
+
+# class for placement of mesh object (sqrt symbol, fraction line)
+# verts and faces are in local space of object
+class MeshPlacement:
+    kind = "mesh"
+
+    def __init__(self, name, verts, faces, x, y, term, path):
+        self.name = name
+        self.verts = verts
+        self.faces = faces
+        self.x = x
+        self.y = y
+        self.term = term
+        self.path = path
+
+
+# function returns shape of placement as string, placements with the same shape
+# differ only in position, so their object can be moved instead of created again
+def placement_shape(item):
+    if item.kind == "glyph":
+        return "%s|%d|%.4f|%.4f|%.4f" % (item.text, item.font, item.size, item.scale_x, item.scale_y)
+
+    return "%s|%s" % (item.name, ",".join("%.4f" % coord for vert in item.verts for coord in vert))
@@ -0,0 +1,162 @@
+# ---------------------------------------------------------------------------
+# File name   : profiler.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# opt-in instrumentation of generating equations
+# profiled functions record number of their calls and wall time,
+# time of recursive rules includes time of their nested calls
+# rules called too often for the decorator are wrapped only while profiler runs
+# counters count operators, bound queries, scene updates, created groups,
+# collections and objects
+# python profile of the whole run can be captured by cProfile,
+# cProfile and pstats are imported only then, they are slow to import
+# it doesn't use bpy, so results can be read and saved without Blender
+
+import io
+import json
+import time
+from functools import wraps
+
+# number of functions in text of python profile
+PROFILE_LINES = 40
+
+# number of the slowest functions shown in panel
+STATS_LINES = 8
+
+
+# class for results of one profiled run
+# timings - name of function -> [number of calls, time in seconds]
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.python_profile = None
+        self.rules = []
+        self.originals = []
+        self.reset()
+
+    # function removes results of the previous run
+    def reset(self):
+        self.timings = {}
+        self.counters = {}
+        self.total = 0.0
+        self.profile_text = ""
+        self.has_results = False
+
+    # function starts recording of a new run
+    # returns False if a run is already recorded (operator called by other operator)
+    def start(self, use_cprofile=False):
+        if self.enabled:
+            return False
+
+        self.reset()
+        self.enabled = True
+        for cls, names in self.rules:
+            for name in names:
+                function = cls.__dict__[name]
+                self.originals.append((cls, name, function))
+                setattr(cls, name, timed(function, cls.__qualname__ + "." + name))
+        self.start_time = time.perf_counter()
+
+        if use_cprofile:
+            import cProfile
+            self.python_profile = cProfile.Profile()
+            self.python_profile.enable()
+
+        return True
+
+    # function stops recording of the run
+    def stop(self):
+        if not self.enabled:
+            return
+
+        if self.python_profile is not None:
+            import pstats
+            self.python_profile.disable()
+            stream = io.StringIO()
+            stats = pstats.Stats(self.python_profile, stream=stream)
+            stats.sort_stats("cumulative").print_stats(PROFILE_LINES)
+            self.profile_text = stream.getvalue()
+            self.python_profile = None
+
+        self.total = time.perf_counter() - self.start_time
+        for cls, name, function in self.originals:
+            setattr(cls, name, function)
+        self.originals = []
+        self.enabled = False
+        self.has_results = True
+
+    # function registers methods of class timed while profiler runs
+    # the other time they are called without any wrapper
+    def add_rules(self, cls, names):
+        self.rules.append((cls, names))
+
+    # function adds number to counter
+    def count(self, name, number=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + number
+
+    # function adds one call of function
+    def add_time(self, name, elapsed):
+        timing = self.timings.setdefault(name, [0, 0.0])
+        timing[0] += 1
+        timing[1] += elapsed
+
+    # function returns results as dictionary, the slowest functions first
+    def report(self):
+        timings = sorted(self.timings.items(), key=lambda item: item[1][1], reverse=True)
+        return {"total": self.total,
+                "timings": [{"name": name, "calls": calls, "time": elapsed} for name, (calls, elapsed) in timings],
+                "counters": dict(sorted(self.counters.items())),
+                "python_profile": self.profile_text}
+
+    # function saves results into JSON file
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as profile_file:
+            json.dump(self.report(), profile_file, indent=1)
+
+    # function returns lines of text with results for panel
+    def stats(self):
+        report = self.report()
+        lines = ["Total: %.3f s" % report["total"]]
+        for timing in report["timings"][:STATS_LINES]:
+            lines.append("%s: %d x, %.3f s" % (timing["name"], timing["calls"], timing["time"]))
+        for name, number in report["counters"].items():
+            lines.append("%s: %d" % (name.capitalize(), number))
+
+        return lines
+
+
+# profiler shared by all generations
+profiler = Profiler()
+
+
+# decorator records calls of function when profiler is enabled
+def profiled(function):
+    name = function.__qualname__
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if not profiler.enabled:
+            return function(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.add_time(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+# function returns function which always records its calls
+def timed(function, name):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.add_time(name, time.perf_counter() - start)
+
+    return wrapper
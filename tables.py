@@ -0,0 +1,86 @@
+# ---------------------------------------------------------------------------
+# File name   : tables.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+# tables shared by lexical and syntax analyser
+# they are built once when the module is imported
+
+# types of characters, every other character is of type "OTHER"
+char_types = {
+    '\\': "BACKSLASH",
+    '{': "OPEN_BRACKET",
+    '}': "CLOSE_BRACKET",
+    '^': "CARET",
+    '_': "UNDERSCORE",
+    '&': "AMPERSAND",
+    '!': "COMMAND_SPACES",
+    ';': "COMMAND_SPACES",
+    ':': "COMMAND_SPACES",
+    ',': "COMMAND_SPACES",
+    '[': "ANGLE_BRACKETS",
+    ']': "ANGLE_BRACKETS",
+    ' ': "WHITESPACE",
+    '\n': "WHITESPACE"
+}
+
+# types of characters that make special character after backslash
+special_chars = frozenset([
+    "OPEN_BRACKET",
+    "CLOSE_BRACKET",
+    "AMPERSAND",
+    "UNDERSCORE"
+])
+
+# all types of spaces and their sizes
+space_sizes = {
+    '!': -0.1,
+    ',': 0.15,
+    ':': 0.2,
+    ';': 0.25,
+    ' ': 0.3,
+    "quad": 0.6,
+    "qquad": 1.2
+}
+
+# all types of matrices
+matrix_names = frozenset([
+    "bmatrix", "Bmatrix", "matrix", "pmatrix", "Pmatrix", "vmatrix", "Vmatrix"
+])
+
+# brackets of matrices, other matrices don't have brackets
+matrix_brackets = {
+    "bmatrix": ('[', ']'),
+    "Bmatrix": ('{', '}'),
+    "pmatrix": ('(', ')'),
+    "vmatrix": ('|', '|'),
+    "Vmatrix": ('||', '||')
+}
+
+# types of tokens that start <CONST>
+const_types = frozenset([
+    "TEXT", "SPECIAL_CHAR", "UNDERSCORE", "CARET", "ENTER"
+])
+
+# symbols which are generated 3.5 times bigger (sum, integral, product)
+big_symbols = frozenset(['\u2211', '\u222b', '\u220f'])
+
+# vertices and faces of square root symbol
+sqrt_verts = [
+    (-0.5266461968421936, -0.13621671915054321, 0.0),
+    (-0.40451911091804504, -0.21025631248950958, 0.0),
+    (-0.3643374443054199, -0.13621671915054321, 0.0),
+    (-0.15997552871704102, -0.7838898515701294, 0.0),
+    (-0.15997552871704102, -0.6396166300773621, 0.0),
+    (0.36744120717048645, 0.35296740531921387, 0.0),
+    (0.32928138971328735, 0.4122579336166382, 0.0),
+    (0.4593656659126282, 0.35296740531921387, 0.0),
+    (0.4593656659126282, 0.4122579336166382, 0.0)
+]
+sqrt_faces = [[0, 1, 2], [3, 4, 2, 1], [4, 3, 5, 6], [7, 8, 6, 5]]  # all faces face up (+z)
+
+# origin of square root symbol
+sqrt_origin = (-0.5266461968421936, -0.8238898515701294, 0.0)
+
+# width of square root symbol
+sqrt_width = 0.855927586555481
@@ -1,167 +1,523 @@
-# ---------------------------------------------------------------------------
-# File name   : ui.py
-# Created By  : Katarina Strenkova
-# ---------------------------------------------------------------------------
-
-import bpy
-import math
-
-from bpy.props import (StringProperty,
-                       BoolProperty,
-                       IntProperty,
-                       FloatProperty,
-                       FloatVectorProperty,
-                       EnumProperty,
-                       PointerProperty,
-                       )
-                       
-from mathutils import Vector  # vertices   
-
-# function from analyser
-from .analyser import * 
-                       
-
-# custom properties
-class Custom_PT(bpy.types.PropertyGroup):
-    
-    latex_text : bpy.props.StringProperty(name="Latex text", default="")
-    
-    font_path : StringProperty(
-        name = "Font",
-        description="Choose a font:",
-        default="",
-        maxlen=1024,
-        subtype='FILE_PATH'
-    )
-    
-    text_scale : bpy.props.FloatProperty(
-        name="Scale:",
-        default=1.0,
-        min=0.01
-    )
-    
-    text_thickness : bpy.props.FloatProperty(
-        name="Thickness:",
-        default=0.0,
-        min=0.0
-    )
-    
-    text_location : bpy.props.FloatVectorProperty(
-        name="Location",
-        subtype='XYZ'
-    )
-    
-    text_rotation : bpy.props.FloatVectorProperty(
-        name="Rotation",
-        subtype='EULER'
-    )
-
-
-# main addon panel
-class OBJECT_PT_ME(bpy.types.Panel):
-    bl_label = "Mathematical Equations"
-    bl_idname = "OBJECT_PT_ME"
-    bl_space_type = 'VIEW_3D'
-    bl_region_type = 'UI'
-    bl_category = 'Equations'
-    
-    # drawing main panel
-    def draw(self, context):  
-        layout = self.layout
-        scene = context.scene
-        cus_pt = scene.custom_prop
-        
-        layout.prop(cus_pt, "latex_text")
-        layout.prop(cus_pt, "font_path")
-        layout.prop(cus_pt, "text_scale")
-        layout.prop(cus_pt, "text_thickness")
-        
-        row = layout.row(align=True)
-        
-        col = row.column()
-        col.prop(cus_pt,'text_location')
-        
-        col2 = row.column()
-        col2.prop(cus_pt,'text_rotation')
-              
-        row2 = layout.row(align=True)
-        props = row2.operator("wm.addtextop")     
-
-        
-# add text    
-class WM_OT_AddText(bpy.types.Operator):
-    bl_label = "Add Text"
-    bl_idname = "wm.addtextop"
-    
-    def execute(self, context):
-        scene = context.scene
-        cus_pt = scene.custom_prop
-        
-        # create class for analysis 
-        syntax = SyntaxAnalyser(cus_pt.latex_text, context, cus_pt.text_scale, cus_pt.font_path)
-
-        if not syntax.sa_prog():
-            warn_msg = 'Mathematical equation was not fully generated. Check system console for more info on this matter.'
-            self.report({'WARNING'}, warn_msg)
-        
-        # all objects in mathematical equation   
-        all_obj = context.selected_objects
-        
-        # add empty object
-        bpy.ops.object.empty_add(type='PLAIN_AXES', location=(0,0,0))
-        empty_obj = context.object 
-            
-        # customize mathematical equation
-        for obj in all_obj: 
-            # set thickness
-            if "Text" in obj.name:
-                # for text change extrude parameter
-                obj.data.extrude = cus_pt.text_thickness / 2.0       
-            else:
-                # for other objects apply solidify modifier    
-                obj.modifiers["Solidify"].thickness = cus_pt.text_thickness
-                obj.modifiers["Solidify"].offset = 0.0
-
-            # set empty object as parent
-            obj.parent = empty_obj
-            
-        # move all objects by moving empty object
-        empty_obj.location.x = cus_pt.text_location.x
-        empty_obj.location.y = cus_pt.text_location.y
-        empty_obj.location.z = cus_pt.text_location.z
-           
-        # rotate all objects by rotating empty object
-        empty_obj.rotation_euler.x = cus_pt.text_rotation.x
-        empty_obj.rotation_euler.y = cus_pt.text_rotation.y
-        empty_obj.rotation_euler.z = cus_pt.text_rotation.z 
-        
-        # apply transformation
-        bpy.data.objects[empty_obj.name].select_set(True)
-        bpy.ops.object.transform_apply(location=True, rotation=True)
-        
-        # delete empty object
-        bpy.data.objects[empty_obj.name].select_set(True)
-        bpy.ops.object.delete()                       
-        
-        return {'FINISHED'}     
-      
-
-# enumeration of all my classes
-all_classes = [
-    Custom_PT, 
-    OBJECT_PT_ME, 
-    WM_OT_AddText
-]
-
-
-def register():
-    for cls in all_classes:
-        bpy.utils.register_class(cls)
-    bpy.types.Scene.custom_prop = bpy.props.PointerProperty(type=Custom_PT)
-
-
-def unregister():
-    for cls in all_classes:
-        bpy.utils.unregister_class(cls)
-    del bpy.types.Scene.custom_prop
- 
+# ---------------------------------------------------------------------------
+# File name   : ui.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+import bpy
+import math
+import sys
+from bpy.app.handlers import persistent
+
+from bpy.props import (StringProperty,
+                       BoolProperty,
+                       IntProperty,
+                       FloatProperty,
+                       FloatVectorProperty,
+                       EnumProperty,
+                       PointerProperty,
+                       )
+                       
+from mathutils import Vector  # vertices   
+from mathutils import Euler, Matrix
+
+# cache of generated equations
+from .cache import equation_cache
+
+# reading of batch files
+from .batch import read_batch
+
+# instrumentation of generating
+from .profiler import profiler
+
+# generator of equations (analyser, generator) is imported by operators on the first use,
+# so registration of addon imports only modules without bpy
+                       
+
+# function sets thickness of generated object
+def set_thickness(obj, thickness):
+    if "Text" in obj.name:
+        # for text change extrude parameter
+        obj.data.extrude = thickness / 2.0       
+    elif "Glyph" in obj.name or "Equation" in obj.name:
+        # meshes of glyphs already have thickness
+        pass
+    else:
+        # for other objects apply solidify modifier    
+        obj.modifiers["Solidify"].thickness = thickness
+        obj.modifiers["Solidify"].offset = 0.0
+
+
+# function customizes thickness, location and rotation of generated objects
+def finish_equation(context, cus_pt, all_obj):
+    
+    # add empty object
+    bpy.ops.object.empty_add(type='PLAIN_AXES', location=(0,0,0))
+    profiler.count("operators")
+    empty_obj = context.object 
+        
+    # customize mathematical equation
+    for obj in all_obj: 
+        set_thickness(obj, cus_pt.text_thickness)
+
+        # set empty object as parent
+        obj.parent = empty_obj
+        
+    # move all objects by moving empty object
+    empty_obj.location.x = cus_pt.text_location.x
+    empty_obj.location.y = cus_pt.text_location.y
+    empty_obj.location.z = cus_pt.text_location.z
+       
+    # rotate all objects by rotating empty object
+    empty_obj.rotation_euler.x = cus_pt.text_rotation.x
+    empty_obj.rotation_euler.y = cus_pt.text_rotation.y
+    empty_obj.rotation_euler.z = cus_pt.text_rotation.z 
+    
+    # apply transformation
+    bpy.data.objects[empty_obj.name].select_set(True)
+    bpy.ops.object.transform_apply(location=True, rotation=True)
+    profiler.count("operators")
+    
+    # delete empty object
+    bpy.data.objects[empty_obj.name].select_set(True)
+    bpy.ops.object.delete()
+    profiler.count("operators")
+
+
+# function customizes thickness, location and rotation of objects of equation in batch
+# objects are transformed through data API without operators, so the scene is updated
+# only once for the whole batch
+def finish_batch_equation(all_obj, thickness, location, rotation):
+    transform = Matrix.Translation(location) @ Euler(rotation).to_matrix().to_4x4()
+    
+    for obj in all_obj:
+        set_thickness(obj, thickness)
+        obj.matrix_basis = transform @ obj.matrix_basis
+
+
+# function runs generating of operator, profiler records it if profiling is on
+def run_profiled(context, generate):
+    cus_pt = context.scene.custom_prop
+    started = cus_pt.profiling and profiler.start(cus_pt.profile_python)
+    
+    try:
+        return generate(context)
+    finally:
+        if started:
+            profiler.stop()
+
+
+# function removes objects of equation, their data and collection
+# shared meshes of glyphs have fake user, so they are kept for next equations
+def remove_equation(collection):
+    from .generator import gen_remove_objects
+    gen_remove_objects(collection.all_objects)
+    bpy.data.collections.remove(collection)
+
+
+# function saves customization of equation into its collection
+def save_settings(collection, cus_pt):
+    collection["text_thickness"] = cus_pt.text_thickness
+    collection["text_location"] = tuple(cus_pt.text_location)
+    collection["text_rotation"] = tuple(cus_pt.text_rotation)
+
+
+# function returns if equation in collection has the same settings
+# missing setting (equation from older version or other tool) is never the same
+def same_settings(collection, cus_pt):
+    return collection.get("font_path") == cus_pt.font_path \
+        and collection.get("layout_engine") == cus_pt.layout_engine \
+        and collection.get("glyph_type") == cus_pt.glyph_type \
+        and collection.get("curve_resolution") == cus_pt.curve_resolution \
+        and collection.get("text_scale") == cus_pt.text_scale \
+        and collection.get("text_thickness") == cus_pt.text_thickness \
+        and tuple(collection.get("text_location", ())) == tuple(cus_pt.text_location) \
+        and tuple(collection.get("text_rotation", ())) == tuple(cus_pt.text_rotation)
+
+
+# custom properties
+class Custom_PT(bpy.types.PropertyGroup):
+    
+    latex_text : bpy.props.StringProperty(name="Latex text", default="")
+    
+    font_path : StringProperty(
+        name = "Font",
+        description="Choose a font:",
+        default="",
+        maxlen=1024,
+        subtype='FILE_PATH'
+    )
+    
+    text_scale : bpy.props.FloatProperty(
+        name="Scale:",
+        default=1.0,
+        min=0.01
+    )
+    
+    text_thickness : bpy.props.FloatProperty(
+        name="Thickness:",
+        default=0.0,
+        min=0.0
+    )
+    
+    text_location : bpy.props.FloatVectorProperty(
+        name="Location",
+        subtype='XYZ'
+    )
+    
+    text_rotation : bpy.props.FloatVectorProperty(
+        name="Rotation",
+        subtype='EULER'
+    )
+    
+    layout_engine : bpy.props.EnumProperty(
+        name="Layout",
+        items=[
+            ('BOX', "Box", "Lay out equation from font metrics before objects are created"),
+            ('SCENE', "Scene", "Move generated objects by their bounding boxes (slower)")
+        ],
+        default='BOX'
+    )
+    
+    glyph_type : bpy.props.EnumProperty(
+        name="Glyphs",
+        items=[
+            ('CURVE', "Curve", "Every glyph is a separate text object"),
+            ('MESH', "Mesh", "Every distinct glyph is converted to mesh once and objects share it"),
+            ('MERGED', "Merged", "The whole equation is one mesh object, faces keep number of their part")
+        ],
+        default='CURVE'
+    )
+    
+    curve_resolution : bpy.props.IntProperty(
+        name="Resolution:",
+        default=12,
+        min=1,
+        max=64
+    )
+    
+    batch_path : StringProperty(
+        name = "Batch",
+        description="Text file with one equation per line, optional location and scale are separated by tabs",
+        default="",
+        maxlen=1024,
+        subtype='FILE_PATH'
+    )
+    
+    profiling : bpy.props.BoolProperty(
+        name="Profile",
+        description="Record time of grammar rules and generator calls and count operators, bound queries and created objects",
+        default=False
+    )
+    
+    profile_python : bpy.props.BoolProperty(
+        name="Python Profile",
+        description="Capture the whole generation by cProfile (slower)",
+        default=False
+    )
+    
+    profile_path : StringProperty(
+        name = "Profile",
+        description="JSON file for results of the last profiled generation",
+        default="//profile.json",
+        maxlen=1024,
+        subtype='FILE_PATH'
+    )
+
+
+# main addon panel
+class OBJECT_PT_ME(bpy.types.Panel):
+    bl_label = "Mathematical Equations"
+    bl_idname = "OBJECT_PT_ME"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Equations'
+    
+    # drawing main panel
+    def draw(self, context):  
+        layout = self.layout
+        scene = context.scene
+        cus_pt = scene.custom_prop
+        
+        layout.prop(cus_pt, "latex_text")
+        layout.prop(cus_pt, "font_path")
+        layout.prop(cus_pt, "text_scale")
+        layout.prop(cus_pt, "text_thickness")
+        layout.prop(cus_pt, "layout_engine")
+        layout.prop(cus_pt, "glyph_type")
+        if not cus_pt.glyph_type == 'CURVE':
+            layout.prop(cus_pt, "curve_resolution")
+        
+        row = layout.row(align=True)
+        
+        col = row.column()
+        col.prop(cus_pt,'text_location')
+        
+        col2 = row.column()
+        col2.prop(cus_pt,'text_rotation')
+              
+        row2 = layout.row(align=True)
+        props = row2.operator("wm.addtextop")     
+        row2.operator("wm.updatetextop")
+        
+        # statistics of cache
+        row3 = layout.row(align=True)
+        row3.label(text=equation_cache.stats())
+        row3.operator("wm.clearcacheop", text="", icon='TRASH')
+        
+        row4 = layout.row(align=True)
+        row4.operator("wm.warmmetricsop")
+        
+        row5 = layout.row(align=True)
+        row5.prop(cus_pt, "batch_path")
+        row5.operator("wm.addbatchop", text="", icon='FILE_TEXT')
+        
+        # profiling of generating
+        row6 = layout.row(align=True)
+        row6.prop(cus_pt, "profiling")
+        row6.prop(cus_pt, "profile_python")
+        
+        # results of the last profiled generation
+        if profiler.has_results:
+            box = layout.box()
+            for line in profiler.stats():
+                box.label(text=line)
+            
+            row7 = box.row(align=True)
+            row7.prop(cus_pt, "profile_path")
+            row7.operator("wm.exportprofileop", text="", icon='EXPORT')
+
+        
+# add text    
+class WM_OT_AddText(bpy.types.Operator):
+    bl_label = "Add Text"
+    bl_idname = "wm.addtextop"
+    
+    def execute(self, context):
+        return run_profiled(context, self.generate)
+    
+    # function generates equation
+    def generate(self, context):
+        scene = context.scene
+        cus_pt = scene.custom_prop
+        
+        # create class for analysis 
+        from .analyser import SyntaxAnalyser
+        syntax = SyntaxAnalyser(cus_pt.latex_text, context, cus_pt.text_scale, cus_pt.font_path, cus_pt.layout_engine,
+                                cus_pt.glyph_type, cus_pt.text_thickness, cus_pt.curve_resolution)
+
+        if not syntax.sa_prog():
+            warn_msg = 'Mathematical equation was not fully generated. Check system console for more info on this matter.'
+            self.report({'WARNING'}, warn_msg)
+            
+            # nothing is generated for equation with syntax error
+            if syntax.tree is None:
+                return {'CANCELLED'}
+        
+        # all objects in mathematical equation, other selected objects are not changed
+        collection = bpy.data.collections[syntax.base_collection]
+        finish_equation(context, cus_pt, list(collection.all_objects))
+        save_settings(collection, cus_pt)
+        
+        return {'FINISHED'}     
+      
+
+# update text of the active equation
+class WM_OT_UpdateText(bpy.types.Operator):
+    bl_label = "Update Text"
+    bl_idname = "wm.updatetextop"
+    bl_description = "Regenerate only the changed part of the active equation"
+    
+    def execute(self, context):
+        return run_profiled(context, self.generate)
+    
+    # function regenerates changed terms of equation
+    def generate(self, context):
+        scene = context.scene
+        cus_pt = scene.custom_prop
+        
+        # generated equation is the active collection
+        collection = context.view_layer.active_layer_collection.collection
+        if "term_widths" not in collection:
+            self.report({'WARNING'}, 'Active collection is not a mathematical equation.')
+            return {'CANCELLED'}
+        
+        # changed settings and merged mesh need the whole new equation
+        if not same_settings(collection, cus_pt) or cus_pt.glyph_type == 'MERGED':
+            remove_equation(collection)
+            return bpy.ops.wm.addtextop()
+        
+        # create class for analysis 
+        from .analyser import SyntaxAnalyser
+        syntax = SyntaxAnalyser(cus_pt.latex_text, context, cus_pt.text_scale, cus_pt.font_path, cus_pt.layout_engine,
+                                cus_pt.glyph_type, cus_pt.text_thickness, cus_pt.curve_resolution)
+        
+        if not syntax.sa_update(collection.name):
+            warn_msg = 'Mathematical equation was not fully generated. Check system console for more info on this matter.'
+            self.report({'WARNING'}, warn_msg)
+            
+            # nothing is changed for equation with syntax error
+            if syntax.tree is None:
+                return {'CANCELLED'}
+        
+        # customize only new objects
+        if len(context.selected_objects):
+            finish_equation(context, cus_pt, context.selected_objects)
+        
+        return {'FINISHED'}
+      
+
+# add all equations of batch file
+class WM_OT_AddBatch(bpy.types.Operator):
+    bl_label = "Add Batch"
+    bl_idname = "wm.addbatchop"
+    bl_description = "Generate all equations of batch file with one equation per line"
+    
+    def execute(self, context):
+        return run_profiled(context, self.generate)
+    
+    # function generates all equations of batch file
+    def generate(self, context):
+        scene = context.scene
+        cus_pt = scene.custom_prop
+        
+        batch = read_batch(bpy.path.abspath(cus_pt.batch_path))
+        if batch is None:
+            self.report({'ERROR'}, 'Batch file can\'t be read. Check system console for more info on this matter.')
+            return {'CANCELLED'}
+        
+        # lines with wrong format are failures too
+        items, failures = batch
+        count = 0
+        
+        wm = context.window_manager
+        wm.progress_begin(0, len(items))
+        
+        # fonts, symbols and meshes of glyphs are shared by all equations
+        from .analyser import SyntaxAnalyser
+        for i, item in enumerate(items):
+            scale = cus_pt.text_scale if item.scale is None else item.scale
+            location = tuple(cus_pt.text_location) if item.location is None else item.location
+            
+            syntax = SyntaxAnalyser(item.latex_text, context, scale, cus_pt.font_path, cus_pt.layout_engine,
+                                    cus_pt.glyph_type, cus_pt.text_thickness, cus_pt.curve_resolution)
+            
+            if not syntax.sa_prog():
+                failures.append((item.line_num, syntax.error or "equation was not fully generated"))
+                
+                # partially generated equation is removed, nothing is generated for syntax error
+                if syntax.tree is not None:
+                    remove_equation(bpy.data.collections[syntax.base_collection])
+            else:
+                collection = bpy.data.collections[syntax.base_collection]
+                finish_batch_equation(collection.all_objects, cus_pt.text_thickness, location, cus_pt.text_rotation)
+                save_settings(collection, cus_pt)
+                collection["text_location"] = location
+                count += 1
+            
+            wm.progress_update(i + 1)
+        
+        wm.progress_end()
+        context.view_layer.update()
+        profiler.count("scene updates")
+        
+        # report failures of equations
+        for line_num, message in sorted(failures):
+            print("Error, line %d of batch file: %s" % (line_num, message))
+        
+        if failures:
+            warn_msg = '%d equations generated, %d lines failed. Check system console for more info on this matter.'
+            self.report({'WARNING'}, warn_msg % (count, len(failures)))
+        else:
+            self.report({'INFO'}, '%d equations generated.' % count)
+        
+        return {'FINISHED'}
+      
+
+# measure all glyphs of fonts
+class WM_OT_WarmMetrics(bpy.types.Operator):
+    bl_label = "Measure Glyphs"
+    bl_idname = "wm.warmmetricsop"
+    bl_description = "Measure all symbols in chosen font and unicode font and save their metrics"
+    
+    def execute(self, context):
+        scene = context.scene
+        cus_pt = scene.custom_prop
+        
+        from .analyser import SyntaxAnalyser
+        syntax = SyntaxAnalyser("", context, cus_pt.text_scale, cus_pt.font_path, 'BOX')
+        count = syntax.sa_warm_metrics()
+        self.report({'INFO'}, 'Metrics of %d glyphs are saved.' % count)
+        
+        return {'FINISHED'}
+      
+
+# save results of the last profiled generation
+class WM_OT_ExportProfile(bpy.types.Operator):
+    bl_label = "Export Profile"
+    bl_idname = "wm.exportprofileop"
+    bl_description = "Save results of the last profiled generation as JSON file"
+    
+    def execute(self, context):
+        scene = context.scene
+        cus_pt = scene.custom_prop
+        
+        path = bpy.path.ensure_ext(bpy.path.abspath(cus_pt.profile_path), ".json")
+        try:
+            profiler.save(path)
+        except OSError as error:
+            print("Error, profile can't be saved: " + str(error))
+            self.report({'ERROR'}, 'Profile can\'t be saved. Check system console for more info on this matter.')
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, 'Profile is saved to ' + path)
+        return {'FINISHED'}
+      
+
+# clear cache of generated equations
+class WM_OT_ClearCache(bpy.types.Operator):
+    bl_label = "Clear Cache"
+    bl_idname = "wm.clearcacheop"
+    bl_description = "Remove all cached equations and unused meshes of glyphs"
+    
+    def execute(self, context):
+        from .generator import gen_clear_glyph_meshes
+        equation_cache.invalidate()
+        gen_clear_glyph_meshes()
+        return {'FINISHED'}
+      
+
+@persistent
+# function forgets meshes of glyphs when other blend file is loaded
+# generator remembers meshes only if it is already imported
+def forget_glyph_meshes(dummy):
+    generator = sys.modules.get(__package__ + ".generator")
+    if generator is not None:
+        generator.gen_forget_glyph_meshes()
+
+
+# enumeration of all my classes
+all_classes = [
+    Custom_PT, 
+    OBJECT_PT_ME, 
+    WM_OT_AddText,
+    WM_OT_UpdateText,
+    WM_OT_AddBatch,
+    WM_OT_WarmMetrics,
+    WM_OT_ExportProfile,
+    WM_OT_ClearCache
+]
+
+
+def register():
+    for cls in all_classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.custom_prop = bpy.props.PointerProperty(type=Custom_PT)
+    bpy.app.handlers.load_post.append(forget_glyph_meshes)
+
+
+def unregister():
+    for cls in all_classes:
+        bpy.utils.unregister_class(cls)
+    del bpy.types.Scene.custom_prop
+    bpy.app.handlers.load_post.remove(forget_glyph_meshes)
+ 
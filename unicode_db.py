@@ -1,194 +1,268 @@
-# ---------------------------------------------------------------------------
-# File name   : unicode_db.py
-# Created By  : Katarina Strenkova
-# ---------------------------------------------------------------------------
-
-unicode_chars = [
-    # lower case greek alphabet
-    ('alpha', '\u03b1'),    
-    ('beta', '\u03b2'),
-    ('gamma', '\u03b3'),
-    ('delta', '\u03b4'),
-    ('epsilon', '\u03f5'),
-    ('varepsilon', '\u03b5'),
-    ('zeta', '\u03b6'),
-    ('eta', '\u03b7'),
-    ('theta', '\u03b8'),
-    ('vartheta', '\u03d1'),
-    ('iota', '\u03b9'),
-    ('kappa', '\u03ba'),
-    ('lambda', '\u03bb'),
-    ('mu', '\u03bc'),
-    ('nu', '\u03bd'),
-    ('xi', '\u03be'),
-    ('omicron', '\u03bf'),
-    ('pi', '\u03c0'),
-    ('varpi', '\u03d6'),
-    ('rho', '\u03c1'),
-    ('varrho', '\u03f1'),
-    ('sigma', '\u03c3'),
-    ('varsigma', '\u03c2'),
-    ('tau', '\u03c4'),
-    ('upsilon', '\u03c5'),
-    ('phi', '\u03d5'),
-    ('varphi', '\u03c6'),
-    ('chi', '\u03c7'),
-    ('psi', '\u03c8'),
-    ('omega', '\u03c9'),
-    
-    # upper case greek alphabet
-    ('Gamma', '\u0393'),
-    ('Delta', '\u0394'),
-    ('Theta', '\u0398'),
-    ('Lambda', '\u039b'),
-    ('Xi', '\u039e'),
-    ('Pi', '\u03a0'),
-    ('Sigma', '\u03a3'),
-    ('Upsilon', '\u03a5'),
-    ('Phi', '\u03a6'),
-    ('Psi', '\u03a8'),
-    ('Omega', '\u03a9'),
-    
-    # relation operators
-    ('in', '\u2208'),
-    ('notin', '\u2209'),
-    ('ni', '\u220b'),
-    ('propto', '\u221d'),
-    ('mid', '\u2223'),
-    ('parallel', '\u2225'),
-    ('nparallel', '\u2226'),
-    ('sim', '\u223c'),
-    ('simeq', '\u2243'),
-    ('cong', '\u2245'),
-    ('approx', '\u2248'),
-    ('asymp', '\u224d'),
-    ('doteq', '\u2250'),
-    ('ne', '\u2260'),
-    ('neq', '\u2260'),
-    ('equiv', '\u2261'),
-    ('le', '\u2264'),
-    ('ge', '\u2265'),
-    ('leq', '\u2264'),
-    ('geq', '\u2265'),
-    ('leqslant', '\u2264'),
-    ('geqslant', '\u2265'), 
-    ('ll', '\u226a'),
-    ('gg', '\u226b'),
-    ('nless', '\u226e'),
-    ('ngtr', '\u226f'),
-    ('nleq', '\u2270'),
-    ('ngeq', '\u2271'),
-    ('nleqslant', '\u2270'),
-    ('ngeqslant', '\u2271'),
-    ('prec', '\u227a'),
-    ('succ', '\u227b'),
-    ('preceq', '\u227c'),
-    ('succeq', '\u227d'),
-    ('nprec', '\u2280'),
-    ('nsucc', '\u2281'),
-    ('subset', '\u2282'),
-    ('supset', '\u2283'),
-    ('subseteq', '\u2286'),
-    ('supseteq', '\u2287'),
-    ('nsubseteq', '\u2288'),
-    ('nsupseteq', '\u2289'),
-    ('sqsubset', '\u228f'),
-    ('sqsupset', '\u2290'),
-    ('sqsubseteq', '\u2291'),
-    ('sqsupseteq', '\u2292'),
-    ('vdash', '\u22a2'),
-    ('dashv', '\u22a3'),
-    ('perp', '\u22a5'),
-    ('models', '\u22a7'),
-    ('bowtie', '\u22c8'),
-    ('lll', '\u22d8'),
-    ('ggg', '\u22d9'),
-    ('npreceq', '\u22e0'),
-    ('nsucceq', '\u22e1'),
-    ('frown', '\u2322'),
-    ('smile', '\u263a'),
-    
-    # binary operators
-    ('ast', '*'),
-    ('pm', '\xb1'),
-    ('times', '\xd7'),
-    ('div', '\xf7'),
-    ('dagger', '\u2020'),
-    ('ddagger', '\u2021'),
-    ('bullet', '\u2022'),
-    ('amalg', '\u2210'),
-    ('mp', '\u2213'),
-    ('setminus', '\u2216'),
-    ('circ', '\u2218'),
-    ('wedge', '\u2227'),
-    ('vee', '\u2228'),
-    ('cap', '\u2229'),
-    ('cup', '\u222a'),
-    ('wr', '\u2240'),
-    ('uplus', '\u228e'),
-    ('sqcap', '\u2293'),
-    ('sqcup', '\u2294'),
-    ('oplus', '\u2295'),
-    ('ominus', '\u2296'),
-    ('otimes', '\u2297'),
-    ('oslash', '\u2298'),
-    ('odot', '\u2299'),
-    ('diamond', '\u22c4'),
-    ('cdot', '\u22c5'),
-    ('star', '\u22c6'),
-    ('bigtriangleup', '\u25b3'),
-    ('triangleright', '\u25b9'),
-    ('bigtriangledown', '\u25bd'),
-    ('triangleleft', '\u25c3'),
-    
-    # logic notation
-    ('neg', '\xac'),
-    ('implies', '\u21d2'),
-    ('Leftarrow', '\u21d0'),
-    ('Rightarrow', '\u21d2'),
-    ('Leftrightarrow', '\u21d4'),
-    ('iff', '\u21d4'),
-    ('forall', '\u2200'),
-    ('exists', '\u2203'),
-    ('nexists', '\u2204'),
-    ('land', '\u2227'),
-    ('lor', '\u2228'),
-    ('top', '\u22a4'),
-    ('bot', '\u22a5'),
-    
-    # arrows
-    ('leftarrow', '\u2190'),
-    ('gets', '\u2190'),
-    ('uparrow', '\u2191'),
-    ('rightarrow', '\u2192'),
-    ('to', '\u2192'),
-    ('downarrow', '\u2193'),
-    ('updownarrow', '\u2195'),
-    ('mapsto', '\u21a6'),
-    ('Uparrow', '\u21d1'),
-    ('Downarrow', '\u21d3'),
-    ('Updownarrow', '\u21d5'),
-    
-    # brackets
-    ('lceil', '\u2308'),
-    ('rceil', '\u2309'),
-    ('lfloor', '\u230a'),
-    ('rfloor', '\u230b'),
-    ('ulcorner', '\u231c'),
-    ('urcorner', '\u231d'),
-    ('llcorner', '\u231e'),
-    ('lrcorner', '\u231f'),
-    
-    # other symbols
-    ('backslash', '\\'),
-    ('hbar', '\u0127'),
-    ('partial', '\u2202'),
-    ('varnothing', '\u2205'),
-    ('prod', '\u220f'),
-    ('int', '\u222b'),
-    ('infty', '\u221e'),
-    ('sum', '\u2211')
-]
-        
-          
-
+# ---------------------------------------------------------------------------
+# File name   : unicode_db.py
+# Created By  : Katarina Strenkova
+# ---------------------------------------------------------------------------
+
+import os.path
+
+unicode_chars = [
+    # lower case greek alphabet
+    ('alpha', '\u03b1'),    
+    ('beta', '\u03b2'),
+    ('gamma', '\u03b3'),
+    ('delta', '\u03b4'),
+    ('epsilon', '\u03f5'),
+    ('varepsilon', '\u03b5'),
+    ('zeta', '\u03b6'),
+    ('eta', '\u03b7'),
+    ('theta', '\u03b8'),
+    ('vartheta', '\u03d1'),
+    ('iota', '\u03b9'),
+    ('kappa', '\u03ba'),
+    ('lambda', '\u03bb'),
+    ('mu', '\u03bc'),
+    ('nu', '\u03bd'),
+    ('xi', '\u03be'),
+    ('omicron', '\u03bf'),
+    ('pi', '\u03c0'),
+    ('varpi', '\u03d6'),
+    ('rho', '\u03c1'),
+    ('varrho', '\u03f1'),
+    ('sigma', '\u03c3'),
+    ('varsigma', '\u03c2'),
+    ('tau', '\u03c4'),
+    ('upsilon', '\u03c5'),
+    ('phi', '\u03d5'),
+    ('varphi', '\u03c6'),
+    ('chi', '\u03c7'),
+    ('psi', '\u03c8'),
+    ('omega', '\u03c9'),
+    
+    # upper case greek alphabet
+    ('Gamma', '\u0393'),
+    ('Delta', '\u0394'),
+    ('Theta', '\u0398'),
+    ('Lambda', '\u039b'),
+    ('Xi', '\u039e'),
+    ('Pi', '\u03a0'),
+    ('Sigma', '\u03a3'),
+    ('Upsilon', '\u03a5'),
+    ('Phi', '\u03a6'),
+    ('Psi', '\u03a8'),
+    ('Omega', '\u03a9'),
+    
+    # relation operators
+    ('in', '\u2208'),
+    ('notin', '\u2209'),
+    ('ni', '\u220b'),
+    ('propto', '\u221d'),
+    ('mid', '\u2223'),
+    ('parallel', '\u2225'),
+    ('nparallel', '\u2226'),
+    ('sim', '\u223c'),
+    ('simeq', '\u2243'),
+    ('cong', '\u2245'),
+    ('approx', '\u2248'),
+    ('asymp', '\u224d'),
+    ('doteq', '\u2250'),
+    ('ne', '\u2260'),
+    ('neq', '\u2260'),
+    ('equiv', '\u2261'),
+    ('le', '\u2264'),
+    ('ge', '\u2265'),
+    ('leq', '\u2264'),
+    ('geq', '\u2265'),
+    ('leqslant', '\u2264'),
+    ('geqslant', '\u2265'), 
+    ('ll', '\u226a'),
+    ('gg', '\u226b'),
+    ('nless', '\u226e'),
+    ('ngtr', '\u226f'),
+    ('nleq', '\u2270'),
+    ('ngeq', '\u2271'),
+    ('nleqslant', '\u2270'),
+    ('ngeqslant', '\u2271'),
+    ('prec', '\u227a'),
+    ('succ', '\u227b'),
+    ('preceq', '\u227c'),
+    ('succeq', '\u227d'),
+    ('nprec', '\u2280'),
+    ('nsucc', '\u2281'),
+    ('subset', '\u2282'),
+    ('supset', '\u2283'),
+    ('subseteq', '\u2286'),
+    ('supseteq', '\u2287'),
+    ('nsubseteq', '\u2288'),
+    ('nsupseteq', '\u2289'),
+    ('sqsubset', '\u228f'),
+    ('sqsupset', '\u2290'),
+    ('sqsubseteq', '\u2291'),
+    ('sqsupseteq', '\u2292'),
+    ('vdash', '\u22a2'),
+    ('dashv', '\u22a3'),
+    ('perp', '\u22a5'),
+    ('models', '\u22a7'),
+    ('bowtie', '\u22c8'),
+    ('lll', '\u22d8'),
+    ('ggg', '\u22d9'),
+    ('npreceq', '\u22e0'),
+    ('nsucceq', '\u22e1'),
+    ('frown', '\u2322'),
+    ('smile', '\u263a'),
+    
+    # binary operators
+    ('ast', '*'),
+    ('pm', '\xb1'),
+    ('times', '\xd7'),
+    ('div', '\xf7'),
+    ('dagger', '\u2020'),
+    ('ddagger', '\u2021'),
+    ('bullet', '\u2022'),
+    ('amalg', '\u2210'),
+    ('mp', '\u2213'),
+    ('setminus', '\u2216'),
+    ('circ', '\u2218'),
+    ('wedge', '\u2227'),
+    ('vee', '\u2228'),
+    ('cap', '\u2229'),
+    ('cup', '\u222a'),
+    ('wr', '\u2240'),
+    ('uplus', '\u228e'),
+    ('sqcap', '\u2293'),
+    ('sqcup', '\u2294'),
+    ('oplus', '\u2295'),
+    ('ominus', '\u2296'),
+    ('otimes', '\u2297'),
+    ('oslash', '\u2298'),
+    ('odot', '\u2299'),
+    ('diamond', '\u22c4'),
+    ('cdot', '\u22c5'),
+    ('star', '\u22c6'),
+    ('bigtriangleup', '\u25b3'),
+    ('triangleright', '\u25b9'),
+    ('bigtriangledown', '\u25bd'),
+    ('triangleleft', '\u25c3'),
+    
+    # logic notation
+    ('neg', '\xac'),
+    ('implies', '\u21d2'),
+    ('Leftarrow', '\u21d0'),
+    ('Rightarrow', '\u21d2'),
+    ('Leftrightarrow', '\u21d4'),
+    ('iff', '\u21d4'),
+    ('forall', '\u2200'),
+    ('exists', '\u2203'),
+    ('nexists', '\u2204'),
+    ('land', '\u2227'),
+    ('lor', '\u2228'),
+    ('top', '\u22a4'),
+    ('bot', '\u22a5'),
+    
+    # arrows
+    ('leftarrow', '\u2190'),
+    ('gets', '\u2190'),
+    ('uparrow', '\u2191'),
+    ('rightarrow', '\u2192'),
+    ('to', '\u2192'),
+    ('downarrow', '\u2193'),
+    ('updownarrow', '\u2195'),
+    ('mapsto', '\u21a6'),
+    ('Uparrow', '\u21d1'),
+    ('Downarrow', '\u21d3'),
+    ('Updownarrow', '\u21d5'),
+    
+    # brackets
+    ('lceil', '\u2308'),
+    ('rceil', '\u2309'),
+    ('lfloor', '\u230a'),
+    ('rfloor', '\u230b'),
+    ('ulcorner', '\u231c'),
+    ('urcorner', '\u231d'),
+    ('llcorner', '\u231e'),
+    ('lrcorner', '\u231f'),
+    
+    # other symbols
+    ('backslash', '\\'),
+    ('hbar', '\u0127'),
+    ('partial', '\u2202'),
+    ('varnothing', '\u2205'),
+    ('prod', '\u220f'),
+    ('int', '\u222b'),
+    ('infty', '\u221e'),
+    ('sum', '\u2211')
+]
+
+
+# directory with extended symbol sets
+SYMBOLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "symbols")
+
+# extended symbol sets, each set is loaded the first time it is needed
+extended_sets = ["arrows", "ams_relations", "blackboard", "calligraphic"]
+loaded_sets = set()
+
+# index of symbols (name -> character)
+symbol_index = {}
+
+# reverse index of symbols (character -> names)
+reverse_index = {}
+
+
+# function adds symbols into both indexes
+def add_symbols(symbols):
+    for name, char in symbols:
+        # the first symbol with given name is used
+        if name in symbol_index:
+            continue
+
+        symbol_index[name] = char
+        reverse_index.setdefault(char, []).append(name)
+
+
+# function loads extended symbol set from its data file
+# every line of the file is 'name U+codepoint', lines with '#' are comments
+def load_set(set_name):
+    if set_name in loaded_sets:
+        return
+
+    symbols = []
+    with open(os.path.join(SYMBOLS_DIR, set_name + ".txt"), encoding="utf-8") as data_file:
+        for line in data_file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            name, codepoint = line.split()
+            symbols.append((name, chr(int(codepoint[2:], 16))))
+
+    add_symbols(symbols)
+    loaded_sets.add(set_name)
+
+
+# function loads all extended symbol sets
+def load_all_sets():
+    for set_name in extended_sets:
+        load_set(set_name)
+
+
+# function returns character of symbol or None if there is no such symbol
+def get_symbol(name):
+    char = symbol_index.get(name)
+
+    # look into extended sets which were not loaded yet
+    for set_name in extended_sets:
+        if char is not None:
+            break
+        load_set(set_name)
+        char = symbol_index.get(name)
+
+    return char
+
+
+# function returns all names of given character
+def get_names(char):
+    load_all_sets()
+    return reverse_index.get(char, [])
+
+
+# index of basic symbols
+add_symbols(unicode_chars)